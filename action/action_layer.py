@@ -1,4 +1,5 @@
 import os
+import queue
 import threading
 import subprocess
 import time
@@ -13,6 +14,8 @@ class TTSEngine:
         self.volume = volume
         self.lock = threading.Lock()
         self.active_process = None
+        self.active_stream = None
+        self._stream_queue = None
         
         # Advanced Phonetic Phrasing for more human-like flow
         self.phonetics = {
@@ -42,7 +45,12 @@ class TTSEngine:
         return " ".join(new_words)
 
     def stop_speaking(self):
-        """Forcefully stops the current speech process."""
+        """Forcefully stops the current speech process (and any streamed answer still coming)."""
+        stream = self.active_stream
+        if stream:
+            stream.cancel()
+            if self._stream_queue:
+                self._stream_queue.put(None) # Wake the speaker so it drops what's queued
         if self.active_process:
             try:
                 subprocess.run(f"taskkill /F /T /PID {self.active_process.pid}", shell=True, capture_output=True)
@@ -51,6 +59,50 @@ class TTSEngine:
                 print(f"\n{Fore.YELLOW}🔇 Audio feed interrupted.")
             except Exception: pass
 
+    def _say(self, text: str):
+        """Speaks one utterance, blocking until it finishes or is killed."""
+        from colorama import Fore, Style
+        waves = [" ", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
+        waveform = "".join(random.choice(waves) for _ in range(15))
+        print(f"\n{Fore.CYAN}🔊 JARVIS: {waveform} {Fore.WHITE}{text}{Style.RESET_ALL}", flush=True)
+        
+        processed_text = self._apply_fluency(text).replace("'", "''")
+        
+        # Dynamic prosody settings
+        # Rate 200 (config) -> ~1.2x multiplier
+        prosody_rate = round(self.rate / 165, 2)
+        # Pitch -1st (semitones) makes the voice sound more sophisticated/British
+        pitch_shift = "-1st" 
+
+        ps_script = f'''
+        Add-Type -AssemblyName System.Speech
+        $synth = New-Object System.Speech.Synthesis.SpeechSynthesizer
+        $voices = $synth.GetInstalledVoices()
+        $target = $voices | Where-Object {{ $_.VoiceInfo.Culture.Name -like "*en-GB*" -and $_.Enabled }} | Select-Object -First 1
+        if (-not $target) {{ $target = $voices | Where-Object {{ $_.VoiceInfo.Culture.Name -like "*en-*" -and $_.Enabled }} | Select-Object -First 1 }}
+        if ($target) {{ $synth.SelectVoice($target.VoiceInfo.Name) }}
+        $synth.Volume = {int(self.volume * 100)}
+        
+        $ssml = @"
+        <speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='en-GB'>
+            <prosody rate='{prosody_rate}' pitch='{pitch_shift}'>
+                {processed_text}
+            </prosody>
+        </speak>
+"@
+        $synth.SpeakSsml($ssml)
+        '''
+        
+        try:
+            self.active_process = subprocess.Popen(
+                ["powershell", "-NoProfile", "-Command", ps_script],
+                creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
+            )
+            self.active_process.wait()
+            self.active_process = None
+        except Exception as e:
+            print(f"❌ TTS Error: {e}")
+
     def speak(self, text: str):
         """Non-blocking TTS using SSML for high-fidelity human-like prosody."""
         def _speak():
@@ -59,51 +111,51 @@ class TTSEngine:
                     self.stop_speaking()
 
                 bus.publish("JARVIS_SPEAKING", {"status": True})
+                try:
+                    self._say(text)
+                finally:
+                    bus.publish("JARVIS_SPEAKING", {"status": False})
+
+        threading.Thread(target=_speak, daemon=True).start()
 
-                from colorama import Fore, Style
-                waves = [" ", "▂", "▃", "▄", "▅", "▆", "▇", "█"]
-                waveform = "".join(random.choice(waves) for _ in range(15))
-                print(f"\n{Fore.CYAN}🔊 JARVIS: {waveform} {Fore.WHITE}{text}{Style.RESET_ALL}", flush=True)
-                
-                processed_text = self._apply_fluency(text).replace("'", "''")
-                
-                # Dynamic prosody settings
-                # Rate 200 (config) -> ~1.2x multiplier
-                prosody_rate = round(self.rate / 165, 2)
-                # Pitch -1st (semitones) makes the voice sound more sophisticated/British
-                pitch_shift = "-1st" 
+    def speak_stream(self, stream):
+        """
+        Non-blocking TTS for a SpeechStream: each sentence is spoken as soon as it is
+        generated while the rest of the answer keeps arriving in the background.
+        A newer stream replaces one that is still talking.
+        """
+        if self.active_stream:
+            self.stop_speaking()
+        sentences = queue.Queue()
+        self.active_stream = stream
+        self._stream_queue = sentences
 
-                ps_script = f'''
-                Add-Type -AssemblyName System.Speech
-                $synth = New-Object System.Speech.Synthesis.SpeechSynthesizer
-                $voices = $synth.GetInstalledVoices()
-                $target = $voices | Where-Object {{ $_.VoiceInfo.Culture.Name -like "*en-GB*" -and $_.Enabled }} | Select-Object -First 1
-                if (-not $target) {{ $target = $voices | Where-Object {{ $_.VoiceInfo.Culture.Name -like "*en-*" -and $_.Enabled }} | Select-Object -First 1 }}
-                if ($target) {{ $synth.SelectVoice($target.VoiceInfo.Name) }}
-                $synth.Volume = {int(self.volume * 100)}
-                
-                $ssml = @"
-                <speak version='1.0' xmlns='http://www.w3.org/2001/10/synthesis' xml:lang='en-GB'>
-                    <prosody rate='{prosody_rate}' pitch='{pitch_shift}'>
-                        {processed_text}
-                    </prosody>
-                </speak>
-"@
-                $synth.SpeakSsml($ssml)
-                '''
-                
+        def _generate():
+            for sentence in stream.sentences():
+                sentences.put(sentence)
+            sentences.put(None)
+
+        def _speak():
+            with self.lock:
+                speaking = False
                 try:
-                    self.active_process = subprocess.Popen(
-                        ["powershell", "-NoProfile", "-Command", ps_script],
-                        creationflags=subprocess.CREATE_NO_WINDOW if os.name == 'nt' else 0
-                    )
-                    self.active_process.wait()
-                    self.active_process = None
-                except Exception as e:
-                    print(f"❌ TTS Error: {e}")
+                    while True:
+                        sentence = sentences.get()
+                        if sentence is None or stream.cancelled:
+                            break
+                        if not speaking:
+                            speaking = True
+                            print(f"⚡ [TTS] First sentence ready after {stream.first_sentence_ms:.0f}ms.")
+                            bus.publish("JARVIS_SPEAKING", {"status": True})
+                        self._say(sentence)
                 finally:
-                    bus.publish("JARVIS_SPEAKING", {"status": False})
+                    if speaking:
+                        bus.publish("JARVIS_SPEAKING", {"status": False})
+                    if self.active_stream is stream:
+                        self.active_stream = None
+                        self._stream_queue = None
 
+        threading.Thread(target=_generate, daemon=True).start()
         threading.Thread(target=_speak, daemon=True).start()
 
 
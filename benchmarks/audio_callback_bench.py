@@ -0,0 +1,129 @@
+"""
+Cost of AudioListener.callback per PortAudio block, over a recording.
+
+    python -m benchmarks.audio_callback_bench [--wav recording.wav] [--seconds 60]
+
+Without --wav a synthetic recording is used (see benchmarks/audio_fixtures.py).
+"legacy" is the previous callback: float64 conversion, a freshly allocated
+smoothed array, RMS through temporaries and `bytes(indata)` copies into a deque
+pre-buffer and the queue. "ring" is the current one: preallocated float32
+buffers smoothed in place, dot-product RMS, and blocks copied into the AudioRing
+with only sequence numbers queued. Timings come from a plain pass; memory from a
+second pass under tracemalloc (peak bytes allocated while each callback runs).
+Both gates run on a clock that advances with the audio, so the hold window and
+pre-roll behave as they would live; "fwd" is how many blocks reached the queue.
+"""
+import argparse
+import collections
+import io
+import queue
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from benchmarks.audio_fixtures import synthesize
+from benchmarks.latency import HEADER, format_row
+from perception.audio_listener import AudioListener, BLOCK_SIZE
+from perception.audio_sources import BufferSource, FileSource
+
+
+class LegacyGate:
+    """The callback as it was before the ring buffer, kept for comparison."""
+    def __init__(self, threshold: int):
+        self.intensity_threshold = threshold
+        self.q = queue.Queue()
+        self.pre_buffer = collections.deque(maxlen=10)
+        self.gate_open = False
+        self.last_sound_time = 0
+        self.gate_hold_seconds = 1.8
+        self.last_audio_data = None
+        self.clock = time.time
+
+    def callback(self, indata, frames, time_info, status):
+        audio_data = np.frombuffer(indata, dtype=np.int16).astype(np.float64)
+        if self.last_audio_data is not None:
+            audio_data = 0.8 * audio_data + 0.2 * self.last_audio_data
+        self.last_audio_data = audio_data
+        intensity = np.sqrt(np.mean(audio_data**2))
+        now = self.clock()
+        if intensity > self.intensity_threshold:
+            if not self.gate_open:
+                while self.pre_buffer:
+                    self.q.put(self.pre_buffer.popleft())
+                self.gate_open = True
+            self.last_sound_time = now
+            self.q.put(bytes(indata))
+        elif self.gate_open and (now - self.last_sound_time < self.gate_hold_seconds):
+            self.q.put(bytes(indata))
+        else:
+            self.gate_open = False
+            self.pre_buffer.append(bytes(indata))
+            if int(now) % 3 == 0 and intensity > 5:
+                sys.stdout.write(f"\r🎤 Ambient: {int(intensity)}/{self.intensity_threshold}  ")
+                sys.stdout.flush()
+
+
+def make(kind: str, threshold: int, source: BufferSource):
+    gate = LegacyGate(threshold) if kind == "legacy" else AudioListener(model_path="", intensity_threshold=threshold)
+    gate.calibrating = False
+    gate.clock = source.clock
+    return gate
+
+
+def drain(q: queue.Queue):
+    while not q.empty():
+        q.get_nowait()
+
+
+def timed_pass(kind: str, source: BufferSource, threshold: int):
+    gate = make(kind, threshold, source)
+    samples, forwarded = [], 0
+    for chunk in source.blocks():
+        start = time.perf_counter()
+        gate.callback(chunk, BLOCK_SIZE, None, None)
+        samples.append((time.perf_counter() - start) * 1000)
+        forwarded += gate.q.qsize()
+        drain(gate.q)
+    return samples, forwarded
+
+
+def traced_pass(kind: str, source: BufferSource, threshold: int):
+    gate = make(kind, threshold, source)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for chunk in source.blocks():
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            gate.callback(chunk, BLOCK_SIZE, None, None)
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+            drain(gate.q)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-callback time and allocations of the audio gate.")
+    parser.add_argument("--wav", help="16-bit PCM WAV to replay (default: synthetic)")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of the synthetic recording")
+    parser.add_argument("--threshold", type=int, default=400)
+    args = parser.parse_args()
+
+    source = FileSource(args.wav, BLOCK_SIZE) if args.wav else BufferSource(synthesize(args.seconds)[0], 16000, BLOCK_SIZE)
+    print(f"{len(source.pcm) // BLOCK_SIZE} blocks of {BLOCK_SIZE} samples "
+          f"({source.duration:.1f}s at {source.samplerate}Hz)\n")
+
+    print(f"{HEADER} {'fwd':>5} {'alloc avg':>10} {'alloc max':>10}")
+    for kind in ("legacy", "ring"):
+        with redirect_stdout(io.StringIO()):
+            samples, forwarded = timed_pass(kind, source, args.threshold)
+            peaks = traced_pass(kind, source, args.threshold)
+        print(f"{format_row(kind, samples)} {forwarded:>5} {np.mean(peaks) / 1024:>8.1f}KB {max(peaks) / 1024:>8.1f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+The whole hearing pipeline (gate/VAD + recognizers) on recordings, as fast as it will go.
+
+    python -m benchmarks.audio_pipeline_bench --wav session.wav --labels session.txt
+    python -m benchmarks.audio_pipeline_bench --wav a.flac b.wav --no-vad --single-stage --no-resample
+    python -m benchmarks.audio_pipeline_bench --wav stops.wav --labels stops.txt --speaking [--no-fast-path]
+
+Each file is read through a FileSource and pushed block by block through
+AudioListener.callback and recognize() on the source's stream clock, with the
+Vosk model loaded as configured (recordings not at 16kHz are resampled first
+unless --no-resample). Per file:
+
+  rtf        processing time / audio duration (below 1 keeps up with a microphone)
+  block p95  processing time of one block, callback + recognizer
+  attn/wake  wake-word detection latency: audio time from the end of each "wake"
+             label to the ATTENTION / WAKE_WORD_DETECTED event
+  intr       interrupt latency: from the end of each label whose text is an
+             interrupt phrase ("stop", "shut up", "listen jarvis") to the first
+             INTERRUPT or command event. With the fast path this is the partial
+             result; --no-fast-path shows what waiting for the final result costs.
+             --speaking replays as if JARVIS were talking throughout, with barge-in
+             on; without the fast path nothing is heard then. Run it on a recording
+             of JARVIS's own speech through the speakers: every "intrs" there is a
+             self-interruption.
+  eos        end-of-speech to event: from the end of each other label to the
+             command event (WAKE_WORD_DETECTED or USER_COMMAND) it produced
+
+Latencies are in audio time at block granularity (one block is 250ms) and come
+from Audacity label files ("start<TAB>end<TAB>text", text "wake" for the wake
+word itself). A fast-path interrupt can land before its label ends (negative
+latency). Without labels only rtf, block time and event counts are shown.
+"""
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+from vosk import Model
+
+from benchmarks.latency import summarize
+from core.event_bus import bus
+from perception.audio_listener import AudioListener, BLOCK_SIZE, INTERRUPT_PHRASES
+from perception.audio_sources import BufferSource, FileSource
+
+EVENTS = ("ATTENTION", "WAKE_WORD_DETECTED", "USER_COMMAND", "INTERRUPT")
+
+
+def replay(listener: AudioListener, source: BufferSource, block_ms: list = None):
+    """Feeds a non-realtime source through the listener's gate and recognizers on the source's clock."""
+    listener.clock = source.clock
+    listener.calibration_start = source.clock()
+    with redirect_stdout(io.StringIO()):
+        for chunk in source.blocks():
+            start = time.perf_counter()
+            listener.callback(chunk, len(chunk) // 2, None, None)
+            while not listener.q.empty():
+                listener.recognize(listener.q.get_nowait())
+            if block_ms is not None:
+                block_ms.append((time.perf_counter() - start) * 1000)
+
+
+def read_labels(path: str, interrupt_phrases: tuple = ()):
+    """(wake, interrupt, other utterance) segments from an Audacity label file."""
+    wake, interrupts, utterances = [], [], []
+    with open(path) as f:
+        for line in f:
+            fields = line.rstrip("\n").split("\t")
+            if len(fields) >= 2:
+                segment = (float(fields[0]), float(fields[1]))
+                text = fields[2].strip().lower() if len(fields) > 2 else ""
+                if text == "wake":
+                    wake.append(segment)
+                elif text in interrupt_phrases:
+                    interrupts.append(segment)
+                else:
+                    utterances.append(segment)
+    return wake, interrupts, utterances
+
+
+def latencies(segments: list, events: list, names: tuple) -> list:
+    """For each segment, audio time from its end to the first matching event at or after its start."""
+    out = []
+    for start, end in segments:
+        hit = next((at for name, at in events if name in names and at >= start), None)
+        if hit is not None:
+            out.append((hit - end) * 1000)
+    return out
+
+
+def fmt(samples: list) -> str:
+    if not samples:
+        return f"{'-':>15}"
+    s = summarize(samples)
+    return f"{s['p50']:>7.0f}/{s['max']:<7.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time factor and event latency of the audio pipeline.")
+    parser.add_argument("--wav", nargs="+", required=True, help="WAV/FLAC recordings")
+    parser.add_argument("--labels", nargs="*", default=[], help="Audacity label files, one per recording")
+    parser.add_argument("--model", default="models/vosk-model-en-in-0.5")
+    parser.add_argument("--no-vad", action="store_true", help="Use the RMS intensity gate")
+    parser.add_argument("--single-stage", action="store_true", help="Run the full recognizer on all gated audio")
+    parser.add_argument("--no-resample", action="store_true", help="Recognize at the recording's own rate")
+    parser.add_argument("--no-fast-path", action="store_true", help="Act on interrupts from final results only")
+    parser.add_argument("--speaking", action="store_true", help="Replay as if JARVIS were talking (barge-in)")
+    args = parser.parse_args()
+
+    model = Model(args.model)
+    events, current = [], [None]
+    # Stamped with the stream time of the block that produced them
+    for name in EVENTS:
+        bus.subscribe(name, lambda data, n=name: events.append((n, current[0].clock())))
+
+    print(f"{'recording':<24} {'audio s':>8} {'rtf':>6} {'block p95':>10} {'wakes':>6} {'cmds':>5} {'intrs':>6} "
+          f"{'attn p50/max ms':>15} {'wake p50/max ms':>15} {'intr p50/max ms':>15} {'eos p50/max ms':>15}")
+    for i, path in enumerate(args.wav):
+        source = current[0] = FileSource(path, BLOCK_SIZE)
+        listener = AudioListener(model_path="", two_stage=not args.single_stage, resample=not args.no_resample,
+                                 interrupt_phrases=() if args.no_fast_path else INTERRUPT_PHRASES, barge_in=args.speaking)
+        listener.model = model
+        listener.is_speaking = args.speaking
+        with redirect_stdout(io.StringIO()):
+            source.block_size = listener.set_input_rate(source.samplerate)
+            if not args.no_vad:
+                listener.enable_vad(listener.samplerate)
+        listener.build_recognizers(listener.samplerate)
+
+        events.clear()
+        block_ms = []
+        wall = time.perf_counter()
+        replay(listener, source, block_ms)
+        wall = time.perf_counter() - wall
+
+        wakes = sum(1 for name, _ in events if name == "WAKE_WORD_DETECTED")
+        commands = sum(1 for name, _ in events if name == "USER_COMMAND")
+        interrupts = sum(1 for name, _ in events if name == "INTERRUPT")
+        row = (f"{path.rsplit('/', 1)[-1][:24]:<24} {source.duration:>8.1f} {wall / source.duration:>6.3f} "
+               f"{summarize(block_ms)['p95']:>8.2f}ms {wakes:>6} {commands:>5} {interrupts:>6}")
+        if i < len(args.labels):
+            wake, interrupts, utterances = read_labels(args.labels[i], INTERRUPT_PHRASES)
+            row += (f" {fmt(latencies(wake, events, ('ATTENTION',)))} {fmt(latencies(wake, events, ('WAKE_WORD_DETECTED',)))}"
+                    f" {fmt(latencies(interrupts, events, ('INTERRUPT', 'WAKE_WORD_DETECTED', 'USER_COMMAND')))}"
+                    f" {fmt(latencies(utterances, events, ('WAKE_WORD_DETECTED', 'USER_COMMAND')))}")
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Per-command cost of ASR transcript correction at growing table sizes.
+
+Compares the legacy approach (one `re.sub` per table entry, longest first)
+with the single-pass CorrectionEngine, and reports where their output differs
+on the sample commands (overlapping keys: the engine never re-scans its own
+replacements, the legacy chain did).
+
+    python -m benchmarks.correction_bench
+"""
+import random
+import re
+import string
+import time
+
+from core.corrections import ASR_CORRECTIONS, CorrectionEngine
+
+SIZES = [100, 1_000, 10_000]
+
+COMMANDS = [
+    "hello travis what time is it",
+    "canada open chrome for me",
+    "charvis search warrant the latest semiconductor news",
+    "what am i old inside right now",
+    "tell me mouse the weather in mumbai tomorrow",
+    "jarvis how are u doing today",
+    "scandalous and give me a full tactical assessment",
+    "lock in mode for forty five minutes please",
+    "i'd apply the object in my hand",
+    "what is the cpu load on this machine",
+]
+
+
+def legacy_clean(corrections: dict, cmd: str) -> str:
+    """The original DecisionEngine._clean_command."""
+    for error in sorted(corrections.keys(), key=len, reverse=True):
+        pattern = r'\b' + re.escape(error) + r'\b'
+        cmd = re.sub(pattern, corrections[error], cmd)
+    return cmd
+
+
+def build_table(size: int, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    table = dict(ASR_CORRECTIONS)
+    while len(table) < size:
+        words = rng.randint(1, 3)
+        error = " ".join(
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 9)))
+            for _ in range(words)
+        )
+        table[error] = "jarvis"
+    return dict(list(table.items())[:size])
+
+
+def time_per_command(fn, budget: float = 1.0) -> float:
+    """Returns mean microseconds per command, running for roughly `budget` seconds."""
+    runs = 0
+    start = time.perf_counter()
+    while True:
+        for cmd in COMMANDS:
+            fn(cmd)
+        runs += len(COMMANDS)
+        elapsed = time.perf_counter() - start
+        if elapsed > budget:
+            return elapsed / runs * 1e6
+
+
+def main():
+    print(f"{'entries':>8} | {'legacy us/cmd':>14} | {'engine us/cmd':>14} | {'speedup':>8} | {'build ms':>9} | {'hot-add us':>10}")
+    print("-" * 80)
+    for size in SIZES:
+        table = build_table(size)
+
+        start = time.perf_counter()
+        engine = CorrectionEngine(table)
+        engine.apply("warm up")
+        build_ms = (time.perf_counter() - start) * 1000
+
+        legacy_us = time_per_command(lambda c: legacy_clean(table, c))
+        engine_us = time_per_command(engine.apply)
+
+        # Hot-add: one new entry plus the lazy rebuild paid by the next command
+        start = time.perf_counter()
+        engine.add("zebra crossing", "jarvis")
+        engine.apply("zebra crossing")
+        add_us = (time.perf_counter() - start) * 1e6
+
+        print(f"{size:>8} | {legacy_us:>14.1f} | {engine_us:>14.1f} | {legacy_us / engine_us:>7.1f}x | {build_ms:>9.1f} | {add_us:>10.0f}")
+
+    engine = CorrectionEngine(ASR_CORRECTIONS)
+    mismatches = [(cmd, legacy_clean(ASR_CORRECTIONS, cmd), engine.apply(cmd)) for cmd in COMMANDS]
+    mismatches = [m for m in mismatches if m[1] != m[2]]
+    print(f"\nParity with legacy: {len(COMMANDS) - len(mismatches)}/{len(COMMANDS)} identical")
+    for cmd, old, new in mismatches:
+        print(f"  DIFFERS {cmd!r}\n    legacy: {old!r}\n    engine: {new!r}")
+
+    print("\nSample rewrites (engine):")
+    for cmd in COMMANDS[:4]:
+        print(f"  {cmd!r} -> {engine.apply(cmd)!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Command-to-text latency and throughput of the LLM-backed skills, against local
+stand-ins for Ollama and DuckDuckGo (see benchmarks/ollama_standin.py).
+
+    python -m benchmarks.intelligence_bench
+    python -m benchmarks.intelligence_bench --concurrency 1 4 8 --token-rate 25 --stream
+    python -m benchmarks.intelligence_bench --failure-rate 0.1 --cold-load 3
+
+For every skill and concurrency level, N commands are fired from that many
+threads at once. Latency runs from `execute()` to the full answer text (for
+streamed answers, until the last sentence is out; time to the first sentence is
+reported separately). Answers that came from a skill's offline fallback instead
+of the model are counted as fallbacks. Response caching and digests are switched
+off so every command reaches the model.
+"""
+import argparse
+import io
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+from benchmarks.latency import HEADER, format_row, summarize
+from benchmarks.ollama_standin import DEFAULT_ANSWER, FakeSearch, StandInOllama, fake_search
+from core.digest_prefetcher import digest_prefetcher
+from core.llm_client import llm
+from core.response_cache import response_cache
+from core.skills.conversation_skill import ConversationSkill
+from core.skills.deep_thought_skill import DeepThoughtSkill
+from core.skills.omni_brain_skill import OmniBrainSkill
+from memory.conversation_history import ConversationHistory
+from memory.database import ShortTermMemory
+
+COMMANDS = {
+    "OmniBrain": ["explain how a jet engine works", "what's the latest news on fusion", "why is the sky blue",
+                  "what is the price of gold today", "suggest a strategy for my week"],
+    "Conversation": ["how are you", "who are you", "thank you jarvis", "are you alive", "do you sleep"],
+    "DeepThought": ["what is your opinion on ai", "analyze my productivity", "think about the future"],
+}
+
+
+def build_skills(skip_animation: bool):
+    deep = DeepThoughtSkill()
+    if skip_animation:
+        deep._simulate_neural_activity = lambda: None
+    return {"OmniBrain": OmniBrainSkill(), "Conversation": ConversationSkill(), "DeepThought": deep}
+
+
+def run_one(skill, command: str):
+    history = ConversationHistory(capacity=8)
+    history.add("USER", command)
+    context = {"user_name": "Sir", "history": history, "memory": ShortTermMemory(), "vision": None}
+
+    start = time.perf_counter()
+    result = skill.execute(command, context) or {}
+    first = None
+    if result.get("action") == "SPEAK_STREAM":
+        sentences = []
+        for sentence in result["stream"].sentences():
+            if first is None:
+                first = time.perf_counter() - start
+            sentences.append(sentence)
+        text = " ".join(sentences)
+    else:
+        text = result.get("text", "")
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000, (first or elapsed) * 1000, text.strip() == DEFAULT_ANSWER
+
+
+def run(skill, commands: list, concurrency: int, total: int):
+    jobs = [commands[i % len(commands)] for i in range(total)]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        wall_start = time.perf_counter()
+        results = list(pool.map(lambda cmd: run_one(skill, cmd), jobs))
+        wall = time.perf_counter() - wall_start
+    return results, wall
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latency/throughput of the intelligence skills against stand-ins.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--requests", type=int, default=20, help="Commands per skill and concurrency level")
+    parser.add_argument("--token-rate", type=float, default=40, help="Stand-in generation speed (tokens/s)")
+    parser.add_argument("--parallel", type=int, default=1, help="Stand-in sequence slots (OLLAMA_NUM_PARALLEL)")
+    parser.add_argument("--cold-load", type=float, default=0.0, help="Stand-in model load delay on first call (s)")
+    parser.add_argument("--failure-rate", type=float, default=0.0, help="Fraction of LLM calls that fail")
+    parser.add_argument("--search-latency", type=float, default=0.3)
+    parser.add_argument("--stream", action="store_true", help="Let OmniBrain stream its answers")
+    parser.add_argument("--with-animation", action="store_true", help="Keep DeepThought's 1.5s console animation")
+    args = parser.parse_args()
+
+    server = StandInOllama(token_rate=args.token_rate, cold_load=args.cold_load,
+                           parallel=args.parallel, failure_rate=args.failure_rate)
+    original = (llm.host, llm.stream, response_cache.enabled, digest_prefetcher.enabled)
+    llm.configure(host=server.start(), stream=args.stream)
+    response_cache.enabled = False
+    digest_prefetcher.enabled = False
+
+    print(f"Stand-in: {args.token_rate:g} tok/s, {args.parallel} slot(s), cold load {args.cold_load:g}s, "
+          f"failure rate {args.failure_rate:.0%}, search {args.search_latency * 1000:.0f}ms\n")
+    print(f"{HEADER} {'first p50':>10} {'req/s':>7} {'fallback':>9}")
+    try:
+        with fake_search(FakeSearch(latency=args.search_latency)):
+            skills = build_skills(skip_animation=not args.with_animation)
+            for name, skill in skills.items():
+                for concurrency in args.concurrency:
+                    with redirect_stdout(io.StringIO()):
+                        results, wall = run(skill, COMMANDS[name], concurrency, args.requests)
+                    latencies = [r[0] for r in results]
+                    first = summarize([r[1] for r in results])["p50"]
+                    fallbacks = sum(1 for r in results if not r[2])
+                    print(f"{format_row(f'{name} x{concurrency}', latencies)} {first:>10.2f} "
+                          f"{len(results) / wall:>7.2f} {fallbacks:>9}")
+    finally:
+        server.stop()
+        llm.host, llm.stream, response_cache.enabled, digest_prefetcher.enabled = original
+
+
+if __name__ == "__main__":
+    main()
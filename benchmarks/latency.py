@@ -0,0 +1,32 @@
+"""Small helpers shared by the benchmark scripts."""
+import math
+from typing import Dict, List
+
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "count": len(ordered),
+        "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+        "p50": percentile(ordered, 50),
+        "p95": percentile(ordered, 95),
+        "p99": percentile(ordered, 99),
+        "max": ordered[-1] if ordered else 0.0,
+    }
+
+
+def format_row(name: str, samples_ms: List[float]) -> str:
+    s = summarize(samples_ms)
+    return (f"{name:<22} {s['count']:>6} {s['mean']:>9.2f} {s['p50']:>9.2f} "
+            f"{s['p95']:>9.2f} {s['p99']:>9.2f} {s['max']:>9.2f}")
+
+
+HEADER = f"{'':<22} {'n':>6} {'mean ms':>9} {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
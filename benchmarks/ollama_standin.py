@@ -0,0 +1,223 @@
+"""
+Local stand-ins for Ollama and DuckDuckGo, for benchmarks that need neither a GPU
+nor the internet.
+
+StandInOllama serves /api/generate and /api/chat, streaming or not, and models:
+- prompt prefill: like a llama.cpp runner it keeps the token sequence of its last
+  request (prompt + answer) and only "evaluates" the tokens after the longest
+  common prefix, sleeping `prefill_ms_per_token` for each
+- generation at `token_rate` tokens/s, chunk by chunk when streaming
+- a `cold_load` delay on the first request (and after `unload()`), reported as
+  load_duration
+- `parallel` sequence slots; further requests queue for a slot
+- failure injection: `failure_rate` of requests (seeded) answer HTTP 500, and
+  `fail_next(n)` forces the next n to
+Timings are reported the way Ollama reports them and every request is logged in `requests`.
+
+    server = StandInOllama(token_rate=30, cold_load=2.0)
+    url = server.start()
+    ...
+    server.stop()
+
+FakeSearch is a drop-in for duckduckgo_search.DDGS with a fixed latency and its
+own failure rate; `fake_search(backend)` swaps it into core.web_search.
+"""
+import json
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+
+DEFAULT_ANSWER = "Certainly, Sir. Everything appears to be in order on my end."
+
+
+def tokenize(text: str) -> list:
+    return _TOKEN.findall(text)
+
+
+def chat_tokens(messages: list) -> list:
+    """Flattens chat messages the way a chat template would, ending on the assistant tag."""
+    tokens = []
+    for message in messages:
+        tokens.append(f"<|{message.get('role', 'user')}|>")
+        tokens.extend(tokenize(message.get("content", "")))
+    tokens.append("<|assistant|>")
+    return tokens
+
+
+class StandInOllama:
+    def __init__(self, prefill_ms_per_token: float = 0.25, answer: str = DEFAULT_ANSWER,
+                 token_rate: float = 0, cold_load: float = 0.0, parallel: int = 1,
+                 failure_rate: float = 0.0, seed: int = 7):
+        self.prefill_ms_per_token = prefill_ms_per_token
+        self.answer = answer
+        self.token_rate = token_rate  # Generated tokens per second; 0 answers instantly
+        self.cold_load = cold_load
+        self.failure_rate = failure_rate
+        self.requests = []
+        self._cached = []
+        self._loaded = False
+        self._forced_failures = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(parallel)  # Sequence slots, like OLLAMA_NUM_PARALLEL
+        self._server = None
+
+    def unload(self):
+        """The next request pays `cold_load` again, as after keep_alive expires."""
+        with self._lock:
+            self._loaded = False
+            self._cached = []
+
+    def fail_next(self, n: int = 1):
+        with self._lock:
+            self._forced_failures += n
+
+    def _should_fail(self) -> bool:
+        with self._lock:
+            if self._forced_failures:
+                self._forced_failures -= 1
+                return True
+            return self._random.random() < self.failure_rate
+
+    def _load(self) -> float:
+        with self._lock:
+            cold = not self._loaded
+            self._loaded = True
+        if cold and self.cold_load:
+            time.sleep(self.cold_load)
+            return self.cold_load
+        return 0.0
+
+    def _evaluate(self, endpoint: str, tokens: list) -> dict:
+        load = self._load()
+        with self._lock:
+            cached = self._cached
+        common = 0
+        for a, b in zip(cached, tokens):
+            if a != b:
+                break
+            common += 1
+        new_tokens = len(tokens) - common
+        start = time.perf_counter()
+        time.sleep(new_tokens * self.prefill_ms_per_token / 1000)
+        prefill = time.perf_counter() - start
+        with self._lock:
+            self._cached = tokens + tokenize(self.answer)
+
+        record = {"endpoint": endpoint, "prompt_tokens": len(tokens), "reused": common,
+                  "evaluated": new_tokens, "prefill_ms": prefill * 1000}
+        self.requests.append(record)
+        return {"prompt_eval_count": new_tokens, "prompt_eval_duration": int(prefill * 1e9),
+                "load_duration": int(load * 1e9)}
+
+    def _pieces(self):
+        """The answer as streamed fragments, one per word, paced at `token_rate`."""
+        for word in self.answer.split(" "):
+            if self.token_rate:
+                time.sleep(1 / self.token_rate)
+            yield word + " "
+
+    def _handler(self):
+        standin = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def _send_json(self, body: dict, status: int = 200):
+                data = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _send_chunk(self, body: dict):
+                data = (json.dumps(body) + "\n").encode()
+                self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+                self.wfile.flush()
+
+            def do_POST(self):
+                payload = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                if standin._should_fail():
+                    return self._send_json({"error": "stand-in: injected failure"}, 500)
+                if self.path == "/api/generate" and "prompt" not in payload:
+                    # Preload / keep-warm ping
+                    return self._send_json({"response": "", "done": True,
+                                            "load_duration": int(standin._load() * 1e9)})
+                if self.path == "/api/chat":
+                    tokens = chat_tokens(payload.get("messages", []))
+                    wrap = lambda text: {"message": {"role": "assistant", "content": text}}
+                elif self.path == "/api/generate":
+                    tokens = tokenize(payload.get("prompt", ""))
+                    wrap = lambda text: {"response": text}
+                else:
+                    return self._send_json({"error": f"unknown endpoint {self.path}"}, 404)
+
+                with standin._slots:
+                    timings = standin._evaluate(self.path, tokens)
+                    if not payload.get("stream", True):
+                        text = "".join(standin._pieces()).strip()
+                        return self._send_json(dict(wrap(text), done=True, **timings))
+
+                    self.send_response(200)
+                    self.send_header("Content-Type", "application/x-ndjson")
+                    self.send_header("Transfer-Encoding", "chunked")
+                    self.end_headers()
+                    try:
+                        for piece in standin._pieces():
+                            self._send_chunk(dict(wrap(piece), done=False))
+                        self._send_chunk(dict(wrap(""), done=True, **timings))
+                        self.wfile.write(b"0\r\n\r\n")
+                    except (BrokenPipeError, ConnectionResetError):
+                        pass # Client cancelled the stream
+
+        return Handler
+
+    def start(self) -> str:
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+
+
+class FakeSearch:
+    """Drop-in for duckduckgo_search.DDGS: canned snippets after `latency` seconds."""
+    def __init__(self, latency: float = 0.3, failure_rate: float = 0.0, seed: int = 11):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.queries = []
+        self._random = random.Random(seed)
+
+    def __call__(self):
+        # core.web_search instantiates DDGS() per worker thread
+        return self
+
+    def text(self, query: str, max_results: int = 3):
+        self.queries.append(query)
+        time.sleep(self.latency)
+        if self._random.random() < self.failure_rate:
+            raise RuntimeError("stand-in: injected search failure")
+        return [{"title": f"Result {i}", "body": f"Snippet {i} about {query}."} for i in range(max_results)]
+
+
+@contextmanager
+def fake_search(backend: FakeSearch):
+    """Routes core.web_search through `backend` (with a fresh cache) for the duration."""
+    from core.web_search import SearchService
+    service = SearchService()
+    with mock.patch("core.web_search.DDGS", backend), mock.patch("core.web_search.web_search", service), \
+            mock.patch("core.skills.omni_brain_skill.web_search", service):
+        yield service
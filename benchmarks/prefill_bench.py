@@ -0,0 +1,101 @@
+"""
+Prompt prefill per turn over a 20-turn conversation, against the local Ollama stand-in.
+
+    python -m benchmarks.prefill_bench [--ms-per-token 0.25]
+
+"legacy" is the old OmniBrain layout: one raw /api/generate prompt with the
+environment block inside the system prompt, followed by the last 5 history lines.
+"session" is the BrainSession layout the brain uses now: a static system message,
+append-only past turns (folded into a running summary past the token budget, via
+the same stand-in) and the environment in the current user message.
+The environment (emotion, active app) changes every turn, as it does live.
+"""
+import argparse
+
+from benchmarks.latency import summarize
+from benchmarks.ollama_standin import StandInOllama
+from core.brain_session import BrainSession, summarize_turns
+from core.llm_client import LLMClient
+from core.skills.omni_brain_skill import SYSTEM_PROMPT
+from memory.conversation_history import ConversationHistory
+
+TURNS = [
+    "how does a transformer model work", "explain attention in simple terms", "why does it scale so well",
+    "what are the limits of that", "how much memory does a 7b model need", "explain quantization",
+    "how do i pick a quantization level", "what is a kv cache", "why does prefill cost so much",
+    "how do i reuse the prompt prefix", "explain speculative decoding", "is it worth it on a laptop",
+    "what about batching requests", "how do i measure tokens per second", "suggest a benchmark plan",
+    "explain p95 versus p99", "why is tail latency important", "help me plan the next experiment",
+    "what should i log", "think about what we missed",
+]
+EMOTIONS = ["Neutral", "Happy", "Focused", "Neutral", "Surprised"]
+APPS = [("Code.exe", "prefill_bench.py"), ("chrome.exe", "Ollama docs"), ("WindowsTerminal.exe", "python")]
+
+
+def environment(turn: int):
+    vision = f"Optic Status: Detected Objects: person, laptop | User Facial Emotion: {EMOTIONS[turn % len(EMOTIONS)]}"
+    app, title = APPS[(turn // 3) % len(APPS)]
+    return vision, f"User Activity: Currently using {app} ({title}).", "[Internet Data: Not required for this request]"
+
+
+def legacy_prompt(command: str, history: ConversationHistory, vision: str, activity: str, search: str) -> str:
+    """The pre-session OmniBrain prompt layout."""
+    chat_log = "".join(f"{role}: {text}\n" for role, text in history.get_recent(5))
+    system_prompt = (
+        f"You are JARVIS, the highly advanced AI from Stark Industries. "
+        f"You are witty, sophisticated, British-accented, and proactive. "
+        "You have access to real-time vision and internet data. "
+        "\n[CURRENT ENVIRONMENT]:\n"
+        f"{vision}\n{activity}\n{search}\n"
+        "\nINSTRUCTIONS:\n"
+        "1. Address the user as 'Sir'.\n"
+        "2. Be concise (max 2 sentences).\n"
+        "3. Use the environmental data naturally (e.g., 'I see you are holding a pen, Sir').\n"
+        "4. If searching the web, summarize the answer don't just say you checked.\n"
+        "5. No emojis."
+    )
+    return f"{system_prompt}\n\n[CONVERSATION HISTORY]:\n{chat_log}\n\nSir: {command}\nJARVIS:"
+
+
+def run(mode: str, ms_per_token: float):
+    server = StandInOllama(prefill_ms_per_token=ms_per_token)
+    client = LLMClient(host=server.start())
+    history = ConversationHistory(capacity=8)
+    session = BrainSession(SYSTEM_PROMPT, summarizer=lambda previous, messages: summarize_turns(previous, messages, client))
+    try:
+        for turn, command in enumerate(TURNS):
+            history.add("USER", command)
+            vision, activity, search = environment(turn)
+            if mode == "legacy":
+                answer = client.generate(legacy_prompt(command, history, vision, activity, search))
+            else:
+                answer = client.chat(session.build(history, command, f"{vision}\n{activity}\n{search}"))
+            history.add("JARVIS", answer)
+    finally:
+        server.stop()
+    return server.requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-turn prefill: raw prompt vs chat session.")
+    parser.add_argument("--ms-per-token", type=float, default=0.25, help="Simulated prefill cost per token")
+    args = parser.parse_args()
+
+    results = {mode: run(mode, args.ms_per_token) for mode in ("legacy", "session")}
+
+    print(f"{'turn':>4}  {'legacy tokens':>13} {'evaluated':>9} {'ms':>7}  {'session tokens':>14} {'evaluated':>9} {'ms':>7}")
+    for turn, (old, new) in enumerate(zip(results["legacy"], results["session"]), 1):
+        print(f"{turn:>4}  {old['prompt_tokens']:>13} {old['evaluated']:>9} {old['prefill_ms']:>7.1f}  "
+              f"{new['prompt_tokens']:>14} {new['evaluated']:>9} {new['prefill_ms']:>7.1f}")
+
+    print()
+    for mode, records in results.items():
+        s = summarize([r["prefill_ms"] for r in records])
+        evaluated = sum(r["evaluated"] for r in records)
+        sent = sum(r["prompt_tokens"] for r in records)
+        print(f"{mode:<8} prefill mean {s['mean']:.1f}ms p95 {s['p95']:.1f}ms | "
+              f"evaluated {evaluated}/{sent} prompt tokens ({evaluated / sent:.0%})")
+
+
+if __name__ == "__main__":
+    main()
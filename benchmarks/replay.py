@@ -0,0 +1,169 @@
+"""
+Deterministic replay of a recorded event journal through the decision path.
+
+Record a session by setting `event_bus.journal_path` in config/config.yaml, then:
+
+    python -m benchmarks.replay memory/events.jsonl            # as fast as possible
+    python -m benchmarks.replay memory/events.jsonl --realtime # at recorded speed
+    python -m benchmarks.replay memory/events.jsonl --realtime --speed 10
+    python -m benchmarks.replay memory/events.jsonl --live     # real Ollama and DuckDuckGo
+
+Events are fed to a DecisionEngine built with stub sensors, and every actuator
+(app launches, key presses, shell commands) is replaced by a recorder, so no
+microphone, camera or Windows API is touched. The run happens in a scratch copy
+of config/ so learned rules or names in the journal don't leak into the real one.
+Unless --live is given, the LLM is the local stand-in and web search is
+FakeSearch (benchmarks/ollama_standin.py), so a replay is offline and gives the
+same answers every time.
+"""
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import ExitStack, contextmanager
+from unittest import mock
+
+from core.decision_engine import DecisionEngine
+from core.dispatcher import is_interrupt
+from core.event_journal import read_journal
+from core.llm_client import llm
+from core.state_machine import StateMachine
+from memory.database import DatabaseManager, ShortTermMemory
+from personality.response_generator import ResponseGenerator
+from benchmarks.latency import HEADER, format_row
+from benchmarks.ollama_standin import FakeSearch, StandInOllama, fake_search
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Mirrors AgentLoop's subscriptions
+REPLAY_EVENTS = {"USER_PRESENT", "USER_LEFT", "APP_SWITCHED", "WAKE_WORD_DETECTED", "USER_COMMAND", "INTERRUPT"}
+INTERRUPT_PHRASES = ("stop", "listen jarvis", "shut up") # Mirrors perception.audio_listener (which needs vosk)
+
+
+class StubVision:
+    """Stands in for VisionPresence with a fixed, empty scene."""
+    is_present = True
+
+    def get_face_count(self): return 1
+    def get_detected_objects(self): return []
+    def get_finger_count(self): return 0
+    def get_emotion(self): return "Neutral"
+    def get_object_in_hand(self): return None
+    def learn_object(self, original, corrected): pass
+
+
+@contextmanager
+def stub_actuators(calls: list):
+    """Replaces every side-effecting call the skills make with a recorder."""
+    def recorder(name, result=None):
+        def _record(*args, **kwargs):
+            calls.append((name, args))
+            return result
+        return _record
+
+    completed = subprocess.CompletedProcess(args=[], returncode=0, stdout=b"", stderr=b"")
+    with ExitStack() as stack:
+        stack.enter_context(mock.patch("os.system", recorder("os.system", 0)))
+        stack.enter_context(mock.patch("os.startfile", recorder("os.startfile"), create=True))
+        stack.enter_context(mock.patch("subprocess.Popen", recorder("subprocess.Popen", mock.MagicMock())))
+        stack.enter_context(mock.patch("subprocess.run", recorder("subprocess.run", completed)))
+        for fn in ("press", "hotkey", "screenshot"):
+            stack.enter_context(mock.patch(f"pyautogui.{fn}", recorder(f"pyautogui.{fn}")))
+        yield
+
+
+def build_engine(workdir: str) -> DecisionEngine:
+    db = DatabaseManager(os.path.join(workdir, "memory", "replay.db"))
+    return DecisionEngine(StateMachine(), ShortTermMemory(), db, ResponseGenerator(), vision=StubVision())
+
+
+@contextmanager
+def offline_backends(live: bool):
+    """Points the LLM client at the stand-in and web search at FakeSearch, unless `live`."""
+    if live:
+        yield
+        return
+    server = StandInOllama(prefill_ms_per_token=0.0)
+    host = llm.host
+    llm.configure(host=server.start())
+    try:
+        with fake_search(FakeSearch(latency=0.0)):
+            yield
+    finally:
+        server.stop()
+        llm.host = host
+
+
+def replay(journal_path: str, realtime: bool = False, speed: float = 1.0, live: bool = False):
+    events = [(t, e, d) for t, e, d in read_journal(journal_path) if e in REPLAY_EVENTS]
+    if not events:
+        print(f"No replayable events in {journal_path}.")
+        return
+
+    latencies = defaultdict(list)
+    actions = defaultdict(int)
+    calls = []
+    skipped = 0
+    cwd = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as workdir:
+        shutil.copytree(os.path.join(ROOT, "config"), os.path.join(workdir, "config"))
+        os.chdir(workdir)
+        try:
+            engine = build_engine(workdir)
+            with stub_actuators(calls), offline_backends(live):
+                wall_start = time.perf_counter()
+                busy = 0.0
+                for t, event_type, data in events:
+                    data = data or {}
+                    if realtime:
+                        delay = wall_start + t / speed - time.perf_counter()
+                        if delay > 0:
+                            time.sleep(delay)
+
+                    # Same early exit as AgentLoop._handle_event for pure interrupts
+                    raw_cmd = data.get("command", "").lower().strip() if isinstance(data, dict) else ""
+                    if is_interrupt(raw_cmd, INTERRUPT_PHRASES):
+                        skipped += 1
+                        continue
+
+                    start = time.perf_counter()
+                    result = engine.evaluate(event_type, data)
+                    elapsed = time.perf_counter() - start
+                    busy += elapsed
+                    latencies[event_type].append(elapsed * 1000)
+                    actions["SHARED" if (result or {}).get("shared") else (result or {}).get("action", "NONE")] += 1
+                wall = time.perf_counter() - wall_start
+        finally:
+            os.chdir(cwd)
+
+    total = sum(len(v) for v in latencies.values())
+    span = events[-1][0] - events[0][0]
+    print(f"\nReplayed {total} events ({skipped} pure interrupts skipped) from {journal_path}")
+    print(f"Recorded span: {span:.1f}s | Wall: {wall:.2f}s | Decision time: {busy:.2f}s")
+    print(f"Throughput: {total / busy if busy else 0:.1f} events/s of decision time")
+    print(f"\n{HEADER}")
+    for event_type in sorted(latencies):
+        print(format_row(event_type, latencies[event_type]))
+    print(format_row("ALL", [ms for v in latencies.values() for ms in v]))
+    print(f"\nActions: {dict(actions)} | Stubbed actuator calls: {len(calls)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a JARVIS event journal through the DecisionEngine.")
+    parser.add_argument("journal")
+    parser.add_argument("--realtime", action="store_true", help="Honour the recorded inter-event gaps")
+    parser.add_argument("--speed", type=float, default=1.0, help="Speed-up factor for --realtime")
+    parser.add_argument("--live", action="store_true", help="Use the configured Ollama and real web search")
+    args = parser.parse_args()
+    if not os.path.exists(args.journal):
+        sys.exit(f"Journal not found: {args.journal}")
+    replay(os.path.abspath(args.journal), realtime=args.realtime, speed=args.speed, live=args.live)
+
+
+if __name__ == "__main__":
+    main()
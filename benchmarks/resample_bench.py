@@ -0,0 +1,146 @@
+"""
+Device-rate audio vs resampling to 16kHz in the callback.
+
+    python -m benchmarks.resample_bench [--seconds 60] [--rates 44100 48000]
+    python -m benchmarks.resample_bench --wav mic48k.wav --model models/vosk-model-en-in-0.5
+
+Synthetic fixtures (see benchmarks/audio_fixtures.py) are rendered at each device
+rate and pushed through AudioListener.callback with the spectral VAD, once at
+the device rate (`resample` off, the previous behaviour) and once resampled to
+16kHz first. Per run:
+
+  cb us/s   callback CPU (resampler + smoothing + VAD + ring) per second of audio
+  rs us/s   the resampler's share of it
+  fwd       share of audio forwarded to the recognizer
+  rec kS/s  samples per audio second the recognizer has to decode (fwd x rate)
+  recall    share of labelled speech blocks forwarded
+  noise     share of non-speech blocks forwarded
+  agree     share of audio time both runs made the same forward decision
+
+With --wav and --model, each recording also goes through the recognizers
+(see benchmarks/audio_pipeline_bench.py) both ways, and the table shows
+recognizer CPU per audio second and whether the same commands were heard.
+Synthetic fixtures cannot be transcribed, so recognition parity needs real
+recordings.
+"""
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from benchmarks.audio_fixtures import BACKGROUNDS, block_labels, synthesize
+from perception.audio_listener import AudioListener, MODEL_RATE
+from perception.audio_sources import BufferSource, FileSource
+from perception.resampler import Resampler
+
+
+def timeline(forwarded: np.ndarray, block_seconds: float, step: float = 0.01) -> np.ndarray:
+    """Per-block forward decisions on a common 10ms grid, so runs with different block lengths compare."""
+    return np.repeat(forwarded, int(round(block_seconds / step)))
+
+
+def gate_run(source: BufferSource, resample: bool, segments: list) -> dict:
+    listener = AudioListener(model_path="", resample=resample)
+    listener.calibration_start = 0.0
+    listener.clock = source.clock
+    with redirect_stdout(io.StringIO()):
+        source.block_size = listener.set_input_rate(source.samplerate)
+        listener.enable_vad(listener.samplerate)
+
+    total = len(source.pcm) // source.block_size
+    forwarded = np.zeros(total, dtype=bool)
+    resampler_cpu = 0.0
+    if listener.resampler is not None:
+        # Timed separately on its own instance: the filter state does not affect the cost
+        timing = Resampler(source.samplerate, MODEL_RATE)
+        start = time.process_time()
+        for chunk in BufferSource(source.pcm, source.samplerate, source.block_size).blocks():
+            timing.process(np.frombuffer(chunk, dtype=np.int16))
+        resampler_cpu = time.process_time() - start
+
+    cpu = 0.0
+    with redirect_stdout(io.StringIO()):
+        for chunk in source.blocks():
+            start = time.process_time()
+            listener.callback(chunk, len(chunk) // 2, None, None)
+            cpu += time.process_time() - start
+            while not listener.q.empty():
+                forwarded[listener.q.get_nowait()] = True
+
+    labels = block_labels(segments, total, source.block_size, source.samplerate)
+    return {
+        "cb": cpu / source.duration * 1e6,
+        "rs": resampler_cpu / source.duration * 1e6,
+        "fwd": forwarded.mean(),
+        "rec": forwarded.mean() * listener.samplerate / 1000,
+        "recall": forwarded[labels].mean() if labels.any() else 0.0,
+        "noise": forwarded[~labels].mean() if (~labels).any() else 0.0,
+        "timeline": timeline(forwarded, source.block_size / source.samplerate),
+    }
+
+
+def gate_report(seconds: float, rates: list):
+    print(f"{'fixture':<9} {'rate':>6} {'mode':<9} {'cb us/s':>8} {'rs us/s':>8} {'fwd':>5} {'rec kS/s':>9} "
+          f"{'recall':>7} {'noise':>6} {'agree':>6}")
+    for rate in rates:
+        for background in BACKGROUNDS:
+            pcm, segments = synthesize(seconds, rate=rate, background=background, lead=4.0, gap=(4.0, 15.0))
+            runs = {mode: gate_run(BufferSource(pcm, rate), mode == "16k", segments) for mode in ("device", "16k")}
+            n = min(len(run["timeline"]) for run in runs.values())
+            agree = (runs["device"]["timeline"][:n] == runs["16k"]["timeline"][:n]).mean()
+            for mode, r in runs.items():
+                print(f"{background:<9} {rate:>6} {mode:<9} {r['cb']:>8.0f} {r['rs']:>8.0f} {r['fwd']:>5.0%} "
+                      f"{r['rec']:>9.1f} {r['recall']:>7.0%} {r['noise']:>6.0%} "
+                      + (f"{agree:>6.0%}" if mode == "16k" else ""))
+
+
+def recognizer_report(model_path: str, paths: list):
+    from vosk import Model
+    from benchmarks.audio_pipeline_bench import replay
+    from core.event_bus import bus
+
+    model = Model(model_path)
+    heard = []
+    for event in ("WAKE_WORD_DETECTED", "USER_COMMAND"):
+        bus.subscribe(event, lambda data, e=event: heard.append((e, data.get("command", ""))))
+
+    print(f"\n{'recording':<24} {'rate':>6} {'mode':<9} {'cpu/audio':>10} {'events':>7} {'same':>5}")
+    for path in paths:
+        results = {}
+        for mode in ("device", "16k"):
+            source = FileSource(path)
+            listener = AudioListener(model_path="", resample=mode == "16k")
+            listener.model = model
+            with redirect_stdout(io.StringIO()):
+                source.block_size = listener.set_input_rate(source.samplerate)
+                listener.enable_vad(listener.samplerate)
+            listener.build_recognizers(listener.samplerate)
+            heard.clear()
+            start = time.process_time()
+            replay(listener, source)
+            results[mode] = (time.process_time() - start) / source.duration, list(heard), source.samplerate
+        for mode, (cpu, events, rate) in results.items():
+            same = "" if mode == "device" else ("yes" if events == results["device"][1] else "no")
+            print(f"{path.rsplit('/', 1)[-1][:24]:<24} {rate:>6} {mode:<9} {cpu:>10.3f} {len(events):>7} {same:>5}")
+        if results["device"][1] != results["16k"][1]:
+            for mode, (_, events, _) in results.items():
+                print(f"  {mode}: {events}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Device-rate vs 16kHz-resampled gating and recognition.")
+    parser.add_argument("--seconds", type=float, default=60.0, help="Length of each synthetic fixture")
+    parser.add_argument("--rates", type=int, nargs="+", default=[44100, 48000], help="Device rates to simulate")
+    parser.add_argument("--wav", nargs="*", default=[], help="Recordings for the recognizer comparison")
+    parser.add_argument("--model", default=None, help="Vosk model path (enables the recognizer comparison)")
+    args = parser.parse_args()
+
+    gate_report(args.seconds, args.rates)
+    if args.model and args.wav:
+        recognizer_report(args.model, args.wav)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Response cache hot path: how long a repeated question takes to answer from
+ResponseCache.lookup (key digest + LRU hit) at different cache sizes.
+
+    python -m benchmarks.response_cache_bench
+"""
+import time
+
+from core.response_cache import ResponseCache
+from benchmarks.latency import HEADER, format_row
+
+VISION = "Optic Status: Detected Objects: person, laptop, cup | User Facial Emotion: Neutral"
+ACTIVITY = "User Activity: Currently using Code.exe (agent_loop.py - jarvis)."
+SEARCH = "\nRecent Real-world Data:\n" + "\n".join(f"- headline number {i} with a fair amount of body text" for i in range(3))
+QUESTIONS = ["how are you doing", "what's the latest news", "explain quantum tunnelling", "who are you"]
+# (command, expected ttl): self-contained questions are cached, follow-ups and live context are not
+TTL_CHECKS = [
+    ("explain quantum tunnelling", 600), ("why is the sky blue", 600), ("what is it like on mars", 600),
+    ("who are you", 3600), ("tell me more", 0), ("jarvis, what about his brother", 0),
+    ("and the other one", 0), ("it was cheaper yesterday?", 0), ("what time is it", 0),
+    ("time is it", 0), ("jarvis time", 0), ("how much time does light take from the sun", 600),
+]
+
+
+def check_intents():
+    cache = ResponseCache()
+    for command, expected in TTL_CHECKS:
+        name, ttl = cache.intent(command)
+        assert ttl == expected, f"{command!r} -> {name} ({ttl}s), expected {expected}s"
+    print(f"intent TTLs ok for {len(TTL_CHECKS)} commands")
+
+
+def run(entries: int, rounds: int = 20000):
+    cache = ResponseCache(max_entries=entries)
+    for i in range(entries):
+        cache.put(cache.key("brain", f"filler question {i}", VISION, ACTIVITY, SEARCH), f"answer {i}", 3600)
+    for q in QUESTIONS:
+        _, key, ttl = cache.lookup("brain", q, VISION, ACTIVITY, SEARCH)
+        cache.put(key, f"cached answer to {q}", ttl)
+
+    samples = []
+    for i in range(rounds):
+        q = QUESTIONS[i % len(QUESTIONS)]
+        start = time.perf_counter()
+        answer, _, _ = cache.lookup("brain", q, VISION, ACTIVITY, SEARCH)
+        samples.append((time.perf_counter() - start) * 1000)
+        assert answer
+    return samples
+
+
+def main():
+    check_intents()
+    print(HEADER)
+    for entries in (100, 1000, 10000):
+        print(format_row(f"hit @ {entries} entries", run(entries)))
+
+
+if __name__ == "__main__":
+    main()
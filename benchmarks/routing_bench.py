@@ -0,0 +1,120 @@
+"""
+Skill dispatch latency: legacy linear scans vs the SkillRouter index.
+
+Builds a real DecisionEngine (skills are constructed, never executed), routes a
+synthetic corpus of commands through both paths, checks that they produce the
+same routing decisions and reports per-command latency.
+
+    python -m benchmarks.routing_bench [corpus_size]
+"""
+import os
+import random
+import re
+import sys
+import tempfile
+import time
+
+from core.decision_engine import DecisionEngine
+from core.state_machine import StateMachine
+from core.skills.system_skill import SystemSkill
+from core.skills.app_launcher_skill import AppLauncherSkill
+from core.skills.media_skill import MediaSkill
+from core.skills.system_health_skill import SystemHealthSkill
+from core.skills.omni_brain_skill import OmniBrainSkill
+from memory.database import DatabaseManager, ShortTermMemory
+from personality.response_generator import ResponseGenerator
+
+FILLER = [
+    "jarvis", "please", "the", "my", "for", "me", "now", "a", "quick", "can you",
+    "this", "that", "room", "project", "report", "today", "again", "really",
+    "semiconductor", "mumbai", "music", "window", "desk", "calendar",
+]
+
+TEMPLATES = [
+    "{kw}", "{kw} {f}", "{f} {kw}", "{f} {kw} {f}", "{f} {f} {kw} {f} {kw2}",
+    "{kw} {f} {f} {f}", "{f} {f} {f}", "what is {n} plus {n}",
+]
+
+
+def legacy_route(skills, cmd):
+    """The original evaluate() selection logic, as an ordered candidate list."""
+    candidates = []
+    if any(word in cmd for word in ["shutdown", "offline", "exit", "goodbye"]):
+        system_skill = next((s for s in skills if isinstance(s, SystemSkill)), None)
+        if system_skill:
+            candidates.append(("system", system_skill))
+    for skill in skills:
+        if isinstance(skill, (AppLauncherSkill, MediaSkill, SystemHealthSkill)) and skill.matches(cmd):
+            candidates.append(("action", skill))
+    brain = next((s for s in skills if isinstance(s, OmniBrainSkill)), None)
+    if brain and brain.matches(cmd):
+        candidates.append(("intelligence", brain))
+    for skill in skills:
+        if skill.matches(cmd) and not isinstance(skill, (OmniBrainSkill, SystemSkill, AppLauncherSkill, MediaSkill)):
+            candidates.append(("fallback", skill))
+
+    # A skill only ever runs once; later duplicates (e.g. SystemHealth) are unreachable
+    seen, ordered = set(), []
+    for tier, skill in candidates:
+        if id(skill) not in seen:
+            seen.add(id(skill))
+            ordered.append((tier, skill))
+    return ordered
+
+
+def build_corpus(engine, size, seed=11):
+    rng = random.Random(seed)
+    keywords = [kw for skill in engine.skills for kw in skill.routing_keywords()]
+    keywords += ["shutdown", "go offline", "exit", "goodbye", "open", "this", "brunch", "history"]
+    slots = {
+        "kw": lambda: rng.choice(keywords),
+        "f": lambda: rng.choice(FILLER),
+        "n": lambda: str(rng.randint(1, 99)),
+    }
+    # Every placeholder is drawn independently
+    return [
+        re.sub(r"\{(kw|f|n)\d*\}", lambda m: slots[m.group(1)](), rng.choice(TEMPLATES))
+        for _ in range(size)
+    ]
+
+
+def time_dispatch(fn, corpus, rounds=3):
+    best = float("inf")
+    for _ in range(rounds):
+        start = time.perf_counter()
+        for cmd in corpus:
+            fn(cmd)
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseManager(os.path.join(tmp, "bench.db"))
+        engine = DecisionEngine(StateMachine(), ShortTermMemory(), db, ResponseGenerator())
+        corpus = build_corpus(engine, size)
+
+        mismatches = []
+        for cmd in corpus:
+            old = [(t, s.name) for t, s in legacy_route(engine.skills, cmd)]
+            new = [(t, s.name) for t, s in engine.router.route(cmd)]
+            if old != new:
+                mismatches.append((cmd, old, new))
+
+        legacy_us = time_dispatch(lambda c: legacy_route(engine.skills, c), corpus)
+        router_us = time_dispatch(engine.router.route, corpus)
+
+    print(f"Corpus: {size} commands | {len(engine.skills)} skills")
+    print(f"Legacy scan : {legacy_us:8.2f} us/command")
+    print(f"SkillRouter : {router_us:8.2f} us/command ({legacy_us / router_us:.1f}x faster)")
+    print(f"Routing parity: {size - len(mismatches)}/{size} identical")
+    for cmd, old, new in mismatches[:10]:
+        print(f"  MISMATCH {cmd!r}\n    legacy: {old}\n    router: {new}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
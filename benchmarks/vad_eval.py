@@ -0,0 +1,86 @@
+"""
+Recognizer gate evaluation: RMS intensity gate vs spectral VAD on labelled audio.
+
+    python -m benchmarks.vad_eval
+    python -m benchmarks.vad_eval --wav kitchen.wav --labels kitchen.txt
+
+Without --wav, synthetic fixtures are generated (speech over quiet, a fan,
+keyboard clatter and music; see benchmarks/audio_fixtures.py). Labels are
+Audacity label files. Each recording is pushed through AudioListener.callback
+on a stream clock, once per gate.
+
+  fwd      share of all audio blocks forwarded to the recognizer (what Vosk decodes)
+  recall   share of labelled speech blocks forwarded
+  noise    share of non-speech blocks forwarded
+  acc      accuracy of the raw per-block detector decision, before hold/hangover/pre-roll
+"""
+import argparse
+import io
+from contextlib import redirect_stdout
+
+import numpy as np
+
+from benchmarks.audio_fixtures import BACKGROUNDS, block_labels, load_labels, synthesize
+from perception.audio_listener import AudioListener, BLOCK_SIZE
+from perception.audio_sources import BufferSource, FileSource
+
+
+def run(gate_kind: str, source: BufferSource, threshold: int):
+    listener = AudioListener(model_path="", intensity_threshold=threshold)
+    listener.calibration_start = 0.0
+    listener.clock = source.clock
+
+    with redirect_stdout(io.StringIO()):
+        # Recordings not at 16kHz are resampled as they would be live
+        source.block_size = listener.set_input_rate(source.samplerate)
+        if gate_kind == "vad":
+            listener.enable_vad(listener.samplerate)
+        total = len(source.pcm) // source.block_size
+        forwarded = np.zeros(total, dtype=bool)
+        detected = np.zeros(total, dtype=bool)
+        for i, chunk in enumerate(source.blocks()):
+            listener.callback(chunk, len(chunk) // 2, None, None)
+            while not listener.q.empty():
+                forwarded[listener.q.get_nowait()] = True
+            if gate_kind == "vad":
+                vad = listener.vad
+                detected[i] = vad.last_speech_frames >= vad.speech_fraction * vad.frames
+            else:
+                # The RMS gate stamps last_sound_time with the current block's time when it fires
+                detected[i] = listener.last_sound_time == source.clock()
+    return forwarded, detected
+
+
+def report(name: str, source: BufferSource, segments: list, threshold: int):
+    labels = None
+    for gate_kind in ("rms", "vad"):
+        forwarded, detected = run(gate_kind, source, threshold)
+        if labels is None:
+            labels = block_labels(segments, len(forwarded), source.block_size, source.samplerate)
+        recall = forwarded[labels].mean() if labels.any() else 0.0
+        noise = forwarded[~labels].mean() if (~labels).any() else 0.0
+        print(f"{name:<12} {gate_kind:<5} {forwarded.mean():>6.0%} {recall:>7.0%} {noise:>6.0%} "
+              f"{(detected == labels).mean():>6.0%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RMS gate vs spectral VAD on labelled recordings.")
+    parser.add_argument("--wav", nargs="*", default=[], help="16-bit PCM WAVs to evaluate")
+    parser.add_argument("--labels", nargs="*", default=[], help="Audacity label files, one per WAV")
+    parser.add_argument("--seconds", type=float, default=120.0, help="Length of each synthetic fixture")
+    parser.add_argument("--threshold", type=int, default=150, help="RMS gate base threshold (config value)")
+    args = parser.parse_args()
+
+    print(f"{'recording':<12} {'gate':<5} {'fwd':>6} {'recall':>7} {'noise':>6} {'acc':>6}")
+    if args.wav:
+        for wav, labels in zip(args.wav, args.labels):
+            report(wav.rsplit("/", 1)[-1][:12], FileSource(wav, BLOCK_SIZE), load_labels(labels), args.threshold)
+        return
+    for background in BACKGROUNDS:
+        # A speech-free lead-in gives the RMS gate its 3-second calibration
+        pcm, segments = synthesize(args.seconds, background=background, lead=4.0, gap=(4.0, 15.0))
+        report(background, BufferSource(pcm, 16000, BLOCK_SIZE), segments, args.threshold)
+
+
+if __name__ == "__main__":
+    main()
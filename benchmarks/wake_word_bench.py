@@ -0,0 +1,65 @@
+"""
+Recognizer CPU per second of audio: single full recognizer vs two-stage wake-word spotting.
+
+    python -m benchmarks.wake_word_bench --wav office.wav commands.wav [--model models/vosk-model-en-in-0.5]
+
+Needs the Vosk model and real recordings (synthetic fixtures cannot be
+transcribed). Each recording is replayed through AudioListener's gate and
+recognizer (see benchmarks/audio_pipeline_bench.py), once with `two_stage` off
+and once on; process CPU time is measured around the whole pass. The events columns show both modes hear the
+same wake words and commands.
+"""
+import argparse
+import io
+import time
+from contextlib import redirect_stdout
+
+from vosk import Model
+
+from benchmarks.audio_pipeline_bench import replay
+from core.event_bus import bus
+from perception.audio_listener import AudioListener, BLOCK_SIZE, supports_grammar
+from perception.audio_sources import FileSource
+
+EVENTS = ("WAKE_WORD_DETECTED", "USER_COMMAND")
+
+
+def run(model: Model, path: str, two_stage: bool, heard: list):
+    source = FileSource(path, BLOCK_SIZE)
+    listener = AudioListener(model_path="", two_stage=two_stage)
+    listener.model = model
+    with redirect_stdout(io.StringIO()):
+        source.block_size = listener.set_input_rate(source.samplerate)
+    listener.build_recognizers(listener.samplerate)
+
+    heard.clear()
+    start = time.process_time()
+    replay(listener, source)
+    return time.process_time() - start, source.duration, list(heard)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Recognizer CPU per audio second, one vs two stages.")
+    parser.add_argument("--wav", nargs="+", required=True, help="WAV/FLAC recordings")
+    parser.add_argument("--model", default="models/vosk-model-en-in-0.5")
+    args = parser.parse_args()
+
+    model = Model(args.model)
+    if not supports_grammar(args.model):
+        print(f"⚠️ {args.model} has no runtime-grammar graph: Vosk ignores the spotter grammar, "
+              f"so 'two-stage' runs two full decoders. The listener falls back to one recognizer.\n")
+    heard = []
+    for event in EVENTS:
+        bus.subscribe(event, lambda data, e=event: heard.append((e, data.get("command", ""))))
+
+    print(f"{'recording':<24} {'mode':<10} {'audio s':>8} {'cpu s':>7} {'cpu/audio':>10} {'wakes':>6} {'cmds':>5}")
+    for wav in args.wav:
+        for two_stage in (False, True):
+            cpu, seconds, events = run(model, wav, two_stage, heard)
+            wakes = sum(1 for e, _ in events if e == "WAKE_WORD_DETECTED")
+            print(f"{wav.rsplit('/', 1)[-1][:24]:<24} {'two-stage' if two_stage else 'full':<10} {seconds:>8.1f} "
+                  f"{cpu:>7.2f} {cpu / seconds:>10.3f} {wakes:>6} {len(events) - wakes:>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -5,11 +5,19 @@ import threading
 import sys
 from colorama import Fore, Style, init
 
-from core.event_bus import bus
+from core.event_bus import bus, OVERFLOW_COALESCE
+from core.event_journal import EventJournal
 from core.state_machine import StateMachine, JarvisState
 from core.decision_engine import DecisionEngine
+from core.llm_client import llm
+from core.response_cache import response_cache
+from core.web_search import web_search
+from core.digest_prefetcher import digest_prefetcher
+from core.speculation import speculator
+from core.dispatcher import EventDispatcher, LANE_INTERRUPT, LANE_COMMAND, LANE_PASSIVE, is_interrupt
 from perception.perception_layer import VisionPresence, ActivityTracker
-from perception.audio_listener import AudioListener
+from perception.audio_listener import AudioListener, BLOCK_SIZE, INTERRUPT_PHRASES
+from perception.audio_sources import make_source
 from memory.database import DatabaseManager, ShortTermMemory
 from personality.response_generator import ResponseGenerator
 from action.action_layer import TTSEngine, AutomationEngine
@@ -29,7 +37,14 @@ class AgentLoop:
         try:
             with open(config_path, 'r') as f:
                 self.config = yaml.safe_load(f)
-                
+
+            # Attach first so sensor events published during startup are captured too
+            journal_path = self.config.get('event_bus', {}).get('journal_path')
+            if journal_path:
+                journal_abs = os.path.abspath(os.path.join(self.root, journal_path))
+                bus.attach_journal(EventJournal(journal_abs))
+                print(f"📼 {Fore.YELLOW}Recording bus events to {journal_abs}")
+
             print(f"🧠 {Fore.YELLOW}Initializing Intelligence Core...")
             # Make paths absolute relative to project root
             db_abs_path = os.path.abspath(os.path.join(self.root, self.config['memory']['db_path']))
@@ -59,14 +74,57 @@ class AgentLoop:
             audio_model_abs = os.path.abspath(os.path.join(self.root, self.config['perception']['audio']['model_path']))
             self.audio = AudioListener(audio_model_abs, 
                                        self.config['perception']['audio']['wake_word'],
-                                       self.config['perception']['audio'].get('intensity_threshold', 150))
+                                       self.config['perception']['audio'].get('intensity_threshold', 150),
+                                       vad=self.config['perception']['audio'].get('vad'),
+                                       two_stage=self.config['perception']['audio'].get('two_stage', False),
+                                       resample=self.config['perception']['audio'].get('resample', True),
+                                       interrupt_phrases=INTERRUPT_PHRASES,
+                                       barge_in=self.config['perception']['audio'].get('barge_in', False),
+                                       source=make_source(self.config['perception']['audio'].get('source'), BLOCK_SIZE))
             
             # We start the audio thread immediately, it handles its own slow model loading
             self.audio.start()
             
+            dispatch_cfg = self.config.get('dispatcher', {})
+            self.dispatcher = EventDispatcher(
+                workers=dispatch_cfg.get('workers', 3),
+                max_queue=dispatch_cfg.get('max_queue', 32),
+                supersede_commands=dispatch_cfg.get('supersede_commands', True)
+            )
+            self.dispatcher.start()
+
+            # Shared Ollama client: load the model now and keep it resident while Sir is around
+            llm_cfg = self.config.get('llm', {})
+            llm.configure(**llm_cfg)
+            if llm_cfg.get('preload', True):
+                llm.preload()
+            llm.start_keep_warm(lambda: self.vision.is_present if self.vision else True,
+                                interval=llm_cfg.get('warm_interval', 300))
+            response_cache.configure(**self.config.get('response_cache', {}))
+            web_search.configure(**self.config.get('search', {}))
+            self.decision_engine.single_flight.window = self.config['decision_engine'].get('dedup_window', 1.5)
+            if self.decision_engine.brain:
+                self.decision_engine.brain.configure(**self.config.get('brain', {}))
+
+            # Wake word heard in a partial result: warm the model and snapshot context early
+            speculator.configure(**self.config.get('speculation', {}))
+            if self.decision_engine.brain:
+                speculator.bind(lambda: self.decision_engine.brain.snapshot_context(
+                    {"vision": self.vision, "memory": self.stm}))
+
+            # News/weather digests are refreshed only while Sir is around and not mid-conversation
+            digest_cfg = self.config.get('digests', {})
+            digest_prefetcher.configure(**digest_cfg)
+            digest_prefetcher.start(
+                is_present=lambda: self.vision.is_present if self.vision else True,
+                is_idle=lambda: self.sm.current_state == JarvisState.IDLE and
+                                time.time() - self._last_interaction > digest_cfg.get('idle_after', 60)
+            )
+
             self._running = False
             self._setup_subscriptions()
             self._last_interaction = time.time()
+            self._interrupt_latency = [] # Seconds from a fast-path INTERRUPT being heard to TTS being stopped
             print(f"✅ {Fore.GREEN}Systems Ready.")
             
         except Exception as e:
@@ -76,24 +134,80 @@ class AgentLoop:
             sys.exit(1)
 
     def _setup_subscriptions(self):
-        events = ["USER_PRESENT", "USER_LEFT", "APP_SWITCHED", "WAKE_WORD_DETECTED", "USER_COMMAND"]
-        for e in events:
-            # We wrap the handle in a thread to keep the event source (Audio/Vision) responsive
-            bus.subscribe(e, lambda data, et=e: threading.Thread(target=self._handle_event, args=(et, data), daemon=True).start())
+        passive = ["USER_PRESENT", "USER_LEFT", "APP_SWITCHED"]
+        commands = ["WAKE_WORD_DETECTED", "USER_COMMAND", "INTERRUPT"]
+
+        bus_cfg = self.config.get('event_bus', {})
+        if bus_cfg.get('async_passive', True):
+            # Sensor topics go through the bus's own queues: handled one at a time per
+            # topic, and a burst collapses to the latest value instead of piling up.
+            # The handler itself still runs on the dispatcher's passive lane, behind commands
+            for e in passive:
+                bus.subscribe(e, lambda data, et=e: self._dispatch_passive(et, data),
+                              queue_size=bus_cfg.get('passive_queue_size', 1), overflow=OVERFLOW_COALESCE)
+        else:
+            commands = passive + commands
+
+        # Cheap and non-blocking; kept off the dispatcher so it never supersedes a command
+        bus.subscribe("ATTENTION", speculator.on_attention)
+
+        for e in commands:
+            # Hand off to the worker pool to keep the event source (Audio/Vision) responsive
+            bus.subscribe(e, lambda data, et=e: self._dispatch(et, data))
 
-    def _handle_event(self, event_type: str, data: dict):
+    def _dispatch(self, event_type: str, data: dict):
+        if event_type == "INTERRUPT":
+            # Fast-path phrase from a partial result (or heard over JARVIS's own voice)
+            lane = LANE_INTERRUPT
+        elif event_type in ("USER_COMMAND", "WAKE_WORD_DETECTED"):
+            raw_cmd = data.get("command", "").lower()
+            # Only the bare phrase interrupts; "stop the music" or "bus stop" is an ordinary command
+            lane = LANE_INTERRUPT if is_interrupt(raw_cmd, INTERRUPT_PHRASES) else LANE_COMMAND
+            # A repeat of a command that is still being handled must not supersede it
+            if lane == LANE_COMMAND and raw_cmd.strip() and \
+                    self.decision_engine.single_flight.suppress_if_active(self.decision_engine.command_key(raw_cmd)):
+                print(f"🔁 [DEDUP] Duplicate of an in-flight command suppressed: '{raw_cmd.strip()}'")
+                return
+        else:
+            lane = LANE_PASSIVE
+        self.dispatcher.submit(lane, self._handle_event, event_type, data)
+
+    def _dispatch_passive(self, event_type: str, data: dict):
+        """Runs a queued sensor event on the passive lane and waits for it, so its topic stays one at a time."""
+        done = threading.Event()
+
+        def _run(token, et, d):
+            try:
+                self._handle_event(token, et, d)
+            finally:
+                done.set()
+
+        token = self.dispatcher.submit(LANE_PASSIVE, _run, event_type, data)
+        while not done.wait(0.5):
+            if token.cancelled or not self._running:
+                return # Dropped from a full lane or shutting down; it will not run
+
+    def _handle_event(self, token, event_type: str, data: dict):
         self._last_interaction = time.time()
         
         # INTERRUPTION LOGIC: If user says "stop" or "listen jarvis", kill active TTS
         raw_cmd = data.get("command", "").lower()
-        if "stop" in raw_cmd or "listen jarvis" in raw_cmd or "shut up" in raw_cmd:
+        if is_interrupt(raw_cmd, INTERRUPT_PHRASES):
             self.tts.stop_speaking()
-            # If it was just a stop command, we can return early or proceed to evaluate
-            if raw_cmd.strip() in ["stop", "listen jarvis", "shut up"]:
-                return
+            if event_type == "INTERRUPT":
+                self._interrupt_latency.append(time.monotonic() - data["at"])
+            return
 
-        result = self.decision_engine.evaluate(event_type, data)
+        result = self.decision_engine.evaluate(event_type, data, token)
+        if token.cancelled:
+            # A newer command (or a barge-in) arrived while this one was thinking
+            print(f"⏭️ [DISPATCH] Dropping superseded result for '{raw_cmd}'.")
+            return
         if result:
+            if result.get("shared"):
+                # The first copy of this command is already saying (or doing) it
+                print(f"🔁 [DEDUP] Duplicate of an in-flight command answered once: '{raw_cmd.strip()}'")
+                return
             if result.get("terminate"):
                 self.tts.speak("Systems powering down. It's been a pleasure, Sir.")
                 time.sleep(2)
@@ -102,6 +216,8 @@ class AgentLoop:
             
             if result.get("action") == "SPEAK":
                 self.tts.speak(result["text"])
+            elif result.get("action") == "SPEAK_STREAM":
+                self.tts.speak_stream(result["stream"])
             elif result.get("action") == "EXECUTE":
                 self.automation.execute_command(result["text"])
             elif result.get("action") == "LOG":
@@ -137,7 +253,11 @@ class AgentLoop:
         
         print(f"🎤 All core threads dispatched. Jarvis is monitoring...")
         
-        threading.Thread(target=self._cli_input_thread, daemon=True).start()
+        if getattr(self.audio.source, "uses_stdin", False):
+            # stdin carries the audio; reading commands from it would eat PCM and publish it as text
+            print(f"⌨️ {Fore.YELLOW}Audio arrives on stdin; typed commands are disabled.")
+        else:
+            threading.Thread(target=self._cli_input_thread, daemon=True).start()
         threading.Thread(target=self._proactive_check, daemon=True).start()
         
         print(f"{Fore.BLUE}💬 Hello, Sir. Jarvis at your service. All systems standing by.")
@@ -153,6 +273,29 @@ class AgentLoop:
 
     def stop(self):
         self._running = False
+        self.dispatcher.stop()
+        bus.shutdown()
+        for lane, s in self.dispatcher.stats().items():
+            print(f"📊 [DISPATCH] {lane}: {s['processed']} handled | {s['cancelled']} cancelled | {s['dropped']} dropped | wait avg {s['avg_wait_ms']}ms, max {s['max_wait_ms']}ms")
+        n = llm.stats()
+        print(f"📊 [NEURAL] warm: {n['warm']['count']} calls, avg {n['warm']['avg_ms']}ms | cold: {n['cold']['count']} calls, avg {n['cold']['avg_ms']}ms | first token avg {n['first_token']['avg_ms']}ms | errors: {n['errors']}")
+        q = n['scheduler']
+        print(f"📊 [SCHEDULER] interactive: {q['interactive']['count']} (wait avg {q['interactive']['avg_wait_ms']}ms, max {q['interactive']['max_wait_ms']}ms) | background: {q['background']['count']} (wait avg {q['background']['avg_wait_ms']}ms) | {q['superseded']} superseded | {q['timeouts']} timed out")
+        c = response_cache.stats()
+        print(f"📊 [CACHE] {c['hits']} hits / {c['misses']} misses ({c['hit_rate']:.0%}) | {c['bypassed']} bypassed | {c['evictions']} evicted | avg hit {c['avg_hit_us']}µs")
+        w = web_search.stats()
+        print(f"📊 [INTERNET] {w['hits']} cached / {w['negative_hits']} cached-empty / {w['misses']} fetched | {w['coalesced']} coalesced | {w['timeouts']} over budget | {w['errors']} errors")
+        d = digest_prefetcher.stats()
+        print(f"📊 [DIGEST] {d['answered']} answered from digests | {d['stale']} stale | {d['refreshed']} refreshed | {d['failed']} failed refreshes")
+        sp = speculator.stats()
+        print(f"📊 [SPECULATION] {sp['attentions']} attention signals | {sp['used']} snapshots used | {sp['expired']} expired | {sp['cancelled']} cancelled")
+        a = self.audio.stats()
+        lat = self._interrupt_latency
+        print(f"📊 [BARGE-IN] {a['interrupts']} fast-path interrupts ({a['barge_in']} over speech) | {a['debounced']} debounced | "
+              f"ahead of final result by avg {a['avg_lead_ms']}ms | heard-to-silenced avg {sum(lat) / len(lat) * 1000 if lat else 0:.0f}ms, "
+              f"max {max(lat, default=0) * 1000:.0f}ms")
+        f = self.decision_engine.single_flight.stats()
+        print(f"📊 [DEDUP] {f['leaders']} commands handled | {f['suppressed']} duplicates suppressed")
         self.audio.stop()
         if self.vision:
             self.vision.stop()
@@ -0,0 +1,148 @@
+import math
+import threading
+from typing import Callable, List
+
+from core.llm_scheduler import PRIORITY_BACKGROUND
+
+ROLES = {"USER": "user", "JARVIS": "assistant"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English with Mistral's tokenizer)."""
+    return math.ceil(len(text) / 4)
+
+
+def summarize_turns(previous: str, messages: List[dict], client=None) -> str:
+    """Default folding step: asks the LLM to merge old turns into the running summary."""
+    if client is None:
+        from core.llm_client import llm as client
+    transcript = "\n".join(f"{'Sir' if m['role'] == 'user' else 'JARVIS'}: {m['content']}" for m in messages)
+    prompt = (
+        "Update the running summary of a conversation between Sir and JARVIS with the new turns below. "
+        "Keep names, facts, decisions and open questions; drop pleasantries. At most 80 words, plain prose.\n\n"
+        f"[SUMMARY SO FAR]:\n{previous or '(none)'}\n\n[NEW TURNS]:\n{transcript}\n\n[UPDATED SUMMARY]:"
+    )
+    return client.generate(prompt, options={"temperature": 0.2, "num_predict": 160}, timeout=60,
+                           priority=PRIORITY_BACKGROUND)
+
+
+class BrainSession:
+    """
+    Chat-API message list for the brain, laid out so Ollama can reuse its KV cache.
+    The system prompt never changes and past turns are only ever appended, so each
+    request shares its whole prefix with the previous one. The per-turn environment
+    (vision/activity/search) rides in the current user message only; once the turn
+    is over it is replaced by the plain command, which costs re-prefilling just that
+    last exchange.
+
+    Past turns are kept under a token budget: when they exceed it, the oldest batch
+    is folded into a running summary (placed right after the system prompt) by a
+    background summarizer, so the prompt stays bounded however long the conversation
+    runs and the prefix only changes when a fold lands.
+    """
+    def __init__(self, system_prompt: str, token_budget: int = 1200, fold_batch: int = 6,
+                 summarizer: Callable[[str, List[dict]], str] = summarize_turns):
+        self.system = {"role": "system", "content": system_prompt}
+        self.token_budget = token_budget
+        self.fold_batch = fold_batch
+        self.summarizer = summarizer
+        self.summary = ""
+        self.messages = []
+        self.last_counts = {}
+        self._seq = 0 # History entries up to here are in `messages`
+        self._synced = set() # Later entries already appended
+        self._folding = False
+        self._lock = threading.Lock()
+
+    def configure(self, context_tokens: int = None, fold_batch: int = None, **_):
+        if context_tokens: self.token_budget = context_tokens
+        if fold_batch: self.fold_batch = fold_batch
+
+    def _tokens(self, messages: List[dict]) -> int:
+        return sum(estimate_tokens(m["content"]) for m in messages)
+
+    def _sync(self, history, command: str):
+        """Appends turns that reached the chat history since the last request."""
+        entries = [e for e in history.since(self._seq) if e[0] not in self._synced]
+        # The current command is already in the history; it is sent separately below and
+        # synced as a past turn next time. A streamed answer can land after it, so it is
+        # not necessarily the last entry, and a repeat of it is the same turn
+        current = next((e[0] for e in reversed(entries) if e[1] == "USER" and e[2] == command), None)
+        for seq, role, message in entries:
+            if current is not None and seq >= current and role == "USER" and message == command:
+                continue
+            self.messages.append({"role": ROLES.get(role, "user"), "content": message})
+            if current is None or seq < current:
+                self._seq = seq
+            else:
+                self._synced.add(seq) # Appended ahead of the deferred command; skipped next time
+        self._synced = {seq for seq in self._synced if seq > self._seq}
+
+    def _fold_span(self) -> int:
+        """How many of the oldest messages to fold: about `fold_batch`, ending before a user turn."""
+        span = min(self.fold_batch, len(self.messages) - 1)
+        while 0 < span < len(self.messages) and self.messages[span]["role"] != "user":
+            span += 1
+        return span if span < len(self.messages) else 0
+
+    def _compact(self):
+        if self._tokens(self.messages) <= self.token_budget:
+            return
+        span = self._fold_span()
+        if span <= 0:
+            return
+
+        if self._tokens(self.messages) > 2 * self.token_budget:
+            # The summarizer is lagging far behind; drop the oldest turns outright
+            del self.messages[:span]
+            print(f"✂️ [CONTEXT] Summary lagging; dropped {span} old messages.")
+            return
+
+        if not self._folding:
+            self._folding = True
+            folded = self.messages[:span]
+            threading.Thread(target=self._fold, args=(folded, self.summary), daemon=True).start()
+
+    def _fold(self, folded: List[dict], previous: str):
+        try:
+            summary = (self.summarizer(previous, folded) or "").strip()
+        except Exception as e:
+            summary = ""
+            print(f"⚠️ [CONTEXT] Summary refresh failed: {e}")
+        with self._lock:
+            self._folding = False
+            if not summary:
+                return
+            # Swap in the new summary and drop exactly the turns it covers, in one step
+            if self.messages[:len(folded)] == folded:
+                del self.messages[:len(folded)]
+            self.summary = summary
+        print(f"🗜️ [CONTEXT] Folded {len(folded)} messages into the running summary (~{estimate_tokens(summary)} tokens).")
+
+    def build(self, history, command: str, environment: str) -> list:
+        """Messages for this turn: system prompt, summary, recent turns, then environment + command."""
+        with self._lock:
+            if history is not None:
+                self._sync(history, command)
+            self._compact()
+
+            turn = {"role": "user", "content": f"[CURRENT ENVIRONMENT]:\n{environment}\n\n{command}"}
+            prefix = [self.system]
+            if self.summary:
+                prefix.append({"role": "system", "content": f"[EARLIER CONVERSATION SUMMARY]:\n{self.summary}"})
+            messages = prefix + self.messages + [turn]
+
+            self.last_counts = {
+                "system": estimate_tokens(self.system["content"]),
+                "summary": estimate_tokens(self.summary) if self.summary else 0,
+                "history": self._tokens(self.messages),
+                "turn": estimate_tokens(turn["content"]),
+                "messages": len(self.messages),
+            }
+            self.last_counts["total"] = sum(v for k, v in self.last_counts.items() if k != "messages")
+            return messages
+
+    def reset(self):
+        with self._lock:
+            self.messages.clear()
+            self.summary = ""
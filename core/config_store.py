@@ -0,0 +1,91 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Callable
+
+
+class _Entry:
+    __slots__ = ("data", "signature", "checked_at")
+
+    def __init__(self, data, signature, checked_at):
+        self.data = data
+        self.signature = signature
+        self.checked_at = checked_at
+
+
+class ConfigStore:
+    """
+    Shared in-memory cache of parsed JSON config files.
+    Reads are served from memory and revalidated against the file's mtime/size
+    at most once per `revalidate_interval`; writes are atomic (write-then-rename).
+    Returned objects are shared, so treat them as read-only and go through
+    `write`/`update` to change them.
+    """
+    def __init__(self, revalidate_interval: float = 1.0):
+        self.revalidate_interval = revalidate_interval
+        self._entries = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _signature(path: str):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self, path: str, default: Any = None) -> Any:
+        path = os.path.abspath(path)
+        entry = self._entries.get(path)
+        now = time.monotonic()
+        if entry and now - entry.checked_at < self.revalidate_interval:
+            return default if entry.data is None else entry.data
+
+        with self._lock:
+            signature = self._signature(path)
+            if entry and entry.signature == signature:
+                entry.checked_at = now
+                return default if entry.data is None else entry.data
+
+            data = None
+            if signature is not None:
+                try:
+                    with open(path, 'r') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f"⚠️ [CONFIG] Could not parse {os.path.basename(path)}: {e}")
+            self._entries[path] = _Entry(data, signature, now)
+            return default if data is None else data
+
+    def write(self, path: str, data: Any):
+        """Atomically replaces the file and the cached copy."""
+        path = os.path.abspath(path)
+        directory = os.path.dirname(path)
+        with self._lock:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=".json")
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            self._entries[path] = _Entry(data, self._signature(path), time.monotonic())
+
+    def update(self, path: str, mutate: Callable[[dict], None], default: dict = None) -> dict:
+        """Read-modify-write: `mutate` edits a copy of the current dict in place."""
+        with self._lock:
+            data = dict(self.get(path, default or {}))
+            mutate(data)
+            self.write(path, data)
+            return data
+
+
+# Global instance shared by every consumer of config/*.json
+config_store = ConfigStore()
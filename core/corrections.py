@@ -0,0 +1,97 @@
+import threading
+from typing import Dict, Optional
+
+from core.keyword_automaton import KeywordAutomaton, is_word_boundary
+
+# Common Vosk mis-hearings (mostly of the wake word) mapped to what was meant
+ASR_CORRECTIONS = {
+    "canada": "can you", "kenya": "can you", "horrendous": "focus",
+    "obvious": "jarvis", "service": "jarvis", "database": "jarvis",
+    "hell is our": "hello jarvis", "over us": "jarvis", "it was obvious": "jarvis",
+    "holding up": "what am i holding", "jobless": "jarvis", "dharavish": "jarvis",
+    "charvis": "jarvis", "garbage": "jarvis", "travis": "jarvis",
+    "harvest": "jarvis", "see you": "see", "look at": "look",
+    "who are": "who", "time is it": "time", "what time": "time",
+    "shut down": "shutdown", "go to sleep": "shutdown", "lock in": "focus",
+    "focus mode": "focus", "system hill": "system health",
+    "charges check": "jarvis check", "nuclear billy": "you clearly",
+    "you nuclear": "you clearly", "i needed a search torture": "i need a search for",
+    "search torture": "search for", "how are u": "how are you",
+    "status sessoins": "focus sessions", "he didn't": "hidden",
+    "give mjarvis": "give me jarvis", "jarvijarvis": "jarvis",
+    "who you again": "who are you again", "day gping": "day going",
+    "search voucher": "search for", "search warrant": "search for",
+    "years": "sir", "for years": "sir", "active and ready for years": "active and ready for sir",
+    "pigeon": "vision", "visit": "vision", "i'd apply": "identify", "i'd enter fee": "identify",
+    "old in": "holding", "cold in": "holding", "what am i old inside": "what am i holding",
+    "scan the room": "scan the room", "scandalous": "scan the room", "skandham": "scan the room",
+    "look at me": "see me", "hear me": "you there", "charles": "jarvis", "dharavi": "jarvis",
+    "shows hours": "are you", "do ever": "do you ever", "ihat": "what", "myve": "i've",
+    "listen to have": "jarvis", "of his do": "do you", "how do you saw": "how are you",
+    "he's very": "jarvis", "is thereir": "jarvis",
+    "i read years": "jarvis", "i met": "jarvis", "hines me": "see me",
+    "rightas your": "how is your", "whatever was": "whatever",
+    "might be": "jarvis", "as youweir": "as you were",
+    "ittify": "identify", "i was do i": "do you", "daughter is do": "jarvis do",
+    "is there": "jarvis", "service": "jarvis", "configure": "computer",
+    "configured": "computer", "hell of a": "hello jarvis",
+    "u n hurt me": "can you hear me", "genres": "jarvis",
+    "golf land": "offline", "go offline and": "go offline",
+    "can you here me": "can you hear me", "stop dollars": "stop",
+    "stop jarvis": "stop", "i'm good": "shutdown", "i'm listening": "jarvis",
+    "stark": "stark", "ropen": "open", "hopen": "open", "lopen": "open",
+    "tell me mouse": "tell me about", "use latest": "news"
+}
+
+
+class CorrectionEngine:
+    """
+    Rewrites ASR transcripts in a single left-to-right pass.
+    Matches are whole-word and leftmost-longest, and replaced text is never
+    re-scanned, so one correction cannot rewrite the output of another.
+    This differs from the old chained `re.sub` pass (longest key first, each
+    rewriting the previous output) where keys overlap: "what time is it" is
+    now "time is it" ("what time" starts first), where it used to collapse to
+    "time". benchmarks/correction_bench.py lists every such difference.
+    """
+    def __init__(self, corrections: Optional[Dict[str, str]] = None):
+        self.table: Dict[str, str] = {}
+        self._automaton = KeywordAutomaton()
+        self._lock = threading.Lock()
+        for error, fix in (corrections or {}).items():
+            self.table[error.lower()] = fix
+        self._automaton.extend((error, error) for error in self.table)
+
+    def __len__(self):
+        return len(self.table)
+
+    def add(self, error: str, fix: str):
+        """Hot-adds (or overrides) a correction. Takes effect on the next apply."""
+        error = error.lower()
+        with self._lock:
+            # apply() runs unlocked: the fix must be in the table before the automaton can match it
+            new = error not in self.table
+            self.table[error] = fix
+            if new:
+                self._automaton.add(error, error)
+
+    def apply(self, text: str) -> str:
+        matches = [
+            (start, end, key) for start, end, key in self._automaton.iter_matches(text)
+            if is_word_boundary(text, start) and is_word_boundary(text, end)
+        ]
+        if not matches:
+            return text
+
+        # Leftmost wins, then longest
+        matches.sort(key=lambda m: (m[0], -m[1]))
+        parts = []
+        pos = 0
+        for start, end, key in matches:
+            if start < pos:
+                continue
+            parts.append(text[pos:start])
+            parts.append(self.table[key])
+            pos = end
+        parts.append(text[pos:])
+        return "".join(parts)
@@ -0,0 +1,21 @@
+import time
+
+
+class Deadline:
+    """One end-to-end time budget shared by every stage of a request."""
+    def __init__(self, budget: float):
+        self.budget = budget
+        self.start = time.monotonic()
+        self.at = self.start + budget
+
+    def remaining(self, cap: float = None) -> float:
+        """Seconds left (never negative), optionally capped by a stage's own limit."""
+        left = max(0.0, self.at - time.monotonic())
+        return min(left, cap) if cap is not None else left
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.at
+
+    def elapsed_ms(self) -> float:
+        return (time.monotonic() - self.start) * 1000
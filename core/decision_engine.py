@@ -1,11 +1,15 @@
 import time
-import json
 import os
 import random
 from datetime import datetime
 
 # Core Imports
 from core.state_machine import JarvisState
+from core.config_store import config_store
+from core.corrections import ASR_CORRECTIONS, CorrectionEngine
+from core.skill_router import SkillRouter
+from core.rule_index import RuleIndex, normalize_phrase
+from core.single_flight import SingleFlight
 from memory.database import ShortTermMemory, DatabaseManager
 from memory.conversation_history import ConversationHistory
 from personality.response_generator import ResponseGenerator
@@ -29,6 +33,15 @@ from core.skills.conversation_skill import ConversationSkill
 from core.skills.omni_brain_skill import OmniBrainSkill
 from core.skills.vision_learning_skill import VisionLearningSkill
 
+# Command routing precedence, highest first: (tier, skill types, keyword override).
+# Skill types of None claims every skill not taken by an earlier tier.
+ROUTING_TIERS = [
+    ("system", (SystemSkill,), ["shutdown", "offline", "exit", "goodbye"]),
+    ("action", (AppLauncherSkill, MediaSkill, SystemHealthSkill), None),
+    ("intelligence", (OmniBrainSkill,), None),
+    ("fallback", None, None),
+]
+
 class DecisionEngine:
     def __init__(self, state_machine, memory: ShortTermMemory, db: DatabaseManager, personality: ResponseGenerator, vision=None):
         self.sm = state_machine
@@ -40,6 +53,8 @@ class DecisionEngine:
         
         self.rules_path = os.path.join("config", "rules.json")
         self.user_memory_path = os.path.join("config", "user_memory.json")
+        self.rules = RuleIndex(self.rules_path)
+        self.single_flight = SingleFlight(window=1.5)
 
         self.skills = [
             ProtocolSkill(self.sm),
@@ -59,63 +74,108 @@ class DecisionEngine:
             SystemSkill()
         ]
         
-        self.corrections = {
-            "canada": "can you", "kenya": "can you", "horrendous": "focus",
-            "obvious": "jarvis", "service": "jarvis", "database": "jarvis",
-            "hell is our": "hello jarvis", "over us": "jarvis", "it was obvious": "jarvis",
-            "holding up": "what am i holding", "jobless": "jarvis", "dharavish": "jarvis",
-            "charvis": "jarvis", "garbage": "jarvis", "travis": "jarvis",
-            "harvest": "jarvis", "see you": "see", "look at": "look",
-            "who are": "who", "time is it": "time", "what time": "time",
-            "shut down": "shutdown", "go to sleep": "shutdown", "lock in": "focus",
-            "focus mode": "focus", "system hill": "system health",
-            "charges check": "jarvis check", "nuclear billy": "you clearly",
-            "you nuclear": "you clearly", "i needed a search torture": "i need a search for",
-            "search torture": "search for", "how are u": "how are you",
-            "status sessoins": "focus sessions", "he didn't": "hidden",
-            "give mjarvis": "give me jarvis", "jarvijarvis": "jarvis",
-            "who you again": "who are you again", "day gping": "day going",
-            "search voucher": "search for", "search warrant": "search for",
-            "years": "sir", "for years": "sir", "active and ready for years": "active and ready for sir",
-            "pigeon": "vision", "visit": "vision", "i'd apply": "identify", "i'd enter fee": "identify",
-            "old in": "holding", "cold in": "holding", "what am i old inside": "what am i holding",
-            "scan the room": "scan the room", "scandalous": "scan the room", "skandham": "scan the room",
-            "look at me": "see me", "hear me": "you there", "charles": "jarvis", "dharavi": "jarvis",
-            "shows hours": "are you", "do ever": "do you ever", "ihat": "what", "myve": "i've",
-            "listen to have": "jarvis", "of his do": "do you", "how do you saw": "how are you",
-            "he's very": "jarvis", "is thereir": "jarvis",
-            "i read years": "jarvis", "i met": "jarvis", "hines me": "see me",
-            "rightas your": "how is your", "whatever was": "whatever",
-            "might be": "jarvis", "as youweir": "as you were",
-            "ittify": "identify", "i was do i": "do you", "daughter is do": "jarvis do",
-            "is there": "jarvis", "service": "jarvis", "configure": "computer",
-            "configured": "computer", "hell of a": "hello jarvis",
-            "u n hurt me": "can you hear me", "genres": "jarvis",
-            "golf land": "offline", "go offline and": "go offline",
-            "can you here me": "can you hear me", "stop dollars": "stop",
-            "stop jarvis": "stop", "i'm good": "shutdown", "i'm listening": "jarvis",
-            "stark": "stark", "ropen": "open", "hopen": "open", "lopen": "open",
-            "tell me mouse": "tell me about", "use latest": "news"
-        }
+        self.brain = next((s for s in self.skills if isinstance(s, OmniBrainSkill)), None)
+        self.router = self._build_router()
+        self.corrector = CorrectionEngine(ASR_CORRECTIONS)
+        self.corrections = self.corrector.table
+
+    def _build_router(self):
+        router = SkillRouter()
+        claimed = set()
+        for tier, skill_types, keywords in ROUTING_TIERS:
+            if skill_types is None:
+                members = [s for s in self.skills if id(s) not in claimed]
+            else:
+                members = [s for s in self.skills if isinstance(s, skill_types)]
+            claimed.update(id(s) for s in members)
+            # Override words are plain substrings, like the original `in` checks
+            router.add_tier(tier, members, keywords=keywords, match_mode="substring" if keywords else None)
+        return router
 
     def _clean_command(self, cmd: str):
-        import re
-        sorted_keys = sorted(self.corrections.keys(), key=len, reverse=True)
-        for error in sorted_keys:
-            # Use regex for whole word replacement to avoid partial matches
-            pattern = r'\b' + re.escape(error) + r'\b'
-            cmd = re.sub(pattern, self.corrections[error], cmd)
-        return cmd
+        return self.corrector.apply(cmd)
 
     def _get_user_name(self):
-        if os.path.exists(self.user_memory_path):
-            try:
-                with open(self.user_memory_path, 'r') as f:
-                    return json.load(f).get("name", "Sir")
-            except: pass
-        return "Sir"
-
-    def evaluate(self, event_type: str, data: dict):
+        return config_store.get(self.user_memory_path, {}).get("name", "Sir")
+
+    def _remember(self, result: dict):
+        """Adds a skill's spoken answer to the chat history (streams add theirs once finished)."""
+        if not result:
+            return
+        if result.get("action") == "SPEAK":
+            self.chat_history.add("JARVIS", result["text"])
+        elif result.get("action") == "SPEAK_STREAM":
+            result["stream"].on_complete(lambda text: self.chat_history.add("JARVIS", text))
+
+    def command_key(self, raw_cmd: str) -> str:
+        """The single-flight key for a raw command: corrected and normalized."""
+        cmd = self._clean_command(raw_cmd.strip().lower())
+        return normalize_phrase(cmd) or cmd
+
+    def _handle_command(self, cmd: str, user_name: str, key: str = None, token=None):
+        self.chat_history.add("USER", cmd)
+
+        # Context
+        context = {
+            "user_name": user_name,
+            "vision": self.vision,
+            "personality": self.personality,
+            "db": self.db,
+            "memory": self.memory,
+            "history": self.chat_history,
+            # One LLM session for everything Sir says: a new command aborts the previous answer's generation
+            "session": "voice",
+            # Dispatcher cancel token: set when a newer command or a barge-in supersedes this one
+            "cancel": token
+        }
+
+        # Candidates arrive in ROUTING_TIERS order from a single scan of the command
+        candidates = self.router.route(cmd)
+
+        # 1. System Overrides & 2. Action Skills: do it, no chatter
+        if candidates and candidates[0][0] in ("system", "action"):
+            # Side effects Sir may well repeat on purpose ("volume up", "next track"): no post-completion dedup
+            if key:
+                self.single_flight.release(key)
+            return candidates[0][1].execute(cmd, context)
+
+        # 3a. Learned Rules (answer taught phrases without touching the LLM)
+        answer = self.rules.lookup(cmd)
+        if answer:
+            stats = self.rules.stats()
+            print(f"📘 [RULES] Answered from learned rule. Hits: {stats['hits']} | Misses: {stats['misses']}")
+            self.chat_history.add("JARVIS", answer)
+            return {"action": "SPEAK", "text": answer}
+
+        for tier, skill in candidates:
+            # 3. Intelligence Pass (Catch-all for reasoning/search/vision)
+            if tier == "intelligence":
+                self.sm.transition(JarvisState.CHATTING)
+                result = skill.execute(cmd, context)
+                if result:
+                    self._remember(result)
+                    return result
+                continue
+
+            # 4. Fallback Skill
+            result = skill.execute(cmd, context)
+            self._remember(result)
+            return result
+
+        # 5. Global Fallback to Brain
+        if self.brain:
+            result = self.brain.execute(cmd, context)
+            self._remember(result)
+            return result
+
+        return None
+
+    def evaluate(self, event_type: str, data: dict, token=None):
+        """
+        Decides how to react to one event; returns an action dict or None.
+        A repeat of a command that is already being handled gets the same result
+        back with "shared": True, so only the first caller should act on it.
+        """
         now = time.time()
         user_name = self._get_user_name()
         
@@ -135,8 +195,7 @@ class DecisionEngine:
         elif event_type == "APP_SWITCHED":
             app_name = data.get("app_name")
             if self.sm.current_state == JarvisState.FOCUS_MODE:
-                switch_count = self.memory.get("switch_count", 0) + 1
-                self.memory.update("switch_count", switch_count)
+                switch_count = self.memory.increment("switch_count")
                 if switch_count >= 3:
                     self.memory.update("switch_count", 0) 
                     resp = self.personality.get_response("COACH_SWITCH")
@@ -153,53 +212,12 @@ class DecisionEngine:
                 return {"action": "SPEAK", "text": "At your service, Sir. I'm listening."}
 
             cmd = self._clean_command(raw_cmd)
-            self.chat_history.add("USER", cmd)
-
-            # Context
-            context = {
-                "user_name": user_name,
-                "vision": self.vision,
-                "personality": self.personality,
-                "db": self.db,
-                "memory": self.memory,
-                "history": self.chat_history
-            }
-
-            # 1. System Overrides (Highest Priority)
-            if any(word in cmd for word in ["shutdown", "offline", "exit", "goodbye"]):
-                system_skill = next((s for s in self.skills if isinstance(s, SystemSkill)), None)
-                if system_skill: return system_skill.execute(cmd, context)
-
-            # 2. Action Skills (If user says 'open', 'play', etc., prioritize doing it)
-            for skill in self.skills:
-                if isinstance(skill, (AppLauncherSkill, MediaSkill, SystemHealthSkill)):
-                    if skill.matches(cmd):
-                        return skill.execute(cmd, context)
-
-            # 3. Intelligence Pass (Catch-all for reasoning/search/vision)
-            brain = next((s for s in self.skills if isinstance(s, OmniBrainSkill)), None)
-            if brain and brain.matches(cmd):
-                self.sm.transition(JarvisState.CHATTING)
-                result = brain.execute(cmd, context)
-                if result:
-                    if result.get("action") == "SPEAK":
-                        self.chat_history.add("JARVIS", result["text"])
-                    return result
-
-            # 4. Fallback Skill Check
-            for skill in self.skills:
-                if skill.matches(cmd) and not isinstance(skill, (OmniBrainSkill, SystemSkill, AppLauncherSkill, MediaSkill)):
-                    result = skill.execute(cmd, context)
-                    if result and result.get("action") == "SPEAK":
-                        self.chat_history.add("JARVIS", result["text"])
-                    return result
-
-            # 5. Global Fallback to Brain
-            if brain:
-                result = brain.execute(cmd, context)
-                if result and result.get("action") == "SPEAK":
-                    self.chat_history.add("JARVIS", result["text"])
-                return result
+            # The same utterance can arrive twice (wake word + command, CLI + mic, recognizer repeats)
+            key = self.command_key(raw_cmd)
+            result, shared = self.single_flight.do(key, lambda: self._handle_command(cmd, user_name, key, token))
+            if shared and result:
+                return dict(result, shared=True)
+            return result
 
         return None
 
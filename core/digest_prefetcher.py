@@ -0,0 +1,137 @@
+import os
+import threading
+import time
+from typing import Callable, Optional
+
+from core.config_store import config_store
+from core.llm_client import llm
+from core.llm_scheduler import PRIORITY_BACKGROUND
+from core.rule_index import normalize_phrase
+from core.web_search import web_search, STOPWORDS
+
+DEFAULT_TOPICS = [
+    {"name": "news", "query": "latest news headlines", "triggers": ["news", "headlines", "headline"]},
+    {"name": "weather", "query": "weather forecast today", "triggers": ["weather", "forecast", "temperature"]},
+]
+
+# Words that don't narrow a digest question ("what's the latest news" is still just "news")
+_GENERIC = STOPWORDS | {"latest", "today", "current", "now", "like", "outside", "any", "new", "world", "sir"}
+
+
+class DigestPrefetcher:
+    """
+    Keeps short, pre-summarized digests for a few configured topics (news, weather).
+    While the user is present and idle, stale topics are re-searched and summarized
+    in the background, and the results land in a JSON digest store. Plain questions
+    about a topic are then answered from the store; narrower ones ("news about
+    Tesla") or stale digests go down the live search + LLM path instead.
+    """
+    def __init__(self, path: str = os.path.join("memory", "digests.json"), topics: list = None,
+                 refresh_interval: float = 1800, max_age: float = 3600, check_interval: float = 30,
+                 retry_interval: float = 300):
+        self.path = path
+        self.topics = topics or DEFAULT_TOPICS
+        self.refresh_interval = refresh_interval
+        self.max_age = max_age
+        self.check_interval = check_interval
+        self.retry_interval = retry_interval
+        self.enabled = True
+        self._thread = None
+        self._last_attempt = {}
+        self.counters = {"answered": 0, "stale": 0, "refreshed": 0, "failed": 0}
+
+    def configure(self, enabled: bool = None, path: str = None, topics: list = None,
+                  refresh_interval: float = None, max_age: float = None, **_):
+        if enabled is not None: self.enabled = enabled
+        if path: self.path = path
+        if topics: self.topics = topics
+        if refresh_interval: self.refresh_interval = refresh_interval
+        if max_age: self.max_age = max_age
+
+    def _topic_for(self, command: str) -> Optional[dict]:
+        words = normalize_phrase(command).split()
+        for topic in self.topics:
+            triggers = set(topic["triggers"])
+            if triggers.intersection(words):
+                # Anything left beyond generic words means a narrower question than the digest
+                rest = [w for w in words if w not in triggers and w not in _GENERIC]
+                return None if rest else topic
+        return None
+
+    def age(self, name: str) -> float:
+        digest = config_store.get(self.path, {}).get(name)
+        return time.time() - digest["updated"] if digest else float("inf")
+
+    def answer(self, command: str) -> Optional[str]:
+        """The stored digest for a general question about a topic, if it is fresh enough."""
+        if not self.enabled:
+            return None
+        topic = self._topic_for(command)
+        if not topic:
+            return None
+        digest = config_store.get(self.path, {}).get(topic["name"])
+        if not digest or time.time() - digest["updated"] > self.max_age:
+            self.counters["stale"] += 1
+            return None
+        self.counters["answered"] += 1
+        return digest["text"]
+
+    def refresh(self, topic: dict) -> bool:
+        results = web_search.search(topic["query"])
+        if not results:
+            self.counters["failed"] += 1
+            return False
+        prompt = (
+            "You are JARVIS, the AI from Stark Industries. Summarize the following for Sir in at most "
+            "3 spoken sentences, witty but precise, no emojis, no lists.\n\n"
+            + "\n".join(f"- {body}" for body in results)
+            + "\n\nJARVIS:"
+        )
+        try:
+            text = llm.generate(prompt, options={"temperature": 0.5, "num_predict": 120}, timeout=60,
+                                priority=PRIORITY_BACKGROUND)
+        except Exception as e:
+            print(f"⚠️ [DIGEST] Could not summarize {topic['name']}: {e}")
+            self.counters["failed"] += 1
+            return False
+        if not text:
+            self.counters["failed"] += 1
+            return False
+
+        def _store(digests):
+            digests[topic["name"]] = {"text": text, "updated": time.time(), "query": topic["query"]}
+        config_store.update(self.path, _store, default={})
+        self.counters["refreshed"] += 1
+        print(f"📰 [DIGEST] {topic['name'].capitalize()} digest refreshed.")
+        return True
+
+    def start(self, is_present: Callable[[], bool], is_idle: Callable[[], bool]):
+        """Refreshes stale digests in the background, only while the user is present and idle."""
+        if self._thread or not self.enabled:
+            return
+
+        def _loop():
+            while True:
+                for topic in self.topics:
+                    if self.age(topic["name"]) < self.refresh_interval:
+                        continue
+                    if time.time() - self._last_attempt.get(topic["name"], 0) < self.retry_interval:
+                        continue
+                    if not (is_present() and is_idle()):
+                        break
+                    self._last_attempt[topic["name"]] = time.time()
+                    try:
+                        self.refresh(topic)
+                    except Exception as e:
+                        print(f"⚠️ [DIGEST] Refresh failed for {topic['name']}: {e}")
+                time.sleep(self.check_interval)
+
+        self._thread = threading.Thread(target=_loop, name="digest-prefetch", daemon=True)
+        self._thread.start()
+
+    def stats(self) -> dict:
+        return dict(self.counters)
+
+
+# Global instance shared by the brain and the agent loop
+digest_prefetcher = DigestPrefetcher()
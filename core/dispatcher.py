@@ -0,0 +1,174 @@
+import re
+import threading
+import time
+from collections import deque
+from typing import Callable
+
+# Priority lanes, highest first
+LANE_INTERRUPT = 0
+LANE_COMMAND = 1
+LANE_PASSIVE = 2
+LANE_NAMES = ("interrupt", "command", "passive")
+
+# Words that can wrap an interrupt phrase without turning it into a request ("ok jarvis, stop talking please")
+INTERRUPT_FILLERS = {"jarvis", "ok", "okay", "hey", "please", "just", "now", "talking", "speaking",
+                     "it", "that", "right", "there", "already"}
+
+
+def is_interrupt(command: str, phrases) -> bool:
+    """
+    True if the utterance is an interrupt phrase, matched as whole words, with
+    nothing around it but filler words or more interrupt words ("stop stop").
+    "stop the music" and "bus stop" are ordinary commands.
+    """
+    words = re.sub(r"[^\w\s]", " ", command.lower()).split()
+    allowed = INTERRUPT_FILLERS.union(*(p.split() for p in phrases))
+    for phrase in phrases:
+        target = phrase.split()
+        for i in range(len(words) - len(target) + 1):
+            if words[i:i + len(target)] == target and all(w in allowed for w in words[:i] + words[i + len(target):]):
+                return True
+    return False
+
+
+class CancelToken:
+    """Handed to every job so it can notice it was superseded or interrupted."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class _Job:
+    __slots__ = ("fn", "args", "lane", "token", "enqueued_at")
+
+    def __init__(self, fn, args, lane):
+        self.fn = fn
+        self.args = args
+        self.lane = lane
+        self.token = CancelToken()
+        self.enqueued_at = time.monotonic()
+
+
+class EventDispatcher:
+    """
+    Fixed-size worker pool draining priority lanes (interrupt > command > passive).
+    One extra worker only serves the interrupt lane, so "stop" is never stuck
+    behind a long LLM call. Lanes are bounded and drop their oldest job when full.
+    """
+    def __init__(self, workers: int = 3, max_queue: int = 32, supersede_commands: bool = True):
+        self.workers = max(1, workers)
+        self.max_queue = max_queue
+        self.supersede_commands = supersede_commands
+        self._lanes = [deque() for _ in LANE_NAMES]
+        self._running_commands = set()
+        self._cond = threading.Condition()
+        self._running = False
+        self._stats = [
+            {"submitted": 0, "started": 0, "processed": 0, "cancelled": 0, "dropped": 0, "wait_total": 0.0, "wait_max": 0.0}
+            for _ in LANE_NAMES
+        ]
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+        for i in range(self.workers):
+            threading.Thread(target=self._worker, args=(None,), name=f"dispatch-{i}", daemon=True).start()
+        threading.Thread(target=self._worker, args=(LANE_INTERRUPT,), name="dispatch-interrupt", daemon=True).start()
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify_all()
+
+    def submit(self, lane: int, fn: Callable, *args) -> CancelToken:
+        """Queues fn(token, *args) on a lane and returns the job's cancel token."""
+        job = _Job(fn, args, lane)
+        with self._cond:
+            stats = self._stats[lane]
+            stats["submitted"] += 1
+            if lane == LANE_INTERRUPT:
+                self._cancel_commands_locked()
+            elif lane == LANE_COMMAND and self.supersede_commands:
+                self._cancel_commands_locked()
+
+            queue = self._lanes[lane]
+            if len(queue) >= self.max_queue:
+                queue.popleft().token.cancel()
+                stats["dropped"] += 1
+            queue.append(job)
+            self._cond.notify_all()
+        return job.token
+
+    def cancel_commands(self):
+        """Cancels queued and in-flight commands (used on barge-in)."""
+        with self._cond:
+            self._cancel_commands_locked()
+
+    def _cancel_commands_locked(self):
+        queue = self._lanes[LANE_COMMAND]
+        self._stats[LANE_COMMAND]["cancelled"] += len(queue)
+        while queue:
+            queue.popleft().token.cancel()
+        for token in self._running_commands:
+            token.cancel()
+
+    def _next_job(self, only_lane):
+        lanes = [only_lane] if only_lane is not None else range(len(self._lanes))
+        for lane in lanes:
+            if self._lanes[lane]:
+                return self._lanes[lane].popleft()
+        return None
+
+    def _worker(self, only_lane):
+        while True:
+            with self._cond:
+                job = self._next_job(only_lane)
+                while job is None and self._running:
+                    self._cond.wait()
+                    job = self._next_job(only_lane)
+                if job is None:
+                    return
+
+                waited = time.monotonic() - job.enqueued_at
+                stats = self._stats[job.lane]
+                stats["started"] += 1
+                stats["wait_total"] += waited
+                stats["wait_max"] = max(stats["wait_max"], waited)
+                if job.lane == LANE_COMMAND:
+                    self._running_commands.add(job.token)
+
+            try:
+                job.fn(job.token, *job.args)
+            except Exception as e:
+                print(f"❌ [DISPATCH] Handler error in {LANE_NAMES[job.lane]} lane: {e}")
+            finally:
+                with self._cond:
+                    self._running_commands.discard(job.token)
+                    stats["processed"] += 1
+                    if job.token.cancelled:
+                        stats["cancelled"] += 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            report = {}
+            for lane, name in enumerate(LANE_NAMES):
+                s = self._stats[lane]
+                started = s["started"] or 1
+                report[name] = {
+                    "depth": len(self._lanes[lane]),
+                    "submitted": s["submitted"],
+                    "processed": s["processed"],
+                    "cancelled": s["cancelled"],
+                    "dropped": s["dropped"],
+                    "avg_wait_ms": round(s["wait_total"] / started * 1000, 2),
+                    "max_wait_ms": round(s["wait_max"] * 1000, 2),
+                }
+            return report
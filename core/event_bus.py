@@ -1,24 +1,137 @@
+import asyncio
+import inspect
+import threading
 from threading import Lock
-from collections import defaultdict
+from collections import defaultdict, deque
 from typing import Callable, Any
 
+# Overflow policies for queued (async) subscriptions
+OVERFLOW_DROP_OLDEST = "drop-oldest"
+OVERFLOW_COALESCE = "coalesce-latest"
+OVERFLOW_BLOCK = "block"
+
+
+class _QueuedSubscription:
+    """
+    A subscriber fed from the bus's asyncio loop through a bounded queue,
+    so publishers never run (or wait on) the subscriber's code.
+    """
+    def __init__(self, event_type: str, callback: Callable, maxsize: int, overflow: str):
+        self.event_type = event_type
+        self.callback = callback
+        self.maxsize = max(1, maxsize)
+        self.overflow = overflow
+        self.pending = deque()
+        self.lock = Lock()
+        self.space = threading.Condition(self.lock)
+        self.wakeup = None  # asyncio.Event, created on the loop
+        self.closed = False
+        self.stats = {"published": 0, "delivered": 0, "dropped": 0, "coalesced": 0, "max_depth": 0}
+
+    def offer(self, data: Any, loop, blocking: bool) -> None:
+        """Thread-safe enqueue applying the overflow policy."""
+        with self.lock:
+            self.stats["published"] += 1
+            if self.closed:
+                self.stats["dropped"] += 1
+                return
+            if len(self.pending) >= self.maxsize:
+                if self.overflow == OVERFLOW_COALESCE:
+                    # Collapse to the latest value
+                    self.pending[-1] = data
+                    self.stats["coalesced"] += 1
+                    return
+                if self.overflow == OVERFLOW_BLOCK and blocking:
+                    while len(self.pending) >= self.maxsize and not self.closed:
+                        self.space.wait()
+                    if self.closed:
+                        self.stats["dropped"] += 1
+                        return
+                else:
+                    self.pending.popleft()
+                    self.stats["dropped"] += 1
+            self.pending.append(data)
+            self.stats["max_depth"] = max(self.stats["max_depth"], len(self.pending))
+        loop.call_soon_threadsafe(self.wakeup.set)
+
+    def take(self):
+        with self.lock:
+            if not self.pending:
+                return False, None
+            data = self.pending.popleft()
+            self.space.notify()
+            return True, data
+
+    def close(self):
+        """Stops accepting events and releases publishers blocked on a full queue."""
+        with self.lock:
+            self.closed = True
+            self.pending.clear()
+            self.space.notify_all()
+
+
 class EventBus:
-    """A simple thread-safe synchronous event bus."""
+    """
+    A simple thread-safe event bus.
+    Plain subscribers run inline on the publisher's thread. Subscribers that pass
+    `queue_size` are delivered asynchronously from a bus-owned asyncio loop with
+    a bounded queue and an overflow policy (drop-oldest, coalesce-latest, block).
+    """
     def __init__(self):
         self._subscribers = defaultdict(list)
+        self._queued = defaultdict(list)
         self._lock = Lock()
+        self._loop = None
+        self._loop_thread = None
+        self._tasks = []
+        self._journal = None
+
+    def attach_journal(self, journal):
+        """Records every published event (see core.event_journal) until detached with None."""
+        self._journal = journal
+
+    def subscribe(self, event_type: str, callback: Callable[[Any], None],
+                  queue_size: int = None, overflow: str = OVERFLOW_BLOCK):
+        if queue_size is None:
+            with self._lock:
+                self._subscribers[event_type].append(callback)
+            return
+
+        sub = _QueuedSubscription(event_type, callback, queue_size, overflow)
+        loop = self._ensure_loop()
+        ready = threading.Event()
+
+        def _register():
+            sub.wakeup = asyncio.Event()
+            self._tasks.append(loop.create_task(self._consume(sub)))
+            ready.set()
 
-    def subscribe(self, event_type: str, callback: Callable[[Any], None]):
+        if threading.current_thread() is self._loop_thread:
+            _register()
+        else:
+            loop.call_soon_threadsafe(_register)
+            ready.wait()
         with self._lock:
-            self._subscribers[event_type].append(callback)
+            self._queued[event_type].append(sub)
 
     def publish(self, event_type: str, data: Any = None):
+        journal = self._journal
+        if journal is not None:
+            journal.record(event_type, data)
+
         with self._lock:
             subscribers = self._subscribers[event_type][:]
-        
+            queued = self._queued[event_type][:]
+
+        if queued:
+            # The loop thread itself must never block on its own queues
+            blocking = threading.current_thread() is not self._loop_thread
+            for sub in queued:
+                sub.offer(data, self._loop, blocking)
+
         for callback in subscribers:
             try:
-                # If we are in wait/shutdown, some futures might fail. 
+                # If we are in wait/shutdown, some futures might fail.
                 # We catch it here to prevent the "cannot schedule" error.
                 callback(data)
             except RuntimeError as re:
@@ -29,5 +142,61 @@ class EventBus:
             except Exception as e:
                 print(f"Error in subscriber for {event_type}: {e}")
 
+    async def publish_async(self, event_type: str, data: Any = None):
+        """Publish from a coroutine running on the bus loop."""
+        self.publish(event_type, data)
+
+    def _ensure_loop(self):
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._loop_thread = threading.Thread(target=self._loop.run_forever, name="event-bus", daemon=True)
+                self._loop_thread.start()
+            return self._loop
+
+    async def _consume(self, sub: _QueuedSubscription):
+        loop = asyncio.get_running_loop()
+        is_coroutine = inspect.iscoroutinefunction(sub.callback)
+        while True:
+            await sub.wakeup.wait()
+            sub.wakeup.clear()
+            while True:
+                has_data, data = sub.take()
+                if not has_data:
+                    break
+                try:
+                    if is_coroutine:
+                        await sub.callback(data)
+                    else:
+                        # Sync callbacks run off-loop so they can't stall other subscribers
+                        await loop.run_in_executor(None, sub.callback, data)
+                    sub.stats["delivered"] += 1
+                except Exception as e:
+                    print(f"Error in queued subscriber for {sub.event_type}: {e}")
+
+    def stats(self) -> dict:
+        """Per-event counters for queued subscriptions."""
+        with self._lock:
+            return {
+                event_type: [dict(sub.stats, depth=len(sub.pending), policy=sub.overflow) for sub in subs]
+                for event_type, subs in self._queued.items() if subs
+            }
+
+    def shutdown(self):
+        if self._journal is not None:
+            self._journal.close()
+        with self._lock:
+            queued = [sub for subs in self._queued.values() for sub in subs]
+        for sub in queued:
+            sub.close()
+        if self._loop is None:
+            return
+
+        def _stop():
+            for task in self._tasks:
+                task.cancel()
+            self._loop.call_soon(self._loop.stop)
+        self._loop.call_soon_threadsafe(_stop)
+
 # Global instance for ease of use
 bus = EventBus()
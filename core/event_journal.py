@@ -0,0 +1,66 @@
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Iterator, Tuple
+
+
+class EventJournal:
+    """
+    Append-only JSON-lines journal of published bus events.
+    Each line is {"t": seconds since session start (monotonic), "e": event, "d": payload};
+    every session starts with a {"session": ...} header line.
+    """
+    def __init__(self, path: str, flush_interval: float = 1.0):
+        self.path = path
+        self.flush_interval = flush_interval
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._last_flush = self._start
+        self.count = 0
+        self._write({"session": datetime.now().isoformat()})
+
+    def _write(self, record: dict):
+        self._file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+
+    def record(self, event_type: str, data: Any):
+        now = time.monotonic()
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write({"t": round(now - self._start, 6), "e": event_type, "d": data})
+            self.count += 1
+            if now - self._last_flush > self.flush_interval:
+                self._file.flush()
+                self._last_flush = now
+
+    def close(self):
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+
+def read_journal(path: str) -> Iterator[Tuple[float, str, Any]]:
+    """
+    Yields (t, event_type, data) for every recorded event. Sessions are laid end to
+    end, so `t` keeps increasing across restarts.
+    """
+    offset = 0.0
+    last_t = 0.0
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue # Torn final line from a crash
+            if "session" in record:
+                offset = last_t
+                continue
+            last_t = offset + record["t"]
+            yield last_t, record["e"], record.get("d")
@@ -0,0 +1,133 @@
+import threading
+from collections import deque
+from typing import Any, Iterable, Iterator, Tuple
+
+
+def is_word_char(ch: str) -> bool:
+    return ch.isalnum() or ch == "_"
+
+
+def is_word_boundary(text: str, index: int) -> bool:
+    """Equivalent of the regex `\\b` assertion at `index`."""
+    before = index > 0 and is_word_char(text[index - 1])
+    after = index < len(text) and is_word_char(text[index])
+    return before != after
+
+
+class _Trie:
+    """Builder trie plus the frozen goto/fail/output tables used for matching."""
+    def __init__(self):
+        self.edges = [{}]
+        self.own = [[]]
+        self.count = 0
+        self.tables = ([{}], [0], [[]])
+        self.dirty = False
+
+    def insert(self, keyword: str, value: Any):
+        state = 0
+        for ch in keyword:
+            nxt = self.edges[state].get(ch)
+            if nxt is None:
+                nxt = len(self.edges)
+                self.edges[state][ch] = nxt
+                self.edges.append({})
+                self.own.append([])
+            state = nxt
+        self.own[state].append((len(keyword), value))
+        self.count += 1
+        self.dirty = True
+
+    def build(self):
+        goto = [dict(edges) for edges in self.edges]
+        fail = [0] * len(goto)
+        out = [list(outputs) for outputs in self.own]
+
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                # Longer (own) matches first, then the shorter suffix matches
+                out[nxt].extend(out[fail[nxt]])
+
+        self.tables = (goto, fail, out)
+        self.dirty = False
+
+
+def _scan(tables, text: str) -> Iterator[Tuple[int, int, Any]]:
+    goto, fail, out = tables
+    state = 0
+    for i, ch in enumerate(text):
+        while state and ch not in goto[state]:
+            state = fail[state]
+        state = goto[state].get(ch, 0)
+        if out[state]:
+            end = i + 1
+            for length, value in out[state]:
+                yield end - length, end, value
+
+
+class KeywordAutomaton:
+    """
+    Aho-Corasick automaton over characters.
+    Reports every keyword occurrence in a single left-to-right pass, so the
+    per-text cost is independent of how many keywords are registered.
+
+    Bulk loads go straight into the main automaton. Hot-adds land in a small
+    delta automaton that is folded into the main one every `fold_threshold`
+    entries, so a single add never pays for a full rebuild.
+    """
+    def __init__(self, fold_threshold: int = 256):
+        self.fold_threshold = fold_threshold
+        self._lock = threading.Lock()
+        self._main = _Trie()
+        self._delta = _Trie()
+        self._pending = []
+
+    def __len__(self):
+        return self._main.count + self._delta.count
+
+    def extend(self, items: Iterable[Tuple[str, Any]]):
+        """Bulk-registers (keyword, value) pairs. The rebuild happens on the next match."""
+        with self._lock:
+            for keyword, value in items:
+                if keyword:
+                    self._main.insert(keyword, value)
+
+    def add(self, keyword: str, value: Any = None):
+        """Hot-adds a keyword. Safe to call while other threads are matching."""
+        if not keyword:
+            return
+        value = keyword if value is None else value
+        with self._lock:
+            self._pending.append((keyword, value))
+            if len(self._pending) >= self.fold_threshold:
+                for kw, val in self._pending:
+                    self._main.insert(kw, val)
+                self._main.build()
+                self._pending = []
+                self._delta = _Trie()
+            else:
+                self._delta.insert(keyword, value)
+                self._delta.build()
+
+    def build(self):
+        with self._lock:
+            if self._main.dirty:
+                self._main.build()
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, Any]]:
+        """
+        Yields (start, end, value) for every keyword occurrence in `text`.
+        Occurrences from the main and delta automata are not interleaved by position.
+        """
+        if self._main.dirty:
+            self.build()
+        main, delta = self._main.tables, self._delta
+        yield from _scan(main, text)
+        if delta.count:
+            yield from _scan(delta.tables, text)
@@ -0,0 +1,235 @@
+import json
+import threading
+import time
+from typing import Callable, Iterator
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.llm_scheduler import LLMScheduler, LLMSuperseded, PRIORITY_INTERACTIVE
+
+
+class LLMError(Exception):
+    """Ollama answered with a non-200 status."""
+    def __init__(self, status_code: int, text: str):
+        super().__init__(f"Status Code {status_code} | Text: {text[:100]}")
+        self.status_code = status_code
+        self.text = text
+
+
+class LLMClient:
+    """
+    Shared Ollama client for every skill.
+    Reuses pooled keep-alive HTTP connections, asks Ollama to keep the model
+    resident (`keep_alive`), can preload it and keep it warm while the user is
+    around, and tracks cold-load vs warm call latency separately.
+    Every generation goes through `scheduler`, which bounds concurrency, orders
+    interactive before background work and lets a newer request on the same
+    `session` abort an older one.
+    """
+    def __init__(self, host: str = "http://localhost:11434", model: str = "mistral:7b",
+                 keep_alive: str = "30m", pool_size: int = 4, cold_threshold: float = 0.5,
+                 stream: bool = False, max_concurrent: int = 1):
+        self.host = host.rstrip("/")
+        self.model = model
+        self.keep_alive = keep_alive
+        self.cold_threshold = cold_threshold
+        self.stream = stream
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=pool_size))
+        self.scheduler = LLMScheduler(max_concurrent)
+        self._lock = threading.Lock()
+        self._last_request = 0.0
+        self._warm_thread = None
+        self._stats = {
+            "warm": {"count": 0, "total": 0.0},
+            "cold": {"count": 0, "total": 0.0},
+            "first_token": {"count": 0, "total": 0.0},
+            "prefill": {"count": 0, "total": 0.0, "tokens": 0},
+            "errors": 0,
+        }
+
+    def configure(self, host: str = None, model: str = None, keep_alive: str = None,
+                  cold_threshold: float = None, stream: bool = None, max_concurrent: int = None, **_):
+        if host: self.host = host.rstrip("/")
+        if model: self.model = model
+        if keep_alive: self.keep_alive = keep_alive
+        if cold_threshold is not None: self.cold_threshold = cold_threshold
+        if stream is not None: self.stream = stream
+        self.scheduler.configure(max_concurrent=max_concurrent)
+
+    def _record(self, elapsed: float, body: dict):
+        # Ollama reports how long it spent loading the model and prefilling the prompt (ns)
+        load_seconds = body.get("load_duration", 0) / 1e9
+        kind = "cold" if load_seconds > self.cold_threshold else "warm"
+        with self._lock:
+            self._stats[kind]["count"] += 1
+            self._stats[kind]["total"] += elapsed
+            self._stats["prefill"]["count"] += 1
+            self._stats["prefill"]["total"] += body.get("prompt_eval_duration", 0) / 1e9
+            self._stats["prefill"]["tokens"] += body.get("prompt_eval_count", 0)
+        if kind == "cold":
+            print(f"🧊 [NEURAL] Cold model load took {load_seconds:.1f}s.")
+
+    @staticmethod
+    def _text(body: dict) -> str:
+        # /api/generate answers in "response", /api/chat in "message.content"
+        if "message" in body:
+            return body["message"].get("content", "")
+        return body.get("response", "")
+
+    def _post(self, endpoint: str, payload: dict, timeout: float, stream: bool = False):
+        self._last_request = time.time()
+        try:
+            response = self.session.post(f"{self.host}{endpoint}", json=payload, timeout=timeout, stream=stream)
+        except requests.RequestException:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        if response.status_code != 200:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise LLMError(response.status_code, response.text)
+        return response
+
+    def _payload(self, model: str, options: dict, stream: bool, **fields) -> dict:
+        return dict(fields, model=model or self.model, stream=stream,
+                    keep_alive=self.keep_alive, options=options or {})
+
+    def _complete(self, endpoint: str, payload: dict, timeout: float, priority: int, session: str) -> str:
+        with self.scheduler.slot(priority, session, timeout) as ticket:
+            timeout = max(1.0, timeout - ticket.waited)
+            if session is None:
+                start = time.perf_counter()
+                body = self._post(endpoint, payload, timeout).json()
+                self._record(time.perf_counter() - start, body)
+                return self._text(body).strip()
+
+            # Streamed under the hood so a newer request on the session can cut it off
+            pieces = list(self._read_stream(endpoint, dict(payload, stream=True), timeout, lambda: ticket.superseded))
+            if ticket.superseded:
+                raise LLMSuperseded()
+            return "".join(pieces).strip()
+
+    def _stream(self, endpoint: str, payload: dict, timeout: float, cancelled: Callable[[], bool],
+                priority: int, session: str) -> Iterator[str]:
+        with self.scheduler.slot(priority, session, timeout) as ticket:
+            yield from self._read_stream(endpoint, payload, max(1.0, timeout - ticket.waited),
+                                         lambda: ticket.superseded or bool(cancelled and cancelled()))
+            if ticket.superseded:
+                raise LLMSuperseded()
+
+    def _read_stream(self, endpoint: str, payload: dict, timeout: float, cancelled: Callable[[], bool]) -> Iterator[str]:
+        start = time.perf_counter()
+        with self._post(endpoint, payload, timeout, stream=True) as response:
+            first_token = True
+            for line in response.iter_lines(chunk_size=None):
+                if cancelled():
+                    return
+                if not line:
+                    continue
+                body = json.loads(line)
+                if "error" in body:
+                    with self._lock:
+                        self._stats["errors"] += 1
+                    raise LLMError(response.status_code, body["error"])
+
+                piece = self._text(body)
+                if piece:
+                    if first_token:
+                        first_token = False
+                        with self._lock:
+                            self._stats["first_token"]["count"] += 1
+                            self._stats["first_token"]["total"] += time.perf_counter() - start
+                    yield piece
+
+                if body.get("done"):
+                    # The final chunk carries the timing fields
+                    self._record(time.perf_counter() - start, body)
+                    return
+
+    def generate(self, prompt: str, options: dict = None, timeout: float = 45, model: str = None,
+                 priority: int = PRIORITY_INTERACTIVE, session: str = None) -> str:
+        """
+        Blocking completion via /api/generate. Returns the stripped response text.
+        `timeout` covers waiting for a scheduler slot too; raises LLMSuperseded if a
+        newer request on `session` took over.
+        """
+        return self._complete("/api/generate", self._payload(model, options, False, prompt=prompt),
+                              timeout, priority, session)
+
+    def generate_stream(self, prompt: str, options: dict = None, timeout: float = 45, model: str = None,
+                        cancelled: Callable[[], bool] = None, priority: int = PRIORITY_INTERACTIVE,
+                        session: str = None) -> Iterator[str]:
+        """
+        Streaming completion via /api/generate. Yields response fragments as Ollama
+        produces them; stops (and drops the connection) once `cancelled()` is true,
+        or raises LLMSuperseded once a newer request on `session` takes over.
+        """
+        return self._stream("/api/generate", self._payload(model, options, True, prompt=prompt),
+                            timeout, cancelled, priority, session)
+
+    def chat(self, messages: list, options: dict = None, timeout: float = 45, model: str = None,
+             priority: int = PRIORITY_INTERACTIVE, session: str = None) -> str:
+        """Blocking completion via /api/chat over a list of {"role", "content"} messages."""
+        return self._complete("/api/chat", self._payload(model, options, False, messages=messages),
+                              timeout, priority, session)
+
+    def chat_stream(self, messages: list, options: dict = None, timeout: float = 45, model: str = None,
+                    cancelled: Callable[[], bool] = None, priority: int = PRIORITY_INTERACTIVE,
+                    session: str = None) -> Iterator[str]:
+        """Streaming variant of `chat`, same contract as `generate_stream`."""
+        return self._stream("/api/chat", self._payload(model, options, True, messages=messages),
+                            timeout, cancelled, priority, session)
+
+    def preload(self, background: bool = True):
+        """Loads the model into memory without generating anything."""
+        def _load():
+            try:
+                start = time.perf_counter()
+                self._last_request = time.time()
+                response = self.session.post(
+                    f"{self.host}/api/generate",
+                    json={"model": self.model, "keep_alive": self.keep_alive},
+                    timeout=120
+                )
+                if response.status_code == 200:
+                    print(f"🔥 [NEURAL] {self.model} resident in memory ({time.perf_counter() - start:.1f}s).")
+            except requests.RequestException as e:
+                print(f"⚠️ [NEURAL] Model preload failed: {e}")
+
+        if background:
+            threading.Thread(target=_load, daemon=True).start()
+        else:
+            _load()
+
+    def start_keep_warm(self, is_present: Callable[[], bool], interval: float = 300):
+        """Re-pings the model every `interval` seconds of LLM silence while the user is present."""
+        if self._warm_thread:
+            return
+
+        def _loop():
+            while True:
+                time.sleep(min(interval, 30))
+                if time.time() - self._last_request >= interval and is_present():
+                    self.preload(background=False)
+
+        self._warm_thread = threading.Thread(target=_loop, daemon=True)
+        self._warm_thread.start()
+
+    def stats(self) -> dict:
+        with self._lock:
+            report = {"errors": self._stats["errors"]}
+            for kind in ("warm", "cold", "first_token", "prefill"):
+                s = self._stats[kind]
+                report[kind] = {
+                    "count": s["count"],
+                    "avg_ms": round(s["total"] / s["count"] * 1000, 1) if s["count"] else 0.0,
+                }
+            report["scheduler"] = self.scheduler.stats()
+            report["prefill"]["avg_tokens"] = round(self._stats["prefill"]["tokens"] / self._stats["prefill"]["count"]) if self._stats["prefill"]["count"] else 0
+            return report
+
+
+# Global instance shared by all intelligence skills
+llm = LLMClient()
@@ -0,0 +1,121 @@
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+PRIORITY_INTERACTIVE = 0 # Answers to something Sir just said
+PRIORITY_BACKGROUND = 1 # Summaries, digests: nobody is waiting on them
+
+
+class LLMSuperseded(Exception):
+    """A newer request on the same session took over before this one finished."""
+
+
+class Ticket:
+    __slots__ = ("priority", "session", "superseded", "waited")
+
+    def __init__(self, priority: int, session: str):
+        self.priority = priority
+        self.session = session
+        self.superseded = False
+        self.waited = 0.0
+
+
+class LLMScheduler:
+    """
+    Admission control in front of the local model.
+    At most `max_concurrent` generations run at once (what Ollama can actually
+    serve in parallel); the rest wait in priority order, interactive before
+    background, first come first served within a priority. A request tagged with
+    a session supersedes the previous one on that session, whether it is still
+    waiting (it never starts) or already generating (the client drops the
+    connection, which makes Ollama stop).
+    """
+    def __init__(self, max_concurrent: int = 1):
+        self.max_concurrent = max_concurrent
+        self._cond = threading.Condition()
+        self._waiting = []
+        self._active = 0
+        self._sessions = {}
+        self._seq = itertools.count()
+        self._stats = {p: {"count": 0, "wait_total": 0.0, "wait_max": 0.0}
+                       for p in (PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND)}
+        self.counters = {"superseded": 0, "timeouts": 0}
+
+    def configure(self, max_concurrent: int = None, **_):
+        if max_concurrent:
+            with self._cond:
+                self.max_concurrent = max_concurrent
+                self._cond.notify_all()
+
+    def _withdraw(self, entry):
+        self._waiting.remove(entry)
+        heapq.heapify(self._waiting)
+        self._cond.notify_all()
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, session: str = None, timeout: float = None) -> Ticket:
+        """Blocks until a slot is free; raises LLMSuperseded or TimeoutError instead of starting."""
+        ticket = Ticket(priority, session)
+        start = time.monotonic()
+        with self._cond:
+            if session is not None:
+                older = self._sessions.get(session)
+                if older is not None and not older.superseded:
+                    older.superseded = True
+                    self.counters["superseded"] += 1
+                self._sessions[session] = ticket
+
+            entry = (priority, next(self._seq), ticket)
+            heapq.heappush(self._waiting, entry)
+            self._cond.notify_all()
+            while True:
+                if ticket.superseded:
+                    self._withdraw(entry)
+                    raise LLMSuperseded()
+                if self._active < self.max_concurrent and self._waiting[0] is entry:
+                    heapq.heappop(self._waiting)
+                    self._active += 1
+                    break
+                remaining = None if timeout is None else timeout - (time.monotonic() - start)
+                if remaining is not None and remaining <= 0:
+                    self._withdraw(entry)
+                    if self._sessions.get(session) is ticket:
+                        del self._sessions[session]
+                    self.counters["timeouts"] += 1
+                    raise TimeoutError(f"No free LLM slot within {timeout:.1f}s")
+                self._cond.wait(remaining)
+
+            ticket.waited = time.monotonic() - start
+            s = self._stats[priority]
+            s["count"] += 1
+            s["wait_total"] += ticket.waited
+            s["wait_max"] = max(s["wait_max"], ticket.waited)
+        return ticket
+
+    def release(self, ticket: Ticket):
+        with self._cond:
+            self._active -= 1
+            if self._sessions.get(ticket.session) is ticket:
+                del self._sessions[ticket.session]
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int = PRIORITY_INTERACTIVE, session: str = None, timeout: float = None):
+        ticket = self.acquire(priority, session, timeout)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> dict:
+        with self._cond:
+            report = dict(self.counters, active=self._active, waiting=len(self._waiting))
+            for priority, name in ((PRIORITY_INTERACTIVE, "interactive"), (PRIORITY_BACKGROUND, "background")):
+                s = self._stats[priority]
+                report[name] = {
+                    "count": s["count"],
+                    "avg_wait_ms": round(s["wait_total"] / s["count"] * 1000, 1) if s["count"] else 0.0,
+                    "max_wait_ms": round(s["wait_max"] * 1000, 1),
+                }
+            return report
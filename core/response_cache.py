@@ -0,0 +1,129 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+from core.rule_index import normalize_phrase
+
+# (intent, trigger phrases, ttl seconds); the first intent whose phrase appears wins.
+# A leading "^" anchors a phrase to the start of the command (after filler words)
+DEFAULT_INTENTS = [
+    # Answers that depend on what's in front of the camera, the clock or personal memory
+    ("uncacheable", ["see", "look", "holding", "in my hand", "screen", "what is this", "what's this", "what time",
+                     "the time", "time is it", "^time", "remember", "my name"], 0),
+    # Follow-ups lean on the conversation so far, which is not part of the key
+    ("followup", ["tell me more", "go on", "elaborate", "how so", "what about", "why is that", "what do you mean",
+                  "^and", "^it", "^that", "^he", "^she", "^they", "^his", "^her", "^their", "^those", "^these"], 0),
+    ("market", ["price", "stock", "bitcoin"], 120),
+    ("news", ["news", "headline", "headlines", "what happened", "latest"], 900),
+    ("weather", ["weather", "temperature", "forecast", "rain"], 1800),
+    ("smalltalk", ["how are you", "who are you", "what are you", "hello", "thank you", "thanks"], 3600),
+]
+DEFAULT_TTL = 600
+
+
+class _Entry:
+    __slots__ = ("answer", "expires_at")
+
+    def __init__(self, answer, expires_at):
+        self.answer = answer
+        self.expires_at = expires_at
+
+
+class ResponseCache:
+    """
+    Size-bounded LRU cache of LLM answers with per-intent TTLs.
+    Keys combine the normalized command with a digest of the context the prompt
+    was built from (vision, activity, search results), so a changed environment
+    is a miss rather than a stale answer.
+    """
+    def __init__(self, max_entries: int = 256, default_ttl: float = DEFAULT_TTL, intents: list = None):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.intents = [(name, [f"^ {p[1:]} " if p.startswith("^") else f" {p} " for p in phrases], ttl)
+                        for name, phrases, ttl in (intents or DEFAULT_INTENTS)]
+        self.enabled = True
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "bypassed": 0, "stores": 0}
+        self._hit_time = 0.0
+
+    def configure(self, enabled: bool = None, max_entries: int = None, default_ttl: float = None,
+                  ttls: dict = None, **_):
+        if enabled is not None: self.enabled = enabled
+        if max_entries: self.max_entries = max_entries
+        if default_ttl is not None: self.default_ttl = default_ttl
+        if ttls:
+            self.intents = [(name, phrases, ttls.get(name, ttl)) for name, phrases, ttl in self.intents]
+
+    def intent(self, command: str):
+        """Returns (intent, ttl) for a command; a ttl of 0 means don't cache."""
+        padded = f"^ {normalize_phrase(command)} "
+        for name, phrases, ttl in self.intents:
+            if any(p in padded for p in phrases):
+                return name, ttl
+        return "default", self.default_ttl
+
+    def key(self, namespace: str, command: str, *context: str) -> str:
+        digest = hashlib.sha1("\x1f".join(context).encode("utf-8")).hexdigest()[:16]
+        return f"{namespace}|{normalize_phrase(command)}|{digest}"
+
+    def get(self, key: str) -> Optional[str]:
+        start = time.perf_counter()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.counters["misses"] += 1
+                return None
+            if entry.expires_at <= time.time():
+                del self._entries[key]
+                self.counters["expired"] += 1
+                self.counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.counters["hits"] += 1
+            self._hit_time += time.perf_counter() - start
+            return entry.answer
+
+    def put(self, key: str, answer: str, ttl: float):
+        if not answer or ttl <= 0:
+            return
+        with self._lock:
+            self._entries[key] = _Entry(answer, time.time() + ttl)
+            self._entries.move_to_end(key)
+            self.counters["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters["evictions"] += 1
+
+    def lookup(self, namespace: str, command: str, *context: str):
+        """
+        Convenience for skills: returns (cached_answer, key, ttl).
+        cached_answer is None on a miss; key is None when the command opts out.
+        """
+        _, ttl = self.intent(command)
+        if not self.enabled or ttl <= 0:
+            with self._lock:
+                self.counters["bypassed"] += 1
+            return None, None, 0
+        key = self.key(namespace, command, *context)
+        return self.get(key), key, ttl
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.counters["hits"] + self.counters["misses"]
+            return dict(
+                self.counters,
+                entries=len(self._entries),
+                hit_rate=round(self.counters["hits"] / lookups, 3) if lookups else 0.0,
+                avg_hit_us=round(self._hit_time / self.counters["hits"] * 1e6, 2) if self.counters["hits"] else 0.0,
+            )
+
+
+# Global instance shared by the LLM-backed skills
+response_cache = ResponseCache()
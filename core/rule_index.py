@@ -0,0 +1,132 @@
+import re
+import threading
+from typing import Optional
+
+from core.config_store import config_store
+
+# Placeholders in a trigger capture one or more words, e.g. "good night {name}"
+_PLACEHOLDER = re.compile(r"^(?:\{(\w*)\}|\*)$")
+_PARAM = object()
+_END = object()
+
+_FILLERS = {"jarvis", "please", "hey", "ok", "okay", "so", "uh", "um"}
+
+
+def normalize_phrase(text: str) -> str:
+    """Lowercase, drop punctuation, the wake word and filler words."""
+    words = re.sub(r"[^\w\s{}*]", " ", text.lower()).split()
+    return " ".join(w for w in words if w not in _FILLERS)
+
+
+class RuleIndex:
+    """
+    In-memory index over the learned "X means Y" rules in rules.json.
+    Lookups go exact -> normalized phrase -> token trie (for triggers with
+    placeholders), and the index is synced incrementally whenever the config
+    store hands back a new rules dict.
+    """
+    def __init__(self, rules_path: str):
+        self.rules_path = rules_path
+        self._lock = threading.Lock()
+        self._source = None
+        self._rules = {}
+        self._exact = {}
+        self._normalized = {}
+        self._trie = {}
+        self.counters = {"exact": 0, "normalized": 0, "pattern": 0, "misses": 0}
+
+    def __len__(self):
+        return len(self._rules)
+
+    def _index(self, trigger: str, response: str):
+        self._rules[trigger] = response
+        tokens = normalize_phrase(trigger).split()
+        if any(_PLACEHOLDER.match(t) for t in tokens):
+            node = self._trie
+            names = []
+            for token in tokens:
+                placeholder = _PLACEHOLDER.match(token)
+                if placeholder:
+                    names.append(placeholder.group(1) or "")
+                    node = node.setdefault(_PARAM, {})
+                else:
+                    node = node.setdefault(token, {})
+            node[_END] = (response, names)
+        else:
+            self._exact[trigger] = response
+            self._normalized[" ".join(tokens)] = response
+
+    def _rebuild(self, rules: dict):
+        self._rules, self._exact, self._normalized, self._trie = {}, {}, {}, {}
+        for trigger, response in rules.items():
+            self._index(trigger, response)
+
+    def sync(self):
+        """Picks up rules added through the config store (e.g. by LearningSkill)."""
+        rules = config_store.get(self.rules_path, {})
+        if rules is self._source:
+            return
+        with self._lock:
+            changed = any(t not in rules or rules[t] != r for t, r in self._rules.items())
+            if changed:
+                # A rule was edited or removed: stale entries can't be patched out
+                self._rebuild(rules)
+            else:
+                for trigger, response in rules.items():
+                    if trigger not in self._rules:
+                        self._index(trigger, response)
+            self._source = rules
+
+    def lookup(self, command: str) -> Optional[str]:
+        self.sync()
+        command = command.strip().lower()
+
+        answer = self._exact.get(command)
+        if answer is not None:
+            self.counters["exact"] += 1
+            return answer
+
+        normalized = normalize_phrase(command)
+        answer = self._normalized.get(normalized)
+        if answer is not None:
+            self.counters["normalized"] += 1
+            return answer
+
+        if self._trie:
+            match = self._match(self._trie, normalized.split(), 0, [])
+            if match:
+                self.counters["pattern"] += 1
+                return match
+
+        self.counters["misses"] += 1
+        return None
+
+    def _match(self, node: dict, tokens: list, i: int, captures: list) -> Optional[str]:
+        if i == len(tokens):
+            if _END not in node:
+                return None
+            response, names = node[_END]
+            for name, value in zip(names, captures):
+                response = response.replace("{" + name + "}", value) if name else response
+            return response
+
+        # Literal words take precedence over placeholders
+        child = node.get(tokens[i])
+        if child is not None:
+            found = self._match(child, tokens, i + 1, captures)
+            if found is not None:
+                return found
+
+        child = node.get(_PARAM)
+        if child is not None:
+            for j in range(i + 1, len(tokens) + 1):
+                found = self._match(child, tokens, j, captures + [" ".join(tokens[i:j])])
+                if found is not None:
+                    return found
+        return None
+
+    def stats(self) -> dict:
+        hits = self.counters["exact"] + self.counters["normalized"] + self.counters["pattern"]
+        total = hits + self.counters["misses"]
+        return {**self.counters, "rules": len(self._rules), "hits": hits,
+                "hit_rate": round(hits / total, 3) if total else 0.0}
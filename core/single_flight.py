@@ -0,0 +1,90 @@
+import threading
+import time
+from typing import Any, Callable, Tuple
+
+
+class _Call:
+    __slots__ = ("done", "result", "finished_at", "duplicates", "linger")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.finished_at = None
+        self.duplicates = 0
+        self.linger = True
+
+
+class SingleFlight:
+    """
+    Collapses identical work that overlaps in time.
+    The first caller for a key runs the function; callers with the same key that
+    arrive while it runs (or within `window` seconds after it finished) get the
+    same result back, flagged as shared, instead of starting their own. Work
+    that is meant to be repeated can opt out of the window with `release()`.
+    """
+    def __init__(self, window: float = 1.5):
+        self.window = window
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.counters = {"leaders": 0, "suppressed": 0}
+
+    def _live(self, key: str, now: float):
+        call = self._calls.get(key)
+        if call and call.finished_at is not None and (not call.linger or now - call.finished_at > self.window):
+            del self._calls[key]
+            return None
+        return call
+
+    def _prune(self, now: float):
+        stale = [k for k, c in self._calls.items()
+                 if c.finished_at is not None and (not c.linger or now - c.finished_at > self.window)]
+        for k in stale:
+            del self._calls[k]
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Returns (result, shared); shared is True when another caller's result was reused."""
+        with self._lock:
+            call = self._live(key, time.monotonic())
+            if call:
+                call.duplicates += 1
+                self.counters["suppressed"] += 1
+                leader = False
+            else:
+                self._prune(time.monotonic())
+                call = self._calls[key] = _Call()
+                self.counters["leaders"] += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            return call.result, True
+
+        try:
+            call.result = fn()
+        finally:
+            with self._lock:
+                call.finished_at = time.monotonic()
+                if not call.linger and self._calls.get(key) is call:
+                    del self._calls[key]
+            call.done.set()
+        return call.result, False
+
+    def release(self, key: str):
+        """Deduplicates `key` only while it is in flight, not in the window after it finishes."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call:
+                call.linger = False
+
+    def suppress_if_active(self, key: str) -> bool:
+        """True (and counted) if `key` is in flight or just finished, without waiting on it."""
+        with self._lock:
+            call = self._live(key, time.monotonic())
+            if call:
+                call.duplicates += 1
+                self.counters["suppressed"] += 1
+            return call is not None
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters, in_flight=sum(1 for c in self._calls.values() if c.finished_at is None))
@@ -0,0 +1,47 @@
+from typing import Iterable, List, Optional, Tuple
+
+from core.keyword_automaton import KeywordAutomaton, is_word_boundary
+from core.skills.base import BaseSkill
+
+
+class SkillRouter:
+    """
+    Inverted keyword index over every registered skill.
+    Skills are grouped into precedence tiers at registration; `route` scans the
+    command once and returns the matching skills in priority order, so dispatch
+    cost no longer grows with the number of skills or keywords.
+    """
+    def __init__(self):
+        self._tiers: List[Tuple[str, List[BaseSkill]]] = []
+        self._automaton = KeywordAutomaton()
+
+    def add_tier(self, name: str, skills: Iterable[BaseSkill],
+                 keywords: Optional[List[str]] = None, match_mode: Optional[str] = None):
+        """
+        Registers a tier below the existing ones. By default each skill is indexed
+        on its own routing keywords; `keywords`/`match_mode` override that for the
+        whole tier (e.g. the system override words).
+        """
+        tier = len(self._tiers)
+        skills = list(skills)
+        self._tiers.append((name, skills))
+
+        entries = []
+        for order, skill in enumerate(skills):
+            words = keywords if keywords is not None else skill.routing_keywords()
+            whole_word = (match_mode or skill.match_mode) == "word"
+            entries.extend((kw.lower(), (tier, order, whole_word)) for kw in words)
+        self._automaton.extend(entries)
+
+    def route(self, command: str) -> List[Tuple[str, BaseSkill]]:
+        """Returns (tier name, skill) candidates, highest priority first."""
+        text = command.lower()
+        hits = set()
+        for start, end, (tier, order, whole_word) in self._automaton.iter_matches(text):
+            if (tier, order) in hits:
+                continue
+            if whole_word and not (is_word_boundary(text, start) and is_word_boundary(text, end)):
+                continue
+            hits.add((tier, order))
+
+        return [(self._tiers[tier][0], self._tiers[tier][1][order]) for tier, order in sorted(hits)]
@@ -5,6 +5,8 @@ from datetime import datetime
 from core.skills.base import BaseSkill
 
 class AutomationSkill(BaseSkill):
+    match_mode = "substring"
+
     def __init__(self):
         super().__init__("Automation", "Handles system-level actions like screenshots and locking.")
         self.keywords = ["screenshot", "capture screen", "lock computer", "minimize all", "clear desktop", "hibernate", "brightness"]
@@ -2,10 +2,18 @@ import re
 from abc import ABC, abstractmethod
 
 class BaseSkill(ABC):
+    # How `matches` treats keywords: "word" (whole-word) or "substring".
+    # The SkillRouter relies on this to index the skill without calling `matches`.
+    match_mode = "word"
+
     def __init__(self, name: str, description: str):
         self.name = name
         self.description = description
 
+    def routing_keywords(self) -> list:
+        """Keywords the SkillRouter indexes for this skill. Must mirror `matches`."""
+        return list(getattr(self, 'keywords', []))
+
     def matches(self, command: str) -> bool:
         """
         Default match logic using word boundaries for keywords.
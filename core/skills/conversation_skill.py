@@ -1,6 +1,6 @@
 import random
-import requests
-import json
+from core.llm_client import llm, LLMSuperseded
+from core.response_cache import response_cache
 from core.skills.base import BaseSkill
 
 class ConversationSkill(BaseSkill):
@@ -73,6 +73,11 @@ class ConversationSkill(BaseSkill):
         
         # 1. Try Ollama for "Gemini-level" conversation
         try:
+            cached, cache_key, ttl = response_cache.lookup("conversation", command, name)
+            if cached:
+                print(f"⚡ [CACHE] Small talk answered from response cache.")
+                return {"action": "SPEAK", "text": cached}
+
             system_prompt = (
                 "You are JARVIS, the highly advanced, dry-witted AI assistant from Stark Industries. "
                 "Keep responses concise (1-2 sentences), professional, and slightly superior but always loyal. "
@@ -86,22 +91,18 @@ class ConversationSkill(BaseSkill):
                 for speaker, msg in history:
                     history_context += f"{speaker}: {msg}\n"
 
-            payload = {
-                "model": "mistral", # Ollama usually maps mistral to 7b
-                "prompt": f"{system_prompt}\n{history_context}User: {command}\nJARVIS:",
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "num_predict": 100
-                }
-            }
+            prompt = f"{system_prompt}\n{history_context}User: {command}\nJARVIS:"
             
             print(f"🧠 [CONVERSATION] JARVIS is processing your request via Mistral 7B...")
-            response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=30)
-            if response.status_code == 200:
-                answer = response.json().get("response", "").strip()
-                if answer:
-                    return {"action": "SPEAK", "text": answer}
+            answer = llm.generate(prompt, options={"temperature": 0.7, "num_predict": 100}, timeout=30,
+                                  session=context.get("session"))
+            if answer:
+                if cache_key:
+                    response_cache.put(cache_key, answer, ttl)
+                return {"action": "SPEAK", "text": answer}
+        except LLMSuperseded:
+            print(f"⏭️ [CONVERSATION] Generation aborted: a newer command took over.")
+            return {"action": "LOG", "text": f"Superseded before answering: {command}"}
         except Exception as e:
             # Fallback to banter if Ollama is slow/offline
             print(f"⚠️ [DEBUG] Ollama fallback: {e}")
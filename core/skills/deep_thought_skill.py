@@ -1,9 +1,8 @@
 import time
 import random
 import sys
-import json
-import requests
 from colorama import Fore, Style
+from core.llm_client import llm, LLMSuperseded
 from core.skills.base import BaseSkill
 
 class DeepThoughtSkill(BaseSkill):
@@ -27,24 +26,22 @@ class DeepThoughtSkill(BaseSkill):
                 "Address the user as 'Sir' or by their name if provided. Don't use emojis."
             )
             
-            payload = {
-                "model": "mistral",
-                "prompt": f"{system_prompt}\nUser: {command}\nJARVIS:",
-                "stream": False,
-                "options": {
+            print(f"🧠 [NEURAL LINK] Querying local Mistral core via Ollama...")
+            answer = llm.generate(
+                f"{system_prompt}\nUser: {command}\nJARVIS:",
+                options={
                     "temperature": 0.7,
                     "num_predict": 100 # Keep it relatively brief for speech
-                }
-            }
-            
-            print(f"🧠 [NEURAL LINK] Querying local Mistral core via Ollama...")
-            response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=30)
-            if response.status_code == 200:
-                answer = response.json().get("response", "").strip()
-                if answer:
-                    # Clean up any AI hallucinations where it might repeat 'Sir' too much
-                    return {"action": "SPEAK", "text": answer}
+                },
+                timeout=30,
+                session=context.get("session")
+            )
+            if answer:
+                # Clean up any AI hallucinations where it might repeat 'Sir' too much
+                return {"action": "SPEAK", "text": answer}
         
+        except LLMSuperseded:
+            return {"action": "LOG", "text": f"Superseded before answering: {command}"}
         except Exception as e:
             # Silence error and fallback to simulation
             pass
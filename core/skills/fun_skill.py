@@ -2,6 +2,8 @@ import random
 from core.skills.base import BaseSkill
 
 class FunSkill(BaseSkill):
+    match_mode = "substring"
+
     def __init__(self):
         super().__init__("Fun", "Provides humor and small talk.")
         self.keywords = ["joke", "funny", "laugh", "humour"]
@@ -1,9 +1,10 @@
 import re
-import os
-import json
+from core.config_store import config_store
 from core.skills.base import BaseSkill
 
 class LearningSkill(BaseSkill):
+    match_mode = "substring"
+
     def __init__(self, rules_path: str, user_memory_path: str):
         super().__init__("Learning", "Allows the user to teach Jarvis new rules and memories.")
         self.rules_path = rules_path
@@ -13,6 +14,9 @@ class LearningSkill(BaseSkill):
     def matches(self, command: str) -> bool:
         return any(word in command for word in self.trigger_words)
 
+    def routing_keywords(self) -> list:
+        return list(self.trigger_words)
+
     def execute(self, command: str, context: dict) -> dict:
         name = context.get("user_name", "Sir")
         
@@ -35,24 +39,15 @@ class LearningSkill(BaseSkill):
         return {}
 
     def _save_rule(self, trigger, response):
-        rules = self._load_rules()
-        rules[trigger.lower()] = response
-        os.makedirs(os.path.dirname(self.rules_path), exist_ok=True)
-        with open(self.rules_path, 'w') as f:
-            json.dump(rules, f)
+        def _add(rules):
+            rules[trigger.lower()] = response
+        config_store.update(self.rules_path, _add)
 
     def _load_rules(self):
-        if os.path.exists(self.rules_path):
-            try:
-                with open(self.rules_path, 'r') as f:
-                    return json.load(f)
-            except: pass
-        return {}
+        return config_store.get(self.rules_path, {})
 
     def _set_user_name(self, name: str):
         if len(name.split()) > 2:
             return False
-        os.makedirs(os.path.dirname(self.user_memory_path), exist_ok=True)
-        with open(self.user_memory_path, 'w') as f:
-            json.dump({"name": name}, f)
+        config_store.update(self.user_memory_path, lambda memory: memory.update(name=name))
         return True
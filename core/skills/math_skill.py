@@ -3,6 +3,8 @@ import random
 from core.skills.base import BaseSkill
 
 class MathSkill(BaseSkill):
+    match_mode = "substring"
+
     def __init__(self):
         super().__init__("Math", "Performs mathematical calculations.")
         self.keywords = ["plus", "minus", "times", "divided", "calculate", "what is", "sum"]
@@ -10,6 +12,10 @@ class MathSkill(BaseSkill):
     def matches(self, command: str) -> bool:
         return any(word in command for word in self.keywords) or re.search(r'[0-9]', command)
 
+    def routing_keywords(self) -> list:
+        # Any digit counts as a match, same as the regex above
+        return self.keywords + list("0123456789")
+
     def execute(self, command: str, context: dict) -> dict:
         name = context.get("user_name", "Sir")
         try:
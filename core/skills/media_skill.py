@@ -2,6 +2,8 @@ import pyautogui
 from core.skills.base import BaseSkill
 
 class MediaSkill(BaseSkill):
+    match_mode = "substring"
+
     def __init__(self):
         super().__init__("Media", "Controls system volume and media playback.")
         self.keywords = ["volume", "mute", "unmute", "music", "play", "pause", "skip", "next", "previous", "track"]
@@ -1,10 +1,35 @@
-import requests
 import json
 import random
 import time
-from duckduckgo_search import DDGS
+from concurrent.futures import ThreadPoolExecutor, wait
+from core.brain_session import BrainSession
+from core.deadline import Deadline
+from core.digest_prefetcher import digest_prefetcher
+from core.llm_client import llm, LLMError, LLMSuperseded
+from core.response_cache import response_cache
+from core.speculation import speculator
+from core.speech_stream import SpeechStream
+from core.web_search import web_search
 from core.skills.base import BaseSkill
 
+# Static so Ollama can keep it prefilled across turns; the environment goes in each user turn
+SYSTEM_PROMPT = (
+    "You are JARVIS, the highly advanced AI from Stark Industries. "
+    "You are witty, sophisticated, British-accented, and proactive. "
+    "You have access to real-time vision and internet data, given as [CURRENT ENVIRONMENT] in each message.\n"
+    "\nINSTRUCTIONS:\n"
+    "1. Address the user as 'Sir'.\n"
+    "2. Be concise (max 2 sentences).\n"
+    "3. Use the environmental data naturally (e.g., 'I see you are holding a pen, Sir').\n"
+    "4. If searching the web, summarize the answer don't just say you checked.\n"
+    "5. No emojis."
+)
+
+# Shared by every request's context stages (vision, activity, search)
+CONTEXT_POOL = ThreadPoolExecutor(max_workers=6, thread_name_prefix="brain-context")
+
+FALLBACK_TEXT = "My apologies, Sir. My connection to the primary reasoning core is intermittent. I am however monitoring your environment and stand ready."
+
 class OmniBrainSkill(BaseSkill):
     def __init__(self):
         super().__init__("OmniBrain", "The central intelligence core. Combines LLM reasoning, internet search, and visual context.")
@@ -15,6 +40,9 @@ class OmniBrainSkill(BaseSkill):
             "weather", "news", "price", "stock", "identify", "see"
         ]
         self.last_search_result = ""
+        self.session = BrainSession(SYSTEM_PROMPT)
+        self.budget = 25.0 # End-to-end seconds per request, context gathering + LLM
+        self.context_budget = 4.0 # Share of it the context stages may use
 
     def execute(self, command: str, context: dict) -> dict:
         try:
@@ -25,13 +53,12 @@ class OmniBrainSkill(BaseSkill):
             traceback.print_exc()
             return {"action": "SPEAK", "text": "Sir, I'm experiencing a minor sync error in my logic cores. One moment."}
 
-    def _brain_process(self, command: str, context: dict) -> dict:
-        vision = context.get("vision")
-        history = context.get("history")
-        user_name = context.get("user_name", "Sir")
-        st_memory = context.get("memory")
-        
-        # 1. Vision Context
+    def configure(self, budget: float = None, context_budget: float = None, **kwargs):
+        if budget: self.budget = budget
+        if context_budget: self.context_budget = context_budget
+        self.session.configure(**kwargs)
+
+    def _vision_report(self, vision) -> str:
         vision_report = "Eyes: Scanning..."
         if vision:
             objs = vision.get_detected_objects()
@@ -45,96 +72,182 @@ class OmniBrainSkill(BaseSkill):
             
             if vision_details:
                 vision_report = "Optic Status: " + " | ".join(vision_details)
+        return vision_report
 
-        # 1b. Activity/System Context
+    def _activity_report(self, st_memory) -> str:
         activity_report = "System: Status nominal."
         if st_memory:
             current_app = st_memory.get("current_app")
             window_title = st_memory.get("window_title")
             if current_app:
                 activity_report = f"User Activity: Currently using {current_app} ({window_title})."
+        return activity_report
 
-        # 2. History context
-        chat_log = ""
-        if history:
-            try:
-                recent = history.get_recent(5)
-                for role, text in recent:
-                    chat_log += f"{role}: {text}\n"
-            except: pass
+    def snapshot_context(self, context: dict) -> dict:
+        """Vision and activity reports as the brain would gather them; taken ahead of time on ATTENTION."""
+        return {"vision": self._vision_report(context.get("vision")),
+                "activity": self._activity_report(context.get("memory"))}
 
-        # 3. Decision: Do we need internet?
-        trigger_words = ["news", "weather", "latest", "who is", "what happened", "stock", "price", "current", "update", "today", "tomorrow"]
-        needs_search = any(word in command.lower() for word in trigger_words)
-        search_context = ""
+    def _search_context(self, command: str, budget: float) -> str:
+        # Better query cleaning: Remove 'Jarvis' and common trigger verbs
+        search_query = command.lower()
+        for phrase in ["jarvis", "tell me about", "what is", "do a search for", "google", "search for", "find out"]:
+            search_query = search_query.replace(phrase, "").strip()
+        
+        # If news is mentioned, make the query more relevant to headlines
+        if "news" in search_query:
+            search_query = f"latest news {search_query.replace('news', '').strip()}"
         
-        if needs_search:
+        # Cached, normalized and time-boxed; an empty list means go on without it
+        results = web_search.search(search_query, budget=budget)
+        if results:
+            print(f"✅ [INTERNET] Satellite uplink successful. Data synced.")
+            return "\nRecent Real-world Data:\n" + "\n".join([f"- {body}" for body in results])
+        print(f"⚠️ [INTERNET] No significant data found for '{search_query}'.")
+        return ""
+
+    def _gather(self, stages: dict, deadline: Deadline, timings: dict) -> dict:
+        """Runs the context stages concurrently; stages still running at the context deadline are dropped."""
+        def _timed(fn, *args):
+            start = time.perf_counter()
+            result = fn(*args)
+            return result, (time.perf_counter() - start) * 1000
+
+        futures = {name: CONTEXT_POOL.submit(_timed, fn, *args) for name, (fn, *args) in stages.items()}
+        wait(futures.values(), timeout=deadline.remaining(self.context_budget))
+
+        results = {}
+        for name, future in futures.items():
+            if not future.done():
+                future.cancel()
+                timings[name] = None
+                continue
             try:
-                # Better query cleaning: Remove 'Jarvis' and common trigger verbs
-                search_query = command.lower()
-                for phrase in ["jarvis", "tell me about", "what is", "do a search for", "google", "search for", "find out"]:
-                    search_query = search_query.replace(phrase, "").strip()
-                
-                # If news is mentioned, make the query more relevant to headlines
-                if "news" in search_query:
-                    search_query = f"latest news {search_query.replace('news', '').strip()}"
-                
-                print(f"🌍 [INTERNET] Scanning global datastreams for: {search_query}...")
-                with DDGS() as ddgs:
-                    # New syntax for DDGS text search in v6+
-                    results = [r for r in ddgs.text(search_query, max_results=3)]
-                    if results:
-                        search_context = "\nRecent Real-world Data:\n" + "\n".join([f"- {r['body']}" for r in results])
-                        print(f"✅ [INTERNET] Satellite uplink successful. Data synced.")
-                    else:
-                        print(f"⚠️ [INTERNET] No significant data found for '{search_query}'.")
+                results[name], timings[name] = future.result()
             except Exception as e:
-                print(f"❌ [INTERNET ERROR] Uplink failure: {e}")
+                timings[name] = None
+                print(f"❌ [BRAIN] {name} stage failed: {e}")
+        return results
+
+    def _report_timings(self, timings: dict, deadline: Deadline):
+        parts = [f"{name} {'dropped' if ms is None else f'{ms:.0f}ms'}" for name, ms in timings.items()]
+        print(f"⏱️ [BRAIN] {' | '.join(parts)} | total {deadline.elapsed_ms():.0f}ms of {deadline.budget:.0f}s budget")
+
+    def _brain_process(self, command: str, context: dict) -> dict:
+        history = context.get("history")
+        
+        # 0. Prefetched digests (news/weather summarized in the background)
+        digest = digest_prefetcher.answer(command)
+        if digest:
+            print(f"📰 [DIGEST] Answered from the local digest store.")
+            return {"action": "SPEAK", "text": digest}
+
+        deadline = Deadline(self.budget)
+        timings = {}
+
+        # 1. Context: vision, activity and (if needed) internet, all at once under one deadline.
+        # A snapshot taken while the wake word was still being spoken stands in for the first two.
+        snapshot = speculator.take()
+        if snapshot:
+            print(f"🔮 [SPECULATION] Using context snapshot taken {snapshot['lead_ms']:.0f}ms ago.")
+            stages = {}
+        else:
+            stages = {
+                "vision": (self._vision_report, context.get("vision")),
+                "activity": (self._activity_report, context.get("memory")),
+            }
+        trigger_words = ["news", "weather", "latest", "who is", "what happened", "stock", "price", "current", "update", "today", "tomorrow"]
+        if any(word in command.lower() for word in trigger_words):
+            stages["search"] = (self._search_context, command, deadline.remaining(self.context_budget))
+        gathered = self._gather(stages, deadline, timings)
+
+        if snapshot:
+            gathered.update(vision=snapshot["vision"], activity=snapshot["activity"])
+        vision_report = gathered.get("vision", "Eyes: Unavailable.")
+        activity_report = gathered.get("activity", "System: Status nominal.")
+        search_context = gathered.get("search", "")
 
-        # 4. Neural Processing
+        # 2. Response cache (same question in the same surroundings)
+        cached, cache_key, ttl = response_cache.lookup("brain", command, vision_report, activity_report, search_context)
+        if cached:
+            stats = response_cache.stats()
+            print(f"⚡ [CACHE] Answered from response cache. Hit rate: {stats['hit_rate']:.0%} ({stats['entries']} entries)")
+            self._report_timings(timings, deadline)
+            return {"action": "SPEAK", "text": cached}
+
+        # 3. Neural Processing (history is replayed by the chat session), with whatever budget is left
         try:
             print(f"🧠 [NEURAL] Synthesizing response via Mistral 7B core...")
             
-            system_prompt = (
-                f"You are JARVIS, the highly advanced AI from Stark Industries. "
-                f"You are witty, sophisticated, British-accented, and proactive. "
-                "You have access to real-time vision and internet data. "
-                "\n[CURRENT ENVIRONMENT]:\n"
+            environment = (
                 f"{vision_report}\n"
                 f"{activity_report}\n"
-                f"{search_context if search_context else '[Internet Data: Not required for this request]'}\n"
-                "\nINSTRUCTIONS:\n"
-                "1. Address the user as 'Sir'.\n"
-                "2. Be concise (max 2 sentences).\n"
-                "3. Use the environmental data naturally (e.g., 'I see you are holding a pen, Sir').\n"
-                "4. If searching the web, summarize the answer don't just say you checked.\n"
-                "5. No emojis."
+                f"{search_context if search_context else '[Internet Data: Not required for this request]'}"
             )
+            messages = self.session.build(history, command, environment)
+            c = self.session.last_counts
+            print(f"🧮 [CONTEXT] Prompt ~{c['total']} tokens: system {c['system']} | summary {c['summary']} | "
+                  f"history {c['history']} ({c['messages']} msgs) | turn {c['turn']}")
+            options = {"temperature": 0.7, "num_predict": 100}
+            session = context.get("session")
+            cancel = context.get("cancel")
+            if cancel is not None and cancel.cancelled:
+                print(f"⏭️ [NEURAL] Superseded before generation; skipping the LLM call.")
+                self._report_timings(timings, deadline)
+                return {"action": "LOG", "text": f"Superseded before answering: {command}"}
 
-            payload = {
-                "model": "mistral:7b", # Explicitly use the version you have installed
-                "prompt": f"{system_prompt}\n\n[CONVERSATION HISTORY]:\n{chat_log}\n\nSir: {command}\nJARVIS:",
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "num_predict": 100
-                }
-            }
+            if llm.stream:
+                cut_short = []
 
-            response = requests.post("http://localhost:11434/api/generate", json=payload, timeout=45)
-            
-            if response.status_code == 200:
-                answer = response.json().get("response", "").strip()
+                def _stopped(s):
+                    if cancel is not None and cancel.cancelled:
+                        s.cancel() # Superseded or interrupted: no fallback line either
+                    return s.cancelled or deadline.expired
+
+                def _generate(s):
+                    start = time.perf_counter()
+                    try:
+                        # The read timeout only bounds each chunk; the deadline bounds the whole answer
+                        yield from llm.chat_stream(messages, options=options, timeout=max(1.0, deadline.remaining()),
+                                                   cancelled=lambda: _stopped(s), session=session)
+                    except LLMSuperseded:
+                        # A newer command took over; stop talking rather than falling back
+                        s.cancel()
+                    finally:
+                        if deadline.expired and not s.cancelled:
+                            cut_short.append(True)
+                            print(f"⌛ [NEURAL] Out of budget; the answer was cut short.")
+                        timings["llm"] = (time.perf_counter() - start) * 1000
+                        self._report_timings(timings, deadline)
+
+                # Generation starts when the TTS engine pulls the first sentence
+                stream = SpeechStream(_generate, fallback=FALLBACK_TEXT)
+                if cache_key:
+                    stream.on_complete(lambda text: None if stream.cancelled or cut_short or text == FALLBACK_TEXT
+                                       else response_cache.put(cache_key, text, ttl))
+                return {"action": "SPEAK_STREAM", "stream": stream}
+
+            start = time.perf_counter()
+            try:
+                answer = llm.chat(messages, options=options, timeout=max(1.0, deadline.remaining()), session=session)
                 if answer:
+                    if cache_key:
+                        response_cache.put(cache_key, answer, ttl)
                     return {"action": "SPEAK", "text": answer}
                 else:
                     print("⚠️ [NEURAL] Ollama returned an empty response body.")
-            else:
-                print(f"❌ [NEURAL] Ollama Error: Status Code {response.status_code} | Text: {response.text[:100]}")
+            except LLMSuperseded:
+                print(f"⏭️ [NEURAL] Generation aborted: a newer command took over.")
+                return {"action": "LOG", "text": f"Superseded before answering: {command}"}
+            except LLMError as e:
+                print(f"❌ [NEURAL] Ollama Error: {e}")
+            finally:
+                timings["llm"] = (time.perf_counter() - start) * 1000
+                self._report_timings(timings, deadline)
                     
         except Exception as e:
             print(f"❌ [NEURAL ERROR] Logic core timeout or connection failure: {e}")
 
 
         # Ultra-Stable Fallback
-        return {"action": "SPEAK", "text": "My apologies, Sir. My connection to the primary reasoning core is intermittent. I am however monitoring your environment and stand ready."}
+        return {"action": "SPEAK", "text": FALLBACK_TEXT}
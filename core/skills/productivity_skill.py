@@ -2,6 +2,8 @@ from core.skills.base import BaseSkill
 from core.state_machine import JarvisState
 
 class ProductivitySkill(BaseSkill):
+    match_mode = "substring"
+
     def __init__(self, state_machine):
         super().__init__("Productivity", "Manages focus sessions and activity tracking.")
         self.sm = state_machine
@@ -5,6 +5,8 @@ import pyautogui
 import time
 
 class ProtocolSkill(BaseSkill):
+    match_mode = "substring"
+
     def __init__(self, state_machine):
         super().__init__("Protocol", "Executes complex multi-step routines.")
         self.sm = state_machine
@@ -13,6 +15,9 @@ class ProtocolSkill(BaseSkill):
     def matches(self, command: str) -> bool:
         return "protocol" in command
 
+    def routing_keywords(self) -> list:
+        return ["protocol"]
+
     def execute(self, command: str, context: dict) -> dict:
         name = context.get("user_name", "Sir")
         
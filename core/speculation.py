@@ -0,0 +1,91 @@
+import threading
+import time
+from typing import Callable, Optional
+
+from core.llm_client import llm
+
+
+class Speculator:
+    """
+    Does the slow groundwork for a command before its text is final.
+    On an ATTENTION event (the wake word showing up in a partial result) it warms
+    the model and the pooled HTTP connection with a keep-alive ping and snapshots
+    the vision/activity context. The brain consumes the snapshot if the command
+    arrives within `timeout`; otherwise it expires. Cancelling (the utterance
+    ended without the wake word after all) only drops the snapshot: the warm-up
+    ping is cheap and harmless to let finish.
+    """
+    def __init__(self, timeout: float = 8.0):
+        self.timeout = timeout
+        self.enabled = True
+        self._snapshot_fn = None
+        self._snapshot = None
+        self._started_at = 0.0
+        self._busy = False
+        self._lock = threading.Lock()
+        self.counters = {"attentions": 0, "used": 0, "expired": 0, "cancelled": 0, "skipped": 0}
+
+    def configure(self, enabled: bool = None, timeout: float = None, **_):
+        if enabled is not None: self.enabled = enabled
+        if timeout: self.timeout = timeout
+
+    def bind(self, snapshot_fn: Callable[[], dict]):
+        """`snapshot_fn()` returns the context the brain would otherwise gather itself."""
+        self._snapshot_fn = snapshot_fn
+
+    def on_attention(self, data: dict = None):
+        if not self.enabled:
+            return
+        if data and data.get("status") is False:
+            self.cancel()
+            return
+        with self._lock:
+            self.counters["attentions"] += 1
+            if self._busy:
+                self.counters["skipped"] += 1
+                return
+            self._busy = True
+            self._started_at = time.monotonic()
+            self._snapshot = None
+        threading.Thread(target=self._speculate, name="speculation", daemon=True).start()
+
+    def _speculate(self):
+        try:
+            if self._snapshot_fn:
+                snapshot = dict(self._snapshot_fn(), taken_at=time.monotonic())
+                with self._lock:
+                    self._snapshot = snapshot
+            # Loads the model if needed and leaves a warm connection in the pool
+            llm.preload(background=False)
+        except Exception as e:
+            print(f"⚠️ [SPECULATION] Warm-up failed: {e}")
+        finally:
+            with self._lock:
+                self._busy = False
+
+    def cancel(self):
+        with self._lock:
+            if self._snapshot is not None:
+                self.counters["cancelled"] += 1
+            self._snapshot = None
+
+    def take(self) -> Optional[dict]:
+        """The pending context snapshot, if one was taken within `timeout`; consumed on read."""
+        with self._lock:
+            snapshot, self._snapshot = self._snapshot, None
+            if snapshot is None:
+                return None
+            if time.monotonic() - snapshot["taken_at"] > self.timeout:
+                self.counters["expired"] += 1
+                return None
+            self.counters["used"] += 1
+            snapshot["lead_ms"] = (time.monotonic() - self._started_at) * 1000
+            return snapshot
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+
+# Global instance fed by the audio listener's ATTENTION events
+speculator = Speculator()
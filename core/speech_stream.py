@@ -0,0 +1,85 @@
+import re
+import time
+from typing import Callable, Iterable, Iterator
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace
+SENTENCE_END = re.compile(r'[.!?]+["\')\]]*\s+|\n+')
+
+# Words whose trailing period doesn't end a sentence
+ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "st", "vs", "etc", "e.g", "i.e", "approx", "no", "jr", "sr"}
+
+
+def _ends_with_abbreviation(text: str) -> bool:
+    words = text.rstrip(".").split()
+    return bool(words) and words[-1].lower() in ABBREVIATIONS
+
+
+def iter_sentences(chunks: Iterable[str], min_chars: int = 12) -> Iterator[str]:
+    """
+    Re-chunks a stream of text fragments into sentences, yielding each one as
+    soon as its terminating punctuation (and the following space) has arrived.
+    Fragments shorter than `min_chars` are held back and joined to the next one.
+    """
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        start = 0
+        for match in SENTENCE_END.finditer(buffer):
+            candidate = buffer[start:match.start() + len(match.group().rstrip())].strip()
+            if len(candidate) < min_chars or _ends_with_abbreviation(candidate):
+                continue
+            yield candidate
+            start = match.end()
+        buffer = buffer[start:]
+
+    tail = buffer.strip()
+    if tail:
+        yield tail
+
+
+class SpeechStream:
+    """
+    A response that is spoken while it is still being generated.
+    Skills return it as {"action": "SPEAK_STREAM", "stream": SpeechStream(...)};
+    the TTS engine pulls sentences from it and `cancel()` stops both the
+    generation and whatever speech is still queued.
+    """
+    def __init__(self, chunks: Callable[["SpeechStream"], Iterable[str]], fallback: str = ""):
+        self._chunks = chunks
+        self.fallback = fallback
+        self.cancelled = False
+        self.text = ""
+        self.first_sentence_ms = None
+        self._callbacks = []
+
+    def on_complete(self, callback: Callable[[str], None]):
+        """`callback(text)` runs once the stream ends with everything that was generated."""
+        self._callbacks.append(callback)
+
+    def cancel(self):
+        self.cancelled = True
+
+    def sentences(self) -> Iterator[str]:
+        start = time.perf_counter()
+        produced = []
+        try:
+            for sentence in iter_sentences(self._chunks(self)):
+                if self.cancelled:
+                    break
+                if not produced:
+                    self.first_sentence_ms = (time.perf_counter() - start) * 1000
+                produced.append(sentence)
+                yield sentence
+        except Exception as e:
+            print(f"❌ [NEURAL] Stream interrupted: {e}")
+
+        if not produced and not self.cancelled and self.fallback:
+            # Time to the fallback line is still time to the first thing spoken
+            self.first_sentence_ms = (time.perf_counter() - start) * 1000
+            produced.append(self.fallback)
+            yield self.fallback
+
+        self.text = " ".join(produced)
+        if self.text:
+            for callback in self._callbacks:
+                callback(self.text)
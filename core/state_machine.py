@@ -1,3 +1,5 @@
+import threading
+import time
 from enum import Enum, auto
 
 class JarvisState(Enum):
@@ -13,10 +15,11 @@ class StateMachine:
     def __init__(self):
         self.current_state = JarvisState.IDLE
         self.last_transition_time = 0
+        self._lock = threading.Lock()
 
     def transition(self, new_state: JarvisState):
-        if self.current_state != new_state:
-            print(f"🔄 State Transition: {self.current_state.name} -> {new_state.name}")
-            self.current_state = new_state
-            import time
-            self.last_transition_time = time.time()
+        with self._lock:
+            if self.current_state != new_state:
+                print(f"🔄 State Transition: {self.current_state.name} -> {new_state.name}")
+                self.current_state = new_state
+                self.last_transition_time = time.time()
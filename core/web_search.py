@@ -0,0 +1,145 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from duckduckgo_search import DDGS
+
+from core.rule_index import normalize_phrase
+
+# (topic, trigger phrases, ttl seconds); the first topic whose phrase appears wins
+SEARCH_TOPICS = [
+    ("market", ["price", "stock", "bitcoin"], 120),
+    ("weather", ["weather", "temperature", "forecast", "rain"], 900),
+    ("news", ["news", "latest", "what happened", "today", "update", "current", "tomorrow"], 600),
+    ("people", ["who is", "who was"], 86400),
+]
+DEFAULT_TTL = 3600
+
+# Words that don't change what DuckDuckGo returns
+STOPWORDS = {"a", "an", "the", "is", "are", "was", "of", "in", "on", "for", "to", "me", "about",
+             "what", "whats", "s", "tell", "give", "show", "can", "you", "i", "my", "some"}
+
+
+class SearchService:
+    """
+    DuckDuckGo text search behind a TTL cache.
+    Queries are keyed by their normalized, token-sorted words, so "price of gold today"
+    and "today gold price" share an entry. Empty results are cached briefly too, and
+    every search runs under a hard time budget: past it the caller gets no results
+    while the search finishes in the background and fills the cache for next time.
+    """
+    def __init__(self, max_results: int = 3, budget: float = 4.0, negative_ttl: float = 120,
+                 max_entries: int = 128, workers: int = 2):
+        self.max_results = max_results
+        self.budget = budget
+        self.negative_ttl = negative_ttl
+        self.max_entries = max_entries
+        self.topics = SEARCH_TOPICS
+        self.default_ttl = DEFAULT_TTL
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.RLock() # Done-callbacks may run inline while search() holds it
+        self._local = threading.local()
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="web-search")
+        self.counters = {"hits": 0, "negative_hits": 0, "misses": 0, "coalesced": 0, "timeouts": 0, "errors": 0}
+
+    def configure(self, max_results: int = None, budget: float = None, negative_ttl: float = None,
+                  ttls: dict = None, **_):
+        if max_results: self.max_results = max_results
+        if budget: self.budget = budget
+        if negative_ttl is not None: self.negative_ttl = negative_ttl
+        if ttls:
+            self.topics = [(name, phrases, ttls.get(name, ttl)) for name, phrases, ttl in self.topics]
+            self.default_ttl = ttls.get("default", self.default_ttl)
+
+    @staticmethod
+    def normalize(query: str) -> str:
+        words = {w for w in normalize_phrase(query).split() if w not in STOPWORDS}
+        return " ".join(sorted(words))
+
+    def topic(self, query: str):
+        padded = f" {normalize_phrase(query)} "
+        for name, phrases, ttl in self.topics:
+            if any(f" {p} " in padded for p in phrases):
+                return name, ttl
+        return "default", self.default_ttl
+
+    def _client(self) -> DDGS:
+        # One client per worker thread, reused across searches
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = DDGS()
+        return client
+
+    def _fetch(self, query: str):
+        return [r["body"] for r in self._client().text(query, max_results=self.max_results)]
+
+    def _store(self, key: str, query: str, future):
+        with self._lock:
+            self._inflight.pop(key, None)
+        if future.cancelled():
+            return
+        try:
+            results = future.result()
+        except Exception as e:
+            with self._lock:
+                self.counters["errors"] += 1
+            print(f"❌ [INTERNET ERROR] Uplink failure: {e}")
+            return
+        ttl = self.topic(query)[1] if results else self.negative_ttl
+        with self._lock:
+            self._cache[key] = (results, time.time() + ttl)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+    def search(self, query: str, budget: float = None) -> list:
+        """
+        Returns up to `max_results` result snippets, or [] if none arrived within the
+        budget (the service's own, or a tighter one passed by the caller).
+        """
+        key = self.normalize(query)
+        if not key:
+            return []
+
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] > time.time():
+                self._cache.move_to_end(key)
+                self.counters["hits" if cached[0] else "negative_hits"] += 1
+                print(f"⚡ [INTERNET] Using cached datastream for: {query}")
+                return cached[0]
+
+            future = self._inflight.get(key)
+            if future:
+                # Same question already on the wire; wait on that one
+                self.counters["coalesced"] += 1
+            else:
+                self.counters["misses"] += 1
+                print(f"🌍 [INTERNET] Scanning global datastreams for: {query}...")
+                future = self._executor.submit(self._fetch, query)
+                self._inflight[key] = future
+                future.add_done_callback(lambda f: self._store(key, query, f))
+
+        budget = self.budget if budget is None else min(budget, self.budget)
+        try:
+            return future.result(timeout=budget)
+        except FutureTimeout:
+            with self._lock:
+                self.counters["timeouts"] += 1
+                # Still queued behind other searches: don't send it at all
+                if future.cancel():
+                    self._inflight.pop(key, None)
+            print(f"⏱️ [INTERNET] No answer within {budget:.1f}s; proceeding without search data.")
+        except Exception:
+            pass # Already reported by _store
+        return []
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters, entries=len(self._cache))
+
+
+# Global instance shared by the brain and anything else that needs the web
+web_search = SearchService()
@@ -3,9 +3,11 @@ import collections
 class ConversationHistory:
     def __init__(self, capacity: int = 5):
         self.history = collections.deque(maxlen=capacity)
+        self.seq = 0
 
     def add(self, role: str, message: str):
-        self.history.append({"role": role, "message": message})
+        self.seq += 1
+        self.history.append({"role": role, "message": message, "seq": self.seq})
 
     def get_last_user_message(self):
         for entry in reversed(self.history):
@@ -20,5 +22,9 @@ class ConversationHistory:
         recent = list(self.history)[-n:]
         return [(e["role"], e["message"]) for e in recent]
 
+    def since(self, seq: int):
+        """Entries added after sequence number `seq`, oldest first, as (seq, role, message)."""
+        return [(e["seq"], e["role"], e["message"]) for e in list(self.history) if e["seq"] > seq]
+
     def clear(self):
         self.history.clear()
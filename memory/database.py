@@ -1,6 +1,7 @@
 import sqlite3
 import os
 import time
+import threading
 from datetime import datetime
 from typing import Dict, Any, List
 
@@ -63,8 +64,9 @@ class DatabaseManager:
             return [dict(row) for row in cursor.fetchall()]
 
 class ShortTermMemory:
-    """Stores temporary session variables and timestamps."""
+    """Stores temporary session variables and timestamps. Safe to share across handler threads."""
     def __init__(self):
+        self._lock = threading.Lock()
         self.data: Dict[str, Any] = {
             "last_greeting_time": 0,
             "last_user_seen": 0,
@@ -75,7 +77,15 @@ class ShortTermMemory:
         }
 
     def update(self, key: str, value: Any):
-        self.data[key] = value
+        with self._lock:
+            self.data[key] = value
 
     def get(self, key: str, default: Any = None):
-        return self.data.get(key, default)
+        with self._lock:
+            return self.data.get(key, default)
+
+    def increment(self, key: str, amount: int = 1) -> int:
+        """Atomic read-modify-write for counters like switch_count."""
+        with self._lock:
+            self.data[key] = self.data.get(key, 0) + amount
+            return self.data[key]
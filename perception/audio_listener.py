@@ -1,40 +1,96 @@
 import os
 import json
+import re
 import sys
 import queue
 import time
+from typing import Optional
 import numpy as np
-import sounddevice as sd
 from vosk import Model, KaldiRecognizer
 from core.event_bus import bus
+from perception.audio_ring import AudioRing
+from perception.audio_sources import AudioSource, DeviceSource
+from perception.resampler import Resampler
+from perception.vad import SpectralVAD
 import threading
 import collections
 
+BLOCK_SIZE = 4000 # Samples per callback block at MODEL_RATE (250ms)
+MODEL_RATE = 16000 # Vosk models are trained on 16kHz audio
+INTERRUPT_PHRASES = ("stop", "listen jarvis", "shut up") # Spoken phrases that cut JARVIS off mid-sentence
+
+def supports_grammar(model_path: str) -> bool:
+    """
+    Whether a Vosk model can decode with a runtime grammar. Small models ship the
+    lookahead graph (graph/HCLr.fst + Gr.fst); big ones only a static HCLG.fst,
+    and Vosk silently ignores the grammar, so a "spotter" would be a second full decoder.
+    """
+    graph = os.path.join(model_path, "graph")
+    return os.path.exists(os.path.join(graph, "HCLr.fst")) and os.path.exists(os.path.join(graph, "Gr.fst"))
+
 class AudioListener:
-    def __init__(self, model_path: str, wake_word: str = "jarvis", intensity_threshold: int = 150):
+    def __init__(self, model_path: str, wake_word: str = "jarvis", intensity_threshold: int = 150,
+                 vad: dict = None, two_stage: bool = False, source: AudioSource = None, resample: bool = True,
+                 interrupt_phrases: tuple = INTERRUPT_PHRASES, barge_in: bool = False):
         self.model_path = model_path
+        self.source = source # None: the default input device
+        self.resample = resample # Convert device audio to MODEL_RATE in the callback
+        self.resampler = None
+        self.samplerate = MODEL_RATE # Rate of the audio the gate, VAD and recognizer see
         self.wake_word = wake_word.lower()
         self.intensity_threshold = intensity_threshold
         self.q = queue.Queue()
         self.model = None
         self._running = False
         
-        # Advanced Gating
-        self.pre_buffer = collections.deque(maxlen=10) # ~0.5s of audio @ 16khz (8000 blocksize)
+        # Advanced Gating: every block lands in the ring; the recognizer queue carries sequence numbers
+        self.ring = AudioRing(slots=64, block_samples=BLOCK_SIZE)
+        self.pre_roll_blocks = 10 # Blocks replayed from the ring when the gate opens
+        self._forwarded = 0 # First ring sequence number not yet sent to the recognizer
         self.gate_open = False
         self.last_sound_time = 0
         self.gate_hold_seconds = 1.8 # Increased for flow
         
+        # Spectral VAD (built once the device rate is known); None keeps the RMS gate below
+        self.vad_config = dict(vad or {})
+        self.vad = None
+        
         # Adaptive Thresholding
         self.ambient_levels = collections.deque(maxlen=50)
         self.calibrating = True
         self.calibration_start = time.time()
         self.listening_window = 8.0
-        self.last_wake_time = 0
+        self.last_wake_time = float("-inf") # No window open until the wake word (also on a stream clock starting at 0)
+        self.attention_sent = False # ATTENTION already published for the utterance in progress
+        
+        # Two-stage recognition: a wake-word-only spotter runs until it fires, then the full model
+        # takes over (utterance replayed from the ring) for as long as the listening window is open
+        self.two_stage = two_stage
+        self.replay_blocks = 24 # Longest stretch of the triggering utterance replayed into the full model
+        self.full_engaged = True
+        
+        # Fast-path interrupts: acted on from the partial hypothesis instead of the final result.
+        # With barge_in, audio heard while JARVIS talks goes to a recognizer that only knows these phrases
+        self.interrupt_phrases = tuple(p.lower() for p in interrupt_phrases)
+        self._interrupt_pattern = re.compile(
+            r"\b(" + "|".join(re.escape(p) for p in sorted(self.interrupt_phrases, key=len, reverse=True)) + r")\b"
+        ) if self.interrupt_phrases else None
+        self.barge_in = barge_in
+        self.interrupt_rec = None
+        self.interrupt_debounce = 1.5 # Seconds before the same phrase may fire again
+        self._interrupt_pending = None # (phrase, time) fired from a partial; dropped from the final result
+        self._last_interrupt = (None, float("-inf"))
+        self._barge_in_active = False
+        self._interrupt_stats = {"fired": 0, "barge_in": 0, "debounced": 0, "lead_total": 0.0, "lead_count": 0}
         
-        # Filtering
-        self.last_audio_data = None
+        # Filtering: preallocated so the callback never allocates sample buffers
+        self._smoothed = np.zeros(BLOCK_SIZE, dtype=np.float32)
+        self._previous = np.zeros(BLOCK_SIZE, dtype=np.float32)
+        self._has_previous = False
         self.is_speaking = False
+        self._discard_before = 0 # Blocks below this sequence number were captured while JARVIS spoke
+        self._reset_pending = False # Recognizers to be reset (on the recognizer thread) after JARVIS spoke
+        self.clock = time.time # Replaced by a stream clock when replaying recordings
         
         # Subscribe to speech events to avoid hearing himself
         bus.subscribe("JARVIS_SPEAKING", self._handle_speech_event)
@@ -42,29 +98,74 @@ class AudioListener:
     def _handle_speech_event(self, data: dict):
         self.is_speaking = data.get("status", False)
         if self.is_speaking:
-            # Clear pre-buffer when JARVIS starts talking to avoid stale audio
-            self.pre_buffer.clear()
+            # Drop the pre-roll when JARVIS starts talking to avoid stale audio
+            self._forwarded = self.ring.seq
             self.gate_open = False
+        else:
+            # Nothing captured while JARVIS talked (blocks still queued, the VAD's hangover of echo,
+            # pre-roll) may reach the spotter or full recognizer and come back as a command
+            self._forwarded = self.ring.seq
+            self._discard_before = self.ring.seq
+            self._reset_pending = True
+            self.gate_open = False
+            if self.vad is not None:
+                self.vad.reset()
+
+    def set_input_rate(self, samplerate: int) -> int:
+        """Sets up resampling from the device rate; returns the input block size that yields BLOCK_SIZE samples."""
+        self.resampler = None
+        self.samplerate = samplerate
+        if self.resample and samplerate != MODEL_RATE:
+            self.resampler = Resampler(samplerate, MODEL_RATE)
+            self.samplerate = MODEL_RATE
+            print(f"🎚️ [AUDIO] Resampling {samplerate}Hz -> {MODEL_RATE}Hz before gating and recognition.")
+        # Same block duration at any device rate; rounded down so a resampled block never outgrows a ring slot
+        return BLOCK_SIZE * samplerate // self.samplerate
+
+    def enable_vad(self, samplerate: int, pre_roll: float = 0.5, enabled: bool = True, **params):
+        """Gates on a SpectralVAD instead of the RMS threshold; it reacts within a block, so less pre-roll is needed."""
+        self.vad = SpectralVAD(samplerate, BLOCK_SIZE, **params)
+        self.pre_roll_blocks = max(1, round(pre_roll * samplerate / BLOCK_SIZE))
+        print(f"🎚️ [AUDIO] Spectral VAD gating enabled ({self.vad.frames} frames per block, "
+              f"{self.pre_roll_blocks} pre-roll blocks).")
+
+    def _forward(self, seq: int):
+        self.q.put(seq)
+        self._forwarded = seq + 1
 
     def callback(self, indata, frames, time_info, status):
-        """High-fidelity audio callback with self-deafness and pre-buffering."""
-        if self.is_speaking:
-            return # JARVIS is talking, don't listen to the feedback
+        """High-fidelity audio callback with self-deafness and pre-roll; works in preallocated buffers only."""
+        if self.is_speaking and self.interrupt_rec is None:
+            return # JARVIS is talking, don't listen to the feedback (barge-in listens for interrupts only)
             
         if status: print(status)
         
-        audio_data = np.frombuffer(indata, dtype=np.int16).astype(np.float64)
+        pcm = np.frombuffer(indata, dtype=np.int16)
+        if self.resampler is not None:
+            pcm = self.resampler.process(pcm)
+        seq = self.ring.write(pcm)
+        n = len(pcm)
+        smoothed, previous = self._smoothed[:n], self._previous[:n]
+        smoothed[:] = pcm
         
-        # Simple Low-Pass Filter (Smoothing)
-        if self.last_audio_data is not None:
-            audio_data = 0.8 * audio_data + 0.2 * self.last_audio_data
-        self.last_audio_data = audio_data
+        # Simple Low-Pass Filter (Smoothing), in place
+        if self._has_previous:
+            smoothed *= 0.8
+            previous *= 0.2
+            smoothed += previous
+        self._has_previous = True
+        # This block's output is the next block's history
+        self._smoothed, self._previous = self._previous, self._smoothed
         
-        intensity = np.sqrt(np.mean(audio_data**2))
-        now = time.time()
+        intensity = float(np.sqrt(np.dot(smoothed, smoothed) / n)) if n else 0.0
+        now = self.clock()
 
+        if self.vad is not None:
+            # The VAD tracks the noise floor itself and holds the gate through its own hangover
+            voiced = self.vad.is_speech(pcm)
+            held = False
         # 1. Calibration phase (first 3 seconds)
-        if self.calibrating:
+        elif self.calibrating:
             self.ambient_levels.append(intensity)
             if now - self.calibration_start > 3.0:
                 avg_ambient = np.mean(self.ambient_levels)
@@ -75,32 +176,224 @@ class AudioListener:
                 self.calibrating = False
                 print(f"\n✅ [AUDIO] Calibration Complete. Ambient: {int(avg_ambient)} | Threshold: {self.intensity_threshold}")
             return
+        else:
+            voiced = intensity > self.intensity_threshold
+            held = self.gate_open and (now - self.last_sound_time < self.gate_hold_seconds)
 
         # 2. Gating Logic
-        if intensity > self.intensity_threshold:
+        if voiced:
             if not self.gate_open:
-                # Triggered! Flush pre-buffer first
-                while self.pre_buffer:
-                    self.q.put(self.pre_buffer.popleft())
+                # Triggered! Replay the pre-roll still held in the ring first
+                for pre in range(max(self._forwarded, seq - self.pre_roll_blocks), seq):
+                    self._forward(pre)
                 self.gate_open = True
             
             self.last_sound_time = now
-            self.q.put(bytes(indata))
+            self._forward(seq)
         
-        elif self.gate_open and (now - self.last_sound_time < self.gate_hold_seconds):
+        elif held:
             # Still in the "hold" window
-            self.q.put(bytes(indata))
+            self._forward(seq)
         
         else:
-            # Silence: add to pre-buffer
+            # Silence: the block stays in the ring as pre-roll
             self.gate_open = False
-            self.pre_buffer.append(bytes(indata))
             
             # Ambient logging
             if int(now) % 3 == 0 and intensity > 5:
                 sys.stdout.write(f"\r🎤 Ambient: {int(intensity)}/{self.intensity_threshold}  ")
                 sys.stdout.flush()
 
+    def build_recognizers(self, samplerate: int):
+        """The full recognizer, plus (two-stage mode) a wake-word spotter limited to a two-entry grammar."""
+        self.full_rec = KaldiRecognizer(self.model, samplerate)
+        self.spotter = None
+        if self.two_stage:
+            self.spotter = KaldiRecognizer(self.model, samplerate, json.dumps([self.wake_word, "[unk]"]))
+        self.full_engaged = self.spotter is None
+        self._utterance_start = None
+        self._wake_pending = False
+        self.interrupt_rec = None
+        if self.barge_in and self.interrupt_phrases:
+            self.interrupt_rec = KaldiRecognizer(self.model, samplerate, json.dumps(list(self.interrupt_phrases) + ["[unk]"]))
+
+    def recognize(self, seq: int):
+        """Feeds one forwarded block to whichever stage is active."""
+        if seq < self._discard_before and not self.is_speaking:
+            return # Captured while JARVIS spoke; only the barge-in recognizer may hear that
+        if self._reset_pending:
+            self._reset_pending = False
+            self.full_rec.Reset()
+            if self.spotter:
+                self.spotter.Reset()
+            self._utterance_start = None
+        # Vosk's binding takes bytes, so the one copy happens here, off the callback thread
+        data = self.ring.read(seq)
+        if data is None:
+            print(f"\n⚠️ [AUDIO] Recognizer fell {self.ring.slots}+ blocks behind; block dropped.")
+            return
+        speaking = self.is_speaking and self.interrupt_rec is not None
+        if speaking != self._barge_in_active:
+            # Each stretch of JARVIS talking starts the interrupt recognizer afresh
+            self._barge_in_active = speaking
+            self.interrupt_rec.Reset()
+        if speaking:
+            self._listen_for_interrupt(data)
+            return
+        if not self.full_engaged:
+            self._spot(seq, data)
+            return
+
+        if self.full_rec.AcceptWaveform(data):
+            self._on_final(json.loads(self.full_rec.Result()).get("text", ""))
+            if self.spotter and not self._window_open():
+                self._disengage()
+        else:
+            partial = json.loads(self.full_rec.PartialResult()).get("partial", "")
+            self._on_partial(partial)
+            if not partial and self.spotter and not self._window_open() and not self._wake_pending:
+                # Window over and nothing being said: hand back to the cheap stage
+                self._disengage()
+
+    def _window_open(self) -> bool:
+        return self.clock() - self.last_wake_time < self.listening_window
+
+    def _spot(self, seq: int, data: bytes):
+        """Stage 1: only asks whether the wake word is in the current utterance."""
+        if self._utterance_start is None:
+            self._utterance_start = seq
+        start = self._utterance_start
+        if self.spotter.AcceptWaveform(data):
+            heard = json.loads(self.spotter.Result()).get("text", "")
+            self._utterance_start = None
+        else:
+            heard = json.loads(self.spotter.PartialResult()).get("partial", "")
+        if self.wake_word in heard:
+            self._engage(start, seq)
+
+    def _engage(self, start: int, seq: int):
+        """Stage 2: replays the utterance so far from the ring into the full recognizer, so nothing is clipped."""
+        self.full_engaged = True
+        self._wake_pending = True
+        self._utterance_start = None
+        self.last_wake_time = self.clock() # The listening window runs from the trigger
+        self.spotter.Reset()
+        if not self.attention_sent:
+            self.attention_sent = True
+            bus.publish("ATTENTION", {"status": True, "partial": self.wake_word})
+        first = max(start, seq - self.replay_blocks + 1, self.ring.seq - self.ring.slots)
+        for replay in range(first, seq + 1):
+            data = self.ring.read(replay)
+            if data is not None and self.full_rec.AcceptWaveform(data):
+                self._on_final(json.loads(self.full_rec.Result()).get("text", ""))
+
+    def _disengage(self):
+        self.full_engaged = False
+        self._wake_pending = False
+        self._interrupt_pending = None
+        self.full_rec.Reset()
+
+    def _listen_for_interrupt(self, data: bytes):
+        """While JARVIS talks: only the interrupt phrases are listened for, so its own voice is never transcribed."""
+        if self.interrupt_rec.AcceptWaveform(data):
+            heard = json.loads(self.interrupt_rec.Result()).get("text", "")
+        else:
+            heard = json.loads(self.interrupt_rec.PartialResult()).get("partial", "")
+        if self._fire_interrupt(heard, barge_in=True):
+            # The rest of this hypothesis would match again (and be debounced)
+            self.interrupt_rec.Reset()
+
+    def _match_interrupt(self, heard: str) -> Optional[str]:
+        match = self._interrupt_pattern.search(heard) if heard and self._interrupt_pattern else None
+        return match.group(1) if match else None
+
+    def _just_fired(self, phrase: str) -> bool:
+        last, at = self._last_interrupt
+        return phrase == last and self.clock() - at < self.interrupt_debounce
+
+    def _fire_interrupt(self, heard: str, barge_in: bool = False) -> Optional[str]:
+        """Publishes INTERRUPT for an interrupt phrase in `heard` unless it just fired; returns the phrase matched."""
+        phrase = self._match_interrupt(heard)
+        if phrase is None:
+            return None
+        if self._just_fired(phrase):
+            self._interrupt_stats["debounced"] += 1
+            return phrase
+        now = self.clock()
+        self._last_interrupt = (phrase, now)
+        self._interrupt_stats["fired"] += 1
+        self._interrupt_stats["barge_in"] += barge_in
+        if self.wake_word in phrase:
+            self.last_wake_time = now # "listen jarvis" opens the listening window
+        print(f"\n⚡ [AUDIO] Fast-path interrupt: '{phrase}'")
+        bus.publish("INTERRUPT", {"command": phrase, "heard": heard, "at": time.monotonic()})
+        return phrase
+
+    def _consume_interrupt(self, text: str) -> bool:
+        """True when a final result says nothing beyond the interrupt already fired (and maybe the wake word)."""
+        phrase, fired_at = self._interrupt_pending
+        self._interrupt_pending = None
+        self._interrupt_stats["lead_total"] += self.clock() - fired_at
+        self._interrupt_stats["lead_count"] += 1
+        rest = re.sub(r"\b" + re.escape(phrase) + r"\b", "", text, count=1).replace(self.wake_word, "")
+        return not rest.strip()
+
+    def stats(self) -> dict:
+        s = self._interrupt_stats
+        return {
+            "interrupts": s["fired"],
+            "barge_in": s["barge_in"],
+            "debounced": s["debounced"],
+            "avg_lead_ms": round(s["lead_total"] / s["lead_count"] * 1000, 1) if s["lead_count"] else 0.0,
+        }
+
+    def _on_final(self, text: str):
+        text = text.lower().strip()
+        if self._interrupt_pending is None:
+            # The barge-in recognizer may have caught this phrase before the full recognizer saw the end of it
+            phrase = self._match_interrupt(text)
+            if phrase and self._just_fired(phrase):
+                self._interrupt_pending = self._last_interrupt
+        if self._interrupt_pending and self._consume_interrupt(text):
+            # Handled from the partial already; a longer utterance ("stop the music") still goes on as a command
+            if self.attention_sent:
+                bus.publish("ATTENTION", {"status": False})
+            self.attention_sent = False
+            self._wake_pending = False
+            return
+        # The spotter already heard the wake word, even if the full model spells it differently
+        wake = self.wake_word in text or (self._wake_pending and bool(text))
+        if self.attention_sent and not wake:
+            # The partial guess was wrong; let the speculative work go
+            bus.publish("ATTENTION", {"status": False})
+        self.attention_sent = False
+        if text:
+            self._wake_pending = False
+            print(f"\n🎙 Heard: {text}")
+            now = self.clock()
+            if wake:
+                self.last_wake_time = now
+                command = text.replace(self.wake_word, "").strip()
+                bus.publish("WAKE_WORD_DETECTED", {"command": command})
+            elif now - self.last_wake_time < self.listening_window:
+                bus.publish("USER_COMMAND", {"command": text})
+                self.last_wake_time = now
+
+    def _on_partial(self, partial: str):
+        # Same bar as a final command: inside the listening window or addressed by name, so a
+        # "bus stop" on the TV does not cut JARVIS off and cancel what it is working on
+        if partial and self._interrupt_pending is None and (self._window_open() or self.wake_word in partial):
+            phrase = self._fire_interrupt(partial)
+            if phrase:
+                self._interrupt_pending = (phrase, self.clock())
+        if partial and not self.attention_sent and self._interrupt_pending is None and self.wake_word in partial:
+            # Early heads-up: warm the brain while the rest of the command is spoken
+            self.attention_sent = True
+            bus.publish("ATTENTION", {"status": True, "partial": partial})
+        if partial:
+            sys.stdout.write(f"\r🔍 {partial}")
+            sys.stdout.flush()
+
     def _loop(self):
         print(f"🎙 [DEBUG] Audio thread started. Model Path: {self.model_path}")
         try:
@@ -119,49 +412,35 @@ class AudioListener:
             self.model = Model(self.model_path)
             print(f"✅ [SYSTEM] Model loaded in {time.time() - start_time:.1f}s.")
 
-            try:
-                device_info = sd.query_devices(None, 'input')
-                samplerate = int(device_info['default_samplerate'])
-                print(f"🎙 [DEBUG] Input Device: {device_info['name']} | Rate: {samplerate}Hz")
-            except Exception as e:
-                samplerate = 16000
-                print(f"⚠️ [WARNING] Device detection failed, defaulting to 16kHz. Error: {e}")
-
-            with sd.RawInputStream(
-                samplerate=samplerate,
-                blocksize=4000,
-                dtype='int16',
-                channels=1,
-                callback=self.callback
-            ):
-                rec = KaldiRecognizer(self.model, samplerate)
+            source = self.source or DeviceSource(BLOCK_SIZE)
+            source.block_size = self.set_input_rate(source.samplerate)
+            samplerate = self.samplerate
+            self.clock = source.clock
+            self.calibration_start = self.clock()
+
+            if self.vad_config.get("enabled", False):
+                self.enable_vad(samplerate, **self.vad_config)
+
+            if (self.two_stage or self.barge_in) and not supports_grammar(self.model_path):
+                # Both would silently become full decoders: a second recognizer, and one transcribing JARVIS itself
+                print(f"⚠️ [AUDIO] Model has no runtime-grammar graph; two-stage spotting and barge-in disabled.")
+                self.two_stage = False
+                self.barge_in = False
+
+            with source.open(self.callback):
+                self.build_recognizers(samplerate)
                 self._running = True
                 print(f"🎤 [SYSTEM] JARVIS is now actively listening. Threshold: {self.intensity_threshold}")
 
                 while self._running:
                     try:
-                        data = self.q.get(timeout=1)
+                        seq = self.q.get(timeout=1)
                     except queue.Empty:
+                        if source.exhausted:
+                            print(f"\n🎙 [AUDIO] Audio source finished; listener stopping.")
+                            break
                         continue
-                    
-                    if rec.AcceptWaveform(data):
-                        result = json.loads(rec.Result())
-                        text = result.get("text", "").lower().strip()
-                        if text:
-                            print(f"\n🎙 Heard: {text}")
-                            now = time.time()
-                            if self.wake_word in text:
-                                self.last_wake_time = now
-                                command = text.replace(self.wake_word, "").strip()
-                                bus.publish("WAKE_WORD_DETECTED", {"command": command})
-                            elif now - self.last_wake_time < self.listening_window:
-                                bus.publish("USER_COMMAND", {"command": text})
-                                self.last_wake_time = now
-                    else:
-                        partial = json.loads(rec.PartialResult()).get("partial", "")
-                        if partial:
-                            sys.stdout.write(f"\r🔍 {partial}")
-                            sys.stdout.flush()
+                    self.recognize(seq)
 
         except Exception as e:
             print(f"❌ [CRITICAL] Audio Thread Exception: {e}")
@@ -0,0 +1,54 @@
+from typing import Optional
+
+import numpy as np
+
+
+class AudioRing:
+    """
+    Fixed pool of block-sized int16 slots, reused round-robin.
+    The audio callback copies each block into the next slot (no allocation) and
+    hands the recognizer thread only the block's sequence number. The last few
+    slots before the gate opens double as the pre-roll. A reader that falls more
+    than `slots` blocks behind finds its block overwritten and gets None.
+    """
+    def __init__(self, slots: int = 64, block_samples: int = 4000):
+        self.slots = slots
+        self.block_samples = block_samples
+        self._blocks = np.zeros((slots, block_samples), dtype=np.int16)
+        self._lengths = np.zeros(slots, dtype=np.int64)
+        self.seq = 0 # Blocks written so far; the next block gets this number
+        self.overruns = 0
+
+    def write(self, pcm: np.ndarray) -> int:
+        """Copies one int16 block in and returns its sequence number."""
+        n = len(pcm)
+        if n > self.block_samples:
+            raise ValueError(f"Block of {n} samples exceeds the ring's {self.block_samples}-sample slots")
+        slot = self.seq % self.slots
+        self._blocks[slot, :n] = pcm
+        self._lengths[slot] = n
+        self.seq += 1
+        return self.seq - 1
+
+    def valid(self, seq: int) -> bool:
+        return self.seq - self.slots <= seq < self.seq
+
+    def samples(self, seq: int) -> Optional[np.ndarray]:
+        """The block as an int16 view into the ring, or None once it was overwritten."""
+        if not self.valid(seq):
+            return None
+        slot = seq % self.slots
+        return self._blocks[slot, :self._lengths[slot]]
+
+    def view(self, seq: int) -> Optional[memoryview]:
+        samples = self.samples(seq)
+        return None if samples is None else samples.data
+
+    def read(self, seq: int) -> Optional[bytes]:
+        """A copy of the block for consumers that need bytes, checked against a concurrent overwrite."""
+        view = self.view(seq)
+        data = None if view is None else bytes(view)
+        if data is None or not self.valid(seq):
+            self.overruns += 1
+            return None
+        return data
@@ -0,0 +1,183 @@
+import sys
+import threading
+import time
+import wave
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from typing import BinaryIO, Callable, Iterator
+
+import numpy as np
+import sounddevice as sd
+
+try:
+    import soundfile
+    SOUNDFILE_AVAILABLE = True
+except ImportError:
+    SOUNDFILE_AVAILABLE = False
+
+
+class AudioSource(ABC):
+    """
+    Where AudioListener's audio comes from.
+    `open(callback)` delivers int16 mono blocks of `block_size` samples to
+    callback(indata, frames, time_info, status), the PortAudio callback signature,
+    until the source runs dry (`exhausted`) or the context exits. `clock()` is
+    the source's notion of now, which the gate and recognizer use for their timing.
+    """
+    samplerate = 16000
+    block_size = 4000
+    exhausted = False
+
+    def clock(self) -> float:
+        return time.time()
+
+    @abstractmethod
+    def open(self, callback: Callable):
+        """Context manager that streams blocks to `callback` while it is open."""
+        pass
+
+    def _pump(self, blocks: Iterator[bytes], callback: Callable, realtime: bool):
+        """Feeds blocks from a thread, paced to real time if asked; stops when the context closes."""
+        stop = threading.Event()
+
+        def _run():
+            next_at = time.monotonic()
+            for data in blocks:
+                if stop.is_set():
+                    break
+                if realtime:
+                    next_at += self.block_size / self.samplerate
+                    time.sleep(max(0.0, next_at - time.monotonic()))
+                callback(data, len(data) // 2, None, None)
+            self.exhausted = True
+
+        thread = threading.Thread(target=_run, name="audio-source", daemon=True)
+        thread.start()
+        return stop
+
+
+class DeviceSource(AudioSource):
+    """The microphone, through sounddevice (PortAudio)."""
+    def __init__(self, block_size: int = 4000, device=None, samplerate: int = None):
+        self.block_size = block_size
+        self.device = device
+        if samplerate:
+            self.samplerate = samplerate
+        else:
+            try:
+                device_info = sd.query_devices(device, 'input')
+                self.samplerate = int(device_info['default_samplerate'])
+                print(f"🎙 [DEBUG] Input Device: {device_info['name']} | Rate: {self.samplerate}Hz")
+            except Exception as e:
+                self.samplerate = 16000
+                print(f"⚠️ [WARNING] Device detection failed, defaulting to 16kHz. Error: {e}")
+
+    @contextmanager
+    def open(self, callback: Callable):
+        with sd.RawInputStream(samplerate=self.samplerate, blocksize=self.block_size, device=self.device,
+                               dtype='int16', channels=1, callback=callback):
+            yield self
+
+
+class BufferSource(AudioSource):
+    """
+    Samples already in memory. With `realtime` off, blocks are delivered as fast as
+    the consumer takes them and `clock()` is the stream position (end of the last
+    block handed out), so timings come out in audio time.
+    """
+    def __init__(self, pcm: np.ndarray, samplerate: int, block_size: int = 4000, realtime: bool = False):
+        self.pcm = np.ascontiguousarray(pcm, dtype=np.int16)
+        self.samplerate = samplerate
+        self.block_size = block_size
+        self.realtime = realtime
+        self.position = 0
+
+    @property
+    def duration(self) -> float:
+        return len(self.pcm) / self.samplerate
+
+    def clock(self) -> float:
+        return time.time() if self.realtime else self.position / self.samplerate
+
+    def blocks(self) -> Iterator[bytes]:
+        """Whole blocks in order (a trailing partial block is dropped, as a device would never send it)."""
+        for start in range(0, len(self.pcm) - self.block_size + 1, self.block_size):
+            self.position = start + self.block_size
+            yield self.pcm[start:self.position].tobytes()
+        self.exhausted = True
+
+    @contextmanager
+    def open(self, callback: Callable):
+        stop = self._pump(self.blocks(), callback, self.realtime)
+        try:
+            yield self
+        finally:
+            stop.set()
+
+
+class FileSource(BufferSource):
+    """A recording: 16-bit PCM WAV via the standard library, FLAC (and other formats) via soundfile if installed."""
+    def __init__(self, path: str, block_size: int = 4000, realtime: bool = False):
+        self.path = path
+        if path.lower().endswith(".wav"):
+            with wave.open(path, "rb") as f:
+                if f.getsampwidth() != 2:
+                    raise ValueError(f"{path}: only 16-bit PCM WAVs are supported")
+                samplerate, channels = f.getframerate(), f.getnchannels()
+                pcm = np.frombuffer(f.readframes(f.getnframes()), dtype=np.int16).reshape(-1, channels)[:, 0]
+        elif SOUNDFILE_AVAILABLE:
+            data, samplerate = soundfile.read(path, dtype="int16", always_2d=True)
+            pcm = data[:, 0]
+        else:
+            raise RuntimeError(f"{path}: reading non-WAV audio needs the 'soundfile' package")
+        super().__init__(pcm, samplerate, block_size, realtime)
+
+
+class PipeSource(AudioSource):
+    """
+    Raw signed 16-bit little-endian mono PCM from a pipe: stdin
+    (`arecord -f S16_LE -r 16000 -c 1 | python main.py`) or a named FIFO given as
+    `path` (`mkfifo /tmp/jarvis.pcm; ffmpeg ... -f s16le /tmp/jarvis.pcm`).
+    While it reads stdin, nothing else may (see `uses_stdin`).
+    """
+    def __init__(self, stream: BinaryIO = None, samplerate: int = 16000, block_size: int = 4000, path: str = None):
+        self.path = path
+        self.stream = stream or (None if path else sys.stdin.buffer)
+        self.samplerate = samplerate
+        self.block_size = block_size
+
+    @property
+    def uses_stdin(self) -> bool:
+        return self.stream is sys.stdin.buffer
+
+    def blocks(self) -> Iterator[bytes]:
+        if self.stream is None:
+            # Opening a FIFO blocks until a writer connects, so it happens on the source thread
+            self.stream = open(self.path, "rb")
+        size = self.block_size * 2
+        while True:
+            data = self.stream.read(size)
+            if len(data) < size:
+                break
+            yield data
+        self.exhausted = True
+
+    @contextmanager
+    def open(self, callback: Callable):
+        # A live pipe is paced by its writer; no extra pacing here
+        stop = self._pump(self.blocks(), callback, realtime=False)
+        try:
+            yield self
+        finally:
+            stop.set()
+
+
+def make_source(config: dict = None, block_size: int = 4000) -> AudioSource:
+    """Builds the source named by the `perception.audio.source` config section (default: the microphone)."""
+    config = dict(config or {})
+    kind = config.pop("type", "device")
+    if kind == "file":
+        return FileSource(config["path"], block_size, realtime=config.get("realtime", True))
+    if kind == "pipe":
+        return PipeSource(samplerate=config.get("samplerate", 16000), block_size=block_size, path=config.get("path"))
+    return DeviceSource(block_size, device=config.get("device"), samplerate=config.get("samplerate"))
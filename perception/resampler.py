@@ -0,0 +1,95 @@
+from math import gcd
+
+import numpy as np
+
+
+class Resampler:
+    """
+    Streaming polyphase resampler (e.g. a 48 or 44.1 kHz microphone down to the
+    recognizer's 16 kHz).
+    The rate change is reduced to up/down (48000 -> 16000 is 1/3, 44100 -> 16000
+    is 160/441) and a Kaiser-windowed sinc low-pass is split into `up` phases.
+    Every output sample is one dot product of a phase with the most recent
+    input samples. The output positions, source indices and phase rows for a block
+    are worked out once and reused while blocks keep the same length and phase,
+    which they do when a block holds a whole number of output samples. The filter
+    history and the fractional position carry over between blocks, so block edges
+    do not click.
+    """
+    def __init__(self, in_rate: int, out_rate: int = 16000, zero_crossings: int = 8, kaiser_beta: float = 8.0):
+        self.in_rate = in_rate
+        self.out_rate = out_rate
+        common = gcd(in_rate, out_rate)
+        self.up = out_rate // common
+        self.down = in_rate // common
+
+        # Taps per phase: enough input samples to span `zero_crossings` lobes of the narrower rate on each side
+        self.taps = 2 * zero_crossings * max(1, -(-self.down // self.up))
+        length = self.taps * self.up
+        cutoff = 0.5 / max(self.up, self.down) * 0.95 # Fraction of the upsampled rate, just below the lower Nyquist
+        n = np.arange(length) - (length - 1) / 2
+        prototype = 2 * cutoff * np.sinc(2 * cutoff * n) * np.kaiser(length, kaiser_beta) * self.up
+        # Row p holds taps p, p + up, p + 2*up, ... reversed so they line up with the input in time order
+        self._phases = prototype.reshape(self.taps, self.up).T[:, ::-1].astype(np.float32)
+
+        self._history = np.zeros(self.taps - 1, dtype=np.float32)
+        self._offset = 0 # Position of the next output sample within the next block, in 1/up input samples
+        self._plan_key = None
+        self._input = np.zeros(0, dtype=np.float32)
+        self._out = np.zeros(0, dtype=np.float32)
+        self._pcm = np.zeros(0, dtype=np.int16)
+
+    @property
+    def passthrough(self) -> bool:
+        return self.up == self.down
+
+    def output_size(self, in_samples: int) -> int:
+        """Most output samples one block of `in_samples` can produce."""
+        return -(-in_samples * self.up // self.down) + 1
+
+    def _plan(self, n: int):
+        """Gather indices and phase rows for a block of n samples starting at the current offset."""
+        key = (n, self._offset)
+        if key == self._plan_key:
+            return
+        positions = np.arange(self._offset, n * self.up, self.down)
+        base = positions // self.up
+        # Window for output i covers extended-input samples base[i] .. base[i] + taps - 1 (history comes first)
+        self._index = base[:, None] + np.arange(self.taps)
+        self._rows = self._phases[positions % self.up]
+        self._next_offset = int(positions[-1]) + self.down - n * self.up if len(positions) else self._offset - n * self.up
+        self._window = np.zeros((len(positions), self.taps), dtype=np.float32)
+        if len(self._input) < n + self.taps - 1:
+            self._input = np.zeros(n + self.taps - 1, dtype=np.float32)
+        if len(self._out) < len(positions):
+            self._out = np.zeros(len(positions), dtype=np.float32)
+            self._pcm = np.zeros(len(positions), dtype=np.int16)
+        self._plan_key = key
+
+    def process(self, pcm: np.ndarray) -> np.ndarray:
+        """Resamples one int16 block; returns an int16 view that stays valid until the next call."""
+        if self.passthrough:
+            return pcm
+        n = len(pcm)
+        self._plan(n)
+        extended = self._input[:n + self.taps - 1]
+        extended[:self.taps - 1] = self._history
+        extended[self.taps - 1:] = pcm
+        self._history[:] = extended[n:]
+
+        m = len(self._window)
+        out = self._out[:m]
+        np.take(extended, self._index, out=self._window, mode="clip") # Indices are in range; "clip" skips the buffered copy
+        np.einsum("ij,ij->i", self._window, self._rows, out=out)
+        np.rint(out, out=out)
+        np.clip(out, -32768, 32767, out=out)
+        pcm16 = self._pcm[:m]
+        pcm16[:] = out
+        self._offset = self._next_offset
+        return pcm16
+
+    def reset(self):
+        """Forgets the filter history, e.g. after a gap in the input."""
+        self._history[:] = 0
+        self._offset = 0
+        self._plan_key = None
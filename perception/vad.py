@@ -0,0 +1,82 @@
+import numpy as np
+
+
+class SpectralVAD:
+    """
+    Voice-activity detector for the recognizer gate.
+    Each callback block is cut into ~20ms frames, and three features are computed for
+    all frames at once: short-time energy, zero-crossing rate and the share of
+    spectral energy in the voice band. A frame counts as speech when its
+    energy clears the tracked noise floor by `snr_db`, most of its energy lies in
+    the voice band (fans hum below it, clicks and hiss spread above it) and it
+    does not cross zero like noise. A block is speech when enough of its frames
+    are. `hangover` keeps the gate open briefly after speech so word endings
+    and the recognizer's end-of-utterance silence get through.
+
+    The noise floor follows the quietest frames continuously: it drops quickly
+    and rises slowly, so a fan switching on is absorbed within seconds instead of
+    needing a recalibration.
+    """
+    def __init__(self, sample_rate: int = 16000, block_size: int = 4000, frame_ms: float = 20.0,
+                 snr_db: float = 9.0, band: tuple = (250, 3500), min_band_ratio: float = 0.6,
+                 max_zcr: float = 0.4, speech_fraction: float = 0.25, hangover: float = 0.8,
+                 floor_fall: float = 0.5, floor_rise: float = 0.05):
+        self.sample_rate = sample_rate
+        self.snr_db = snr_db
+        self.min_band_ratio = min_band_ratio
+        self.max_zcr = max_zcr
+        self.speech_fraction = speech_fraction
+        self.hangover = hangover
+        self.floor_fall = floor_fall
+        self.floor_rise = floor_rise
+
+        self.frames = max(1, round(block_size / (sample_rate * frame_ms / 1000)))
+        self.frame_len = block_size // self.frames
+        self.block_seconds = block_size / sample_rate
+        self._window = np.hanning(self.frame_len).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.frame_len, 1 / sample_rate)
+        self._band = (freqs >= band[0]) & (freqs <= band[1])
+        self._samples = np.zeros(self.frames * self.frame_len, dtype=np.float32)
+        self.reset()
+
+    def reset(self):
+        self.noise_floor_db = None
+        self._hang = 0.0
+        self.last_speech_frames = 0
+
+    def features(self, pcm: np.ndarray):
+        """Per-frame (energy dB, zero-crossing rate, voice-band energy ratio) for one block."""
+        n = min(len(pcm), len(self._samples))
+        frames = self._samples.reshape(self.frames, self.frame_len)
+        self._samples[:n] = pcm[:n]
+        self._samples[n:] = 0
+
+        energy_db = 10 * np.log10(np.einsum("ij,ij->i", frames, frames) / self.frame_len + 1.0)
+        signs = np.signbit(frames)
+        zcr = np.count_nonzero(signs[:, 1:] != signs[:, :-1], axis=1) / self.frame_len
+        power = np.abs(np.fft.rfft(frames * self._window, axis=1)) ** 2
+        band_ratio = power[:, self._band].sum(axis=1) / (power.sum(axis=1) + 1e-9)
+        return energy_db, zcr, band_ratio
+
+    def _track_floor(self, energy_db: np.ndarray):
+        # The quietest frames of the block stand for the background
+        quiet = float(np.partition(energy_db, len(energy_db) // 5)[len(energy_db) // 5])
+        if self.noise_floor_db is None:
+            self.noise_floor_db = quiet
+            return
+        rate = self.floor_fall if quiet < self.noise_floor_db else self.floor_rise
+        self.noise_floor_db += rate * (quiet - self.noise_floor_db)
+
+    def is_speech(self, pcm: np.ndarray) -> bool:
+        """Block-level decision including hangover; call once per block, in order."""
+        energy_db, zcr, band_ratio = self.features(pcm)
+        self._track_floor(energy_db)
+
+        voiced = ((energy_db > self.noise_floor_db + self.snr_db) &
+                  (band_ratio > self.min_band_ratio) & (zcr < self.max_zcr))
+        self.last_speech_frames = int(np.count_nonzero(voiced))
+        if self.last_speech_frames >= self.speech_fraction * self.frames:
+            self._hang = self.hangover
+            return True
+        self._hang -= self.block_seconds
+        return self._hang > 0
@@ -1,28 +1,24 @@
-import json
-import os
+from core.config_store import config_store
+
+# Default bias based on user feedback
+DEFAULT_MAPPINGS = {
+    "knife": "pen",
+    "scissors": "pen",
+    "toothbrush": "pen"
+}
 
 class VisionCorrector:
     def __init__(self, mapping_path: str):
         self.mapping_path = mapping_path
-        self.mappings = self._load()
 
-    def _load(self):
-        if os.path.exists(self.mapping_path):
-            try:
-                with open(self.mapping_path, 'r') as f:
-                    return json.load(f)
-            except: pass
-        return {
-            "knife": "pen", # Default bias based on user feedback
-            "scissors": "pen",
-            "toothbrush": "pen"
-        }
+    @property
+    def mappings(self) -> dict:
+        return config_store.get(self.mapping_path, DEFAULT_MAPPINGS)
 
     def save(self, original: str, corrected: str):
-        self.mappings[original.lower()] = corrected.lower()
-        os.makedirs(os.path.dirname(self.mapping_path), exist_ok=True)
-        with open(self.mapping_path, 'w') as f:
-            json.dump(self.mappings, f)
+        def _add(mappings):
+            mappings[original.lower()] = corrected.lower()
+        config_store.update(self.mapping_path, _add, default=DEFAULT_MAPPINGS)
 
     def correct(self, label: str) -> str:
         return self.mappings.get(label.lower(), label)